@@ -11,6 +11,8 @@ PM Team Use Cases:
 """
 
 import asyncio
+import sys
+from pathlib import Path
 from typing import Optional
 
 # Load environment variables
@@ -21,9 +23,16 @@ except ImportError:
     pass
 
 from agno.agent import Agent
-from agno.models.anthropic import Claude
 from agno.tools.mcp import MCPTools
 
+# Make the shared helpers in common/ importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.admission import client_params
+from common.mcp_streaming import enable_tool_progress
+from common.models import get_model
+from common.schema_cache import schema_cached
+
 # MCP server URL of the main Community Support Agent OS
 COMMUNITY_SUPPORT_MCP_URL = "http://localhost:7777/mcp"
 
@@ -42,17 +51,19 @@ async def run_pm_analysis(query: Optional[str] = None):
     print("PM TEAM - Community Insights Analysis")
     print("=" * 60 + "\n")
     
-    # Following cookbook pattern: async with MCPTools(...)
-    async with MCPTools(
+    # Following cookbook pattern: async with MCPTools(...), with cached tool schemas
+    async with schema_cached(MCPTools(
         transport="streamable-http",
-        url=COMMUNITY_SUPPORT_MCP_URL,
+        server_params=client_params(COMMUNITY_SUPPORT_MCP_URL, "pm-team", timeout_seconds=90),
         timeout_seconds=90,  # Higher timeout for complex queries
-    ) as community_mcp:
+    )) as community_mcp:
+        # Show the Community Support Agent's answer while it is being written
+        enable_tool_progress(community_mcp)
         
         # Create PM-specialized agent
         pm_agent = Agent(
             name="PM Insights Agent",
-            model=Claude(id="claude-sonnet-4-5"),
+            model=get_model("claude-sonnet-4-5"),
             tools=[community_mcp],
             instructions=[
                 "You are a PM team assistant analyzing community feedback.",
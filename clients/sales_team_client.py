@@ -8,6 +8,8 @@ The Sales team wants to:
 """
 
 import asyncio
+import sys
+from pathlib import Path
 
 # Load environment variables from .env file
 try:
@@ -17,9 +19,16 @@ except ImportError:
     pass  # Will use system environment variables
 
 from agno.agent import Agent
-from agno.models.anthropic import Claude
 from agno.tools.mcp import MCPTools
 
+# Make the shared helpers in common/ importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.admission import client_params
+from common.mcp_streaming import enable_tool_progress
+from common.models import get_model
+from common.schema_cache import schema_cached
+
 # MCP server URL of the main Community Support Agent OS
 COMMUNITY_SUPPORT_MCP_URL = "http://localhost:7777/mcp"
 
@@ -27,14 +36,16 @@ COMMUNITY_SUPPORT_MCP_URL = "http://localhost:7777/mcp"
 async def sales_agent_example():
     """Sales team agent that analyzes adoption and potential customers"""
     
-    async with MCPTools(
+    async with schema_cached(MCPTools(
         transport="streamable-http",
-        url=COMMUNITY_SUPPORT_MCP_URL,
+        server_params=client_params(COMMUNITY_SUPPORT_MCP_URL, "sales-team", timeout_seconds=60),
         timeout_seconds=60,
-    ) as community_mcp:
+    )) as community_mcp:
+        # Show the Community Support Agent's answer while it is being written
+        enable_tool_progress(community_mcp)
         sales_agent = Agent(
             name="Sales Intelligence Agent",
-            model=Claude(id="claude-sonnet-4-5"),
+            model=get_model("claude-sonnet-4-5"),
             tools=[community_mcp],
             instructions=[
                 "You are a Sales team assistant.",
@@ -10,6 +10,8 @@ This client demonstrates how to:
 """
 
 import asyncio
+import sys
+from pathlib import Path
 from uuid import uuid4
 
 # Load environment variables
@@ -20,9 +22,14 @@ except ImportError:
     pass
 
 from agno.agent import Agent
-from agno.models.anthropic import Claude
 from agno.tools.mcp import MCPTools
 
+# Make the shared helpers in common/ importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.models import get_model
+from common.schema_cache import schema_cached
+
 # MCP server URL
 MCP_SERVER_URL = "http://localhost:7777/mcp"
 
@@ -41,17 +48,17 @@ async def test_mcp_connection():
     print("Testing MCP Connection - Documentation Query")
     print("=" * 60 + "\n")
     
-    # Following cookbook pattern: async with MCPTools(...)
-    async with MCPTools(
+    # Following cookbook pattern: async with MCPTools(...), with cached tool schemas
+    async with schema_cached(MCPTools(
         transport="streamable-http",
         url=MCP_SERVER_URL,
         timeout_seconds=60,
-    ) as mcp_tools:
+    )) as mcp_tools:
         
         # Create agent with MCP tools
         test_agent = Agent(
             name="Test Agent",
-            model=Claude(id="claude-sonnet-4-5"),
+            model=get_model("claude-sonnet-4-5"),
             tools=[mcp_tools],
             instructions=[
                 "You help users learn about Agno by querying the Community Support Agent.",
@@ -81,15 +88,15 @@ async def test_multiple_queries():
     print("Testing Multiple Queries in Same Session")
     print("=" * 60 + "\n")
     
-    async with MCPTools(
+    async with schema_cached(MCPTools(
         transport="streamable-http",
         url=MCP_SERVER_URL,
         timeout_seconds=60,
-    ) as mcp_tools:
+    )) as mcp_tools:
         
         agent = Agent(
             name="Multi-Query Test Agent",
-            model=Claude(id="claude-sonnet-4-5"),
+            model=get_model("claude-sonnet-4-5"),
             tools=[mcp_tools],
             session_id=session_id,
             add_history_to_context=True,
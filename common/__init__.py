@@ -0,0 +1,3 @@
+"""
+Shared helpers for the MCP Agent OS servers, clients and scripts.
+"""
@@ -0,0 +1,353 @@
+"""
+Admission Control - Per-client rate limits and fair queueing for /mcp agent runs
+
+Every team client and cron job shares one /mcp endpoint, and each run_agent
+call starts a full agent run. Without admission control a large PM batch
+takes every slot, the Engineers team's bug triage waits behind it, and
+callers only find out after their 90-second client timeout. AdmissionControl
+sits in front of the agent-running tools:
+
+- Client identity: the X-Client-Id request header (team clients send their
+  team name), else the caller's address. At most max_clients ids are
+  tracked: idle ones are forgotten when a new id arrives, and beyond that
+  new ids share the OVERFLOW_CLIENT_ID bucket and queue, so made-up ids
+  cannot grow the server's state
+- A token bucket per client: at most rate_per_minute runs, with bursts of
+  up to burst runs. An empty bucket is rejected at once with a retry time
+- At most max_concurrent agent runs at once. Callers beyond that wait in a
+  weighted-fair queue (start-time fair queuing): each client gets slots in
+  proportion to its weight, however many requests it has queued
+- Bounded waiting: a full queue (max_queue in total, max_queue_per_client
+  per client) rejects at once, before the call uses up a rate limit token
+  or a fair-queue turn, and a call still queued after queue_timeout seconds
+  is rejected instead of running late
+
+Rejections are MCP errors with a message saying why and when to retry, so a
+calling agent sees them as a failed tool call straight away.
+
+Usage:
+    admission = AdmissionControl(max_concurrent=8, weights={"engineers-team": 4})
+    app = agent_os.get_app()
+    enable_admission_control(agent_os, admission)
+
+    MCPTools(transport="streamable-http", server_params=client_params(url, "pm-team"))
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from agno.os import AgentOS
+from agno.tools.mcp import StreamableHTTPClientParams
+from fastmcp.server.dependencies import get_http_headers, get_http_request
+from fastmcp.server.middleware import Middleware
+from mcp import McpError
+from mcp.types import ErrorData
+
+CLIENT_ID_HEADER = "x-client-id"
+
+# Client id shared by new callers once max_clients ids are tracked
+OVERFLOW_CLIENT_ID = "other"
+
+# JSON-RPC server error code for rejected calls, as in FastMCP's rate limiter
+REJECTED_ERROR_CODE = -32000
+
+
+class AdmissionRejected(McpError):
+    """A call rejected by admission control, with the reason in its message"""
+
+    def __init__(self, reason: str, message: str):
+        self.reason = reason
+        super().__init__(ErrorData(code=REJECTED_ERROR_CODE, message=message))
+
+
+class TokenBucket:
+    """Refills rate_per_second tokens per second, up to burst"""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token; return 0 if one was taken, else the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_per_second)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate_per_second
+
+
+@dataclass
+class ClientCounters:
+    """Admission counters of one client"""
+
+    admitted: int = 0
+    queued: int = 0
+    rejected: Dict[str, int] = field(default_factory=dict)
+    wait_seconds: float = 0.0
+
+
+class AdmissionControl:
+    """Token buckets per client, a run limit and a weighted-fair queue for the rest"""
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_queue: int = 64,
+        max_queue_per_client: int = 16,
+        queue_timeout: float = 10.0,
+        rate_per_minute: float = 60.0,
+        burst: int = 20,
+        weights: Optional[Dict[str, float]] = None,
+        default_weight: float = 1.0,
+        max_clients: int = 256,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_queue_per_client = max_queue_per_client
+        self.queue_timeout = queue_timeout
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.weights = weights or {}
+        self.default_weight = default_weight
+        self.max_clients = max_clients
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        # (start tag, arrival order, client, future); cancelled futures are skipped when popped
+        self._queue: List[Tuple[float, int, str, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._virtual_time = 0.0
+        self._finish_tags: Dict[str, float] = {}
+        self._queued_by_client: Dict[str, int] = {}
+        self.in_flight = 0
+
+        self.clients: Dict[str, ClientCounters] = {}
+        self.max_queue_depth = 0
+
+    # ==========================================
+    # Rate limits and fair queueing
+    # ==========================================
+
+    def _reject(self, client_id: str, reason: str, message: str) -> AdmissionRejected:
+        rejected = self.clients[client_id].rejected
+        rejected[reason] = rejected.get(reason, 0) + 1
+        return AdmissionRejected(reason, message)
+
+    def _start_tag(self, client_id: str) -> float:
+        # A client's next call starts after its previous one finishes in virtual
+        # time, and each call takes 1/weight, so heavier clients get more turns
+        start = max(self._virtual_time, self._finish_tags.get(client_id, 0.0))
+        self._finish_tags[client_id] = start + 1.0 / self.weights.get(client_id, self.default_weight)
+        return start
+
+    def _client(self, client_id: str) -> str:
+        # The id a call is accounted under: its own, or the shared overflow id
+        # once max_clients ids are tracked and none of them is idle
+        if client_id in self.clients or client_id in self.weights:
+            return client_id
+        if len(self.clients) >= self.max_clients:
+            self._forget_idle_clients()
+        return client_id if len(self.clients) < self.max_clients else OVERFLOW_CLIENT_ID
+
+    def _forget_idle_clients(self) -> None:
+        # A client with nothing queued and a refilled bucket is treated like a
+        # new one anyway; configured clients are kept for their stats
+        now = time.monotonic()
+        for client_id in list(self.clients):
+            if client_id in self.weights or self._queued_by_client.get(client_id, 0):
+                continue
+            bucket = self._buckets.get(client_id)
+            if bucket is not None and bucket.tokens + (now - bucket.updated) * bucket.rate_per_second < bucket.burst:
+                continue
+            del self.clients[client_id]
+            self._buckets.pop(client_id, None)
+            self._finish_tags.pop(client_id, None)
+            self._queued_by_client.pop(client_id, None)
+
+    def queue_depth(self) -> int:
+        return sum(self._queued_by_client.values())
+
+    async def acquire(self, client_id: str) -> None:
+        """Wait for a run slot for a client, or raise AdmissionRejected"""
+        client_id = self._client(client_id)
+        counters = self.clients.setdefault(client_id, ClientCounters())
+
+        # Queue limits come first: a call rejected for a full queue must not
+        # use up the client's rate limit token or its fair-queue turn
+        admit_now = self.in_flight < self.max_concurrent and not self.queue_depth()
+        if not admit_now and self.queue_depth() >= self.max_queue:
+            raise self._reject(
+                client_id, "queue_full", f"Rejected: the server is overloaded ({self.max_queue} calls queued). "
+                "Retry later."
+            )
+        if not admit_now and self._queued_by_client.get(client_id, 0) >= self.max_queue_per_client:
+            raise self._reject(
+                client_id,
+                "client_queue_full",
+                f"Rejected: client '{client_id}' already has {self.max_queue_per_client} calls queued. "
+                "Retry once some have finished.",
+            )
+
+        if self.rate_per_minute > 0:
+            bucket = self._buckets.get(client_id)
+            if bucket is None:
+                bucket = self._buckets[client_id] = TokenBucket(self.rate_per_minute / 60, self.burst)
+            retry_in = bucket.take()
+            if retry_in:
+                raise self._reject(
+                    client_id,
+                    "rate_limited",
+                    f"Rejected: client '{client_id}' is over its limit of {self.rate_per_minute:g} agent runs "
+                    f"per minute. Retry in {retry_in:.0f}s.",
+                )
+
+        start_tag = self._start_tag(client_id)
+        if admit_now:
+            self._virtual_time = start_tag
+            self.in_flight += 1
+            counters.admitted += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (start_tag, next(self._arrivals), client_id, future))
+        self._queued_by_client[client_id] = self._queued_by_client.get(client_id, 0) + 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        counters.queued += 1
+
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise self._reject(
+                client_id,
+                "queue_timeout",
+                f"Rejected: no run slot freed up within {self.queue_timeout:g}s. Retry later.",
+            )
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the caller went away
+                self.release()
+            raise
+        finally:
+            if not future.done() or future.cancelled():
+                # Timed out or the caller went away: give up the place in the queue
+                future.cancel()
+                self._queued_by_client[client_id] -= 1
+            counters.wait_seconds += time.monotonic() - queued_at
+        counters.admitted += 1
+
+    def release(self) -> None:
+        """Free a run slot and hand it to the next queued call"""
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._queue and self.in_flight < self.max_concurrent:
+            start_tag, _, client_id, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self._queued_by_client[client_id] -= 1
+            self._virtual_time = start_tag
+            self.in_flight += 1
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def admit(self, client_id: str) -> AsyncIterator[None]:
+        """Hold a run slot for the duration of the block"""
+        await self.acquire(client_id)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return run slots, queue depth and per-client admissions and rejections"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth(),
+            "max_queue_depth": self.max_queue_depth,
+            "max_clients": self.max_clients,
+            "clients": {
+                client_id: {
+                    "weight": self.weights.get(client_id, self.default_weight),
+                    "admitted": counters.admitted,
+                    "queued": counters.queued,
+                    "queue_depth": self._queued_by_client.get(client_id, 0),
+                    "rejected": dict(counters.rejected),
+                    "avg_wait_seconds": round(counters.wait_seconds / counters.queued, 3) if counters.queued else 0.0,
+                }
+                for client_id, counters in self.clients.items()
+            },
+        }
+
+
+# ==========================================
+# /mcp integration
+# ==========================================
+
+def client_identity() -> str:
+    """The X-Client-Id header of the current /mcp request, else the caller's address"""
+    client_id = get_http_headers().get(CLIENT_ID_HEADER)
+    if client_id:
+        return client_id
+    try:
+        request = get_http_request()
+    except RuntimeError:
+        return "anonymous"
+    return request.client.host if request.client is not None else "anonymous"
+
+
+class AdmissionMiddleware(Middleware):
+    """FastMCP middleware that admits calls to the given tools through AdmissionControl"""
+
+    def __init__(self, admission: AdmissionControl, tool_names: Iterable[str] = ("run_agent",)):
+        self.admission = admission
+        self.tool_names = set(tool_names)
+
+    async def on_call_tool(self, context, call_next):
+        if context.message.name not in self.tool_names:
+            return await call_next(context)
+        async with self.admission.admit(client_identity()):
+            return await call_next(context)
+
+
+def enable_admission_control(
+    agent_os: AgentOS, admission: AdmissionControl, tool_names: Iterable[str] = ("run_agent",)
+) -> None:
+    """
+    Put the agent-running tools of AgentOS's MCP server behind admission control.
+
+    Call after agent_os.get_app(), which creates the MCP server. Other MCP
+    tools (config, sessions, memories) are cheap and never queued.
+    """
+    server = agent_os._mcp_app.state.fastmcp_server
+    server.add_middleware(AdmissionMiddleware(admission, tool_names))
+
+
+def client_params(url: str, client_id: str, timeout_seconds: float = 90) -> StreamableHTTPClientParams:
+    """Streamable HTTP parameters that identify a client to the server's admission control"""
+    return StreamableHTTPClientParams(
+        url=url,
+        headers={"X-Client-Id": client_id},
+        timeout=timedelta(seconds=timeout_seconds),
+    )
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    """Parse "engineers-team=4,pm-team=1" into client weights"""
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip():
+            weights[name.strip()] = float(weight or 1)
+    return weights
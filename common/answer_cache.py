@@ -0,0 +1,358 @@
+"""
+Semantic Answer Cache - Reuse answers to near-identical questions
+
+Teams ask the same things in slightly different words ("most active
+contributors", "who are the most active contributors?"). Each question is turned
+into a hashed n-gram vector (word unigrams and bigrams plus character
+trigrams, no model download needed) and compared against the stored
+questions with a NumPy cosine similarity. A similar enough question with a
+fresh enough entry gets the stored answer without running the agent.
+
+Similar wording is not enough when the words that differ are the ones that
+decide the answer: "last 10 issues" and "last 50 issues" score 0.84. A hit
+therefore also needs the same key terms: numbers, time periods
+("this week" vs "this month") and negations, including negating prefixes
+("install" vs "uninstall").
+
+- threshold: minimum cosine similarity for a hit. 0.8 is the lowest value
+  that serves no wrong answer on the labelled question pairs in
+  scripts/bench_answer_cache.py; without the key-term check it serves 6
+- ttl_seconds: entries older than this are never served
+- max_entries: once full, expired entries go first, then the least recently used
+- db_file: answers are also written through to SQLite, so a restarted
+  server starts warm and every worker process serves the answers the
+  others stored
+
+Usage with an Agno agent:
+    cache = SemanticAnswerCache(threshold=0.8, ttl_seconds=900, db_file="tmp/answer_cache.db")
+    enable_answer_cache(agent, cache)
+"""
+
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, Optional, Tuple
+from uuid import uuid4
+
+import numpy as np
+from agno.agent import Agent
+from agno.db.base import SessionType
+from agno.models.metrics import Metrics
+from agno.run.agent import RunCompletedEvent, RunContentEvent, RunErrorEvent, RunOutput
+from agno.run.base import RunStatus
+
+STOPWORDS = {
+    "a", "an", "and", "any", "are", "can", "do", "does", "for", "from", "give", "i", "in", "is", "it",
+    "me", "of", "on", "or", "our", "please", "should", "tell", "the", "there", "to", "us", "we", "what",
+    "which", "with", "you",
+}
+# Words that change what a question asks for even when the rest matches
+TIME_WORDS = {
+    "today", "tonight", "yesterday", "tomorrow", "hour", "hours", "hourly", "day", "days", "daily",
+    "week", "weeks", "weekly", "weekend", "month", "months", "monthly", "quarter", "quarterly",
+    "year", "years", "yearly", "annual", "monday", "tuesday", "wednesday", "thursday", "friday",
+    "saturday", "sunday", "january", "february", "march", "april", "may", "june", "july",
+    "august", "september", "october", "november", "december",
+}
+NEGATIONS = {"not", "no", "never", "without", "none", "nor", "cannot", "neither"}
+NEGATING_PREFIXES = ("un", "dis", "non", "de")
+
+
+def key_terms(text: str) -> FrozenSet[str]:
+    """Numbers, time periods and negations of a question; a cached answer must match them exactly"""
+    words = re.findall(r"[a-z0-9']+", text.lower())
+    terms = {w for w in words if any(c.isdigit() for c in w) or w in TIME_WORDS}
+    if any(w in NEGATIONS or w.endswith("n't") for w in words):
+        terms.add("<not>")
+    return frozenset(terms)
+
+
+def negated_pair(words: FrozenSet[str], other: FrozenSet[str]) -> bool:
+    """True when a word of one question is a word of the other with a negating prefix (install, uninstall)"""
+    return any(
+        word.startswith(prefix) and word[len(prefix):] in rest
+        for mine, rest in ((words, other), (other, words))
+        for word in mine - rest
+        for prefix in NEGATING_PREFIXES
+    )
+
+
+def _words(text: str) -> FrozenSet[str]:
+    return frozenset(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+class HashedNgramVectorizer:
+    """Maps text to a fixed-size, L2-normalized vector of hashed n-gram counts"""
+
+    def __init__(self, dim: int = 4096):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOPWORDS]
+        features = [f"w:{w}" for w in words]
+        features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f" {word} "
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return features
+
+    def transform(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            # The top bit picks the sign so colliding features tend to cancel out
+            vector[value % self.dim] += 1.0 if value >> 63 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SemanticAnswerCache:
+    """Similarity-matched answer cache with TTL and LRU eviction"""
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        ttl_seconds: float = 900,
+        max_entries: int = 500,
+        dim: int = 4096,
+        db_file: Optional[str] = None,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.vectorizer = HashedNgramVectorizer(dim)
+
+        # Row i of the matrix is the vector of questions[i]
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        self._created_at = np.zeros(max_entries, dtype=np.float64)
+        self._last_used = np.zeros(max_entries, dtype=np.float64)
+        self._occupied = np.zeros(max_entries, dtype=bool)
+        self._questions: List[Optional[str]] = [None] * max_entries
+        self._answers: List[Optional[str]] = [None] * max_entries
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.key_term_mismatches = 0
+        self._hit_similarity_total = 0.0
+
+        # Newest created_at read from disk; later rows were stored by other workers
+        self._synced_at = 0.0
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_file:
+            Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS answer_cache (question TEXT PRIMARY KEY, answer TEXT, created_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answer_cache_created_at ON answer_cache (created_at)")
+            with self._lock:
+                self._conn.execute("DELETE FROM answer_cache WHERE created_at < ?", (time.time() - ttl_seconds,))
+                self._sync()
+
+    def _sync(self) -> None:
+        """Load answers stored on disk since the last sync, oldest first"""
+        # Callers hold self._lock
+        rows = self._conn.execute(
+            "SELECT question, answer, created_at FROM answer_cache WHERE created_at > ? "
+            "ORDER BY created_at DESC LIMIT ?",
+            (self._synced_at, self.max_entries),
+        ).fetchall()
+        for question, answer, created_at in reversed(rows):
+            self._store(question, answer, created_at)
+            self._synced_at = max(self._synced_at, created_at)
+
+    def get(self, question: str) -> Optional[Tuple[str, str, float]]:
+        """Return (answer, cached question, similarity) for a similar fresh question, or None"""
+        vector = self.vectorizer.transform(question)
+        now = time.time()
+        with self._lock:
+            if self._conn is not None:
+                self._sync()
+            live = self._occupied.copy()
+            expired = live & (now - self._created_at > self.ttl_seconds)
+            for i in np.flatnonzero(expired):
+                self._drop(i)
+                self.expirations += 1
+            live &= ~expired
+
+            if live.any():
+                similarities = np.where(live, self._vectors @ vector, -1.0)
+                terms, words = key_terms(question), _words(question)
+                # Best first, skipping similar questions that ask for other numbers, periods or the opposite
+                for best in np.argsort(-similarities):
+                    if similarities[best] < self.threshold:
+                        break
+                    cached = self._questions[best]
+                    if key_terms(cached) != terms or negated_pair(words, _words(cached)):
+                        self.key_term_mismatches += 1
+                        continue
+                    self._last_used[best] = now
+                    self.hits += 1
+                    self._hit_similarity_total += float(similarities[best])
+                    return self._answers[best], cached, float(similarities[best])
+
+            self.misses += 1
+            return None
+
+    def put(self, question: str, answer: str) -> None:
+        """Store an answer, replacing the entry for the same question if there is one"""
+        now = time.time()
+        with self._lock:
+            self._store(question, answer, now)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO answer_cache (question, answer, created_at) VALUES (?, ?, ?)",
+                    (question, answer, now),
+                )
+                self._conn.execute("DELETE FROM answer_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+
+    def _store(self, question: str, answer: str, created_at: float) -> None:
+        # Callers hold self._lock
+        if question in self._questions:
+            slot = self._questions.index(question)
+        else:
+            slot = self._free_slot(time.time())
+        self._vectors[slot] = self.vectorizer.transform(question)
+        self._created_at[slot] = created_at
+        self._last_used[slot] = created_at
+        self._questions[slot] = question
+        self._answers[slot] = answer
+        self._occupied[slot] = True
+
+    def _free_slot(self, now: float) -> int:
+        if not self._occupied.all():
+            return int(np.argmin(self._occupied))
+        expired = np.flatnonzero(now - self._created_at > self.ttl_seconds)
+        if expired.size:
+            self.expirations += 1
+            return int(expired[0])
+        self.evictions += 1
+        return int(np.argmin(self._last_used))
+
+    def _drop(self, slot: int) -> None:
+        self._questions[slot] = None
+        self._answers[slot] = None
+        self._vectors[slot] = 0.0
+        self._occupied[slot] = False
+
+    def clear(self) -> None:
+        """Drop every cached answer, in memory and on disk"""
+        with self._lock:
+            for slot in range(self.max_entries):
+                self._drop(slot)
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM answer_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "avg_hit_similarity": round(self._hit_similarity_total / self.hits, 4) if self.hits else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "key_term_mismatches": self.key_term_mismatches,
+            "entries": int(self._occupied.sum()),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def enable_answer_cache(agent: Agent, cache: SemanticAnswerCache) -> None:
+    """
+    Serve an agent's runs from the answer cache when a similar question was answered recently.
+
+    Only stand-alone questions are cached: runs that continue a session
+    with earlier runs may depend on its history, so they always run the
+    agent. Hits are not written to the agent's session history.
+    """
+    original_arun = agent.arun
+
+    async def continues_session(session_id: Optional[str]) -> bool:
+        if session_id is None or agent.db is None:
+            return False
+        # The session store is synchronous; keep its read off the event loop
+        session = await asyncio.to_thread(agent.db.get_session, session_id=session_id, session_type=SessionType.AGENT)
+        return session is not None and bool(session.runs)
+
+    def cache_metadata(cached_question: str, similarity: float) -> Dict[str, Any]:
+        return {"answer_cache": {"hit": True, "cached_question": cached_question, "similarity": round(similarity, 4)}}
+
+    def cached_run_output(
+        session_id: Optional[str], answer: str, cached_question: str, similarity: float
+    ) -> RunOutput:
+        return RunOutput(
+            run_id=str(uuid4()),
+            agent_id=agent.id,
+            agent_name=agent.name,
+            session_id=session_id or str(uuid4()),
+            content=answer,
+            metrics=Metrics(),
+            metadata=cache_metadata(cached_question, similarity),
+            status=RunStatus.completed,
+        )
+
+    async def run(question: str, **kwargs) -> RunOutput:
+        if await continues_session(kwargs["session_id"]):
+            return await original_arun(question, **kwargs)
+        cached = cache.get(question)
+        if cached is not None:
+            return cached_run_output(kwargs["session_id"], *cached)
+
+        run_output = await original_arun(question, **kwargs)
+        if run_output.status == RunStatus.completed and isinstance(run_output.content, str):
+            cache.put(question, run_output.content)
+        return run_output
+
+    async def run_stream(question: str, **kwargs) -> AsyncIterator[Any]:
+        if await continues_session(kwargs["session_id"]):
+            async for event in original_arun(question, **kwargs):
+                yield event
+            return
+        cached = cache.get(question)
+        if cached is not None:
+            run_output = cached_run_output(kwargs["session_id"], *cached)
+            ids = {
+                "run_id": run_output.run_id,
+                "agent_id": agent.id,
+                "agent_name": agent.name,
+                "session_id": run_output.session_id,
+            }
+            yield RunContentEvent(content=run_output.content, **ids)
+            yield RunCompletedEvent(content=run_output.content, metadata=run_output.metadata, **ids)
+            if kwargs.get("yield_run_output"):
+                yield run_output
+            return
+
+        content, failed = "", False
+        async for event in original_arun(question, **kwargs):
+            if isinstance(event, RunContentEvent) and isinstance(event.content, str):
+                content += event.content
+            elif isinstance(event, RunErrorEvent):
+                failed = True
+            yield event
+        if content and not failed:
+            cache.put(question, content)
+
+    def cached_arun(input: Any = None, *, stream: Optional[bool] = None, session_id: Optional[str] = None, **kwargs):
+        kwargs.update(stream=stream, session_id=session_id)
+        if not isinstance(input, str):
+            return original_arun(input, **kwargs)
+        if stream if stream is not None else agent.stream:
+            return run_stream(input, **kwargs)
+        return run(input, **kwargs)
+
+    agent.arun = cached_arun
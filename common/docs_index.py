@@ -0,0 +1,468 @@
+"""
+Docs Index - Local keyword and vector search over a snapshot of the Phoenix docs
+
+Every documentation question went to the remote Mintlify MCP endpoint, a
+network round trip per search that fails or stalls when the upstream does.
+DocsIndex keeps a local snapshot of the docs and searches it in
+milliseconds:
+
+- Pages are split into chunks at markdown headings (at most max_chars
+  each), prefixed with their heading path
+- Keyword search: SQLite FTS5 with Porter stemming, ranked by BM25
+- Vector search: one hashed n-gram vector per chunk (the same vectorizer as
+  the semantic answer cache, no model download) in a memory-mapped float32
+  matrix, scored with a single NumPy matrix-vector product
+- Hybrid search (default) merges both rankings with reciprocal rank fusion
+- Incremental refresh: the source lists its pages. Pages whose ETag or
+  content hash did not change are skipped, changed pages are re-chunked in
+  place, and pages that disappeared are removed. Freed matrix rows are
+  reused, and the matrix grows by doubling
+- If a refresh fails, the current snapshot stays in use
+- Several processes can share one index directory: one of them refreshes
+  (a lease in SQLite), the others reopen the matrix when its version changes
+
+LlmsTxtSource reads the docs site's llms.txt (the page list Mintlify
+publishes) and fetches each page as markdown with conditional requests.
+FixtureDocsSource reads pages from a JSON file, for offline runs.
+
+Usage:
+    index = DocsIndex("tmp/phoenix_docs")
+    index.refresh(LlmsTxtSource("https://arize.com/docs/phoenix/llms.txt"))
+    index.search("how do I trace an agno agent", limit=5)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from common.answer_cache import HashedNgramVectorizer
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    etag TEXT,
+    fetched_at REAL NOT NULL,
+    chunks INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    slot INTEGER NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_url ON chunks (url, position);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(title, heading, text, tokenize = 'porter unicode61');
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\((https?://[^)\s]+)\)")
+HEADING_PATTERN = re.compile(r"^(#{1,4})\s+(.+?)\s*#*\s*$")
+# Reciprocal rank fusion constant, as in the original RRF paper
+RRF_K = 60
+
+
+def chunk_markdown(title: str, content: str, max_chars: int = 1500) -> List[Tuple[str, str]]:
+    """Split a markdown page into (heading path, text) chunks at headings and paragraph breaks"""
+    chunks: List[Tuple[str, str]] = []
+    path: List[str] = []
+    paragraphs: List[str] = []
+
+    def flush() -> None:
+        text = "\n\n".join(paragraphs).strip()
+        paragraphs.clear()
+        if text:
+            chunks.append((" > ".join(path) or title, text))
+
+    in_code = False
+    for block in re.split(r"\n\s*\n", content):
+        lines = block.strip().splitlines()
+        if not lines:
+            continue
+        # "# comment" lines inside code blocks are not headings
+        heading = HEADING_PATTERN.match(lines[0]) if not in_code else None
+        if block.count("```") % 2:
+            in_code = not in_code
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            path[level - 1:] = [heading.group(2)]
+            lines = lines[1:]
+            if not lines:
+                continue
+        text = "\n".join(lines)
+        if paragraphs and sum(len(p) for p in paragraphs) + len(text) > max_chars:
+            flush()
+        # A single paragraph longer than max_chars becomes several chunks
+        while len(text) > max_chars:
+            paragraphs.append(text[:max_chars])
+            flush()
+            text = text[max_chars:]
+        paragraphs.append(text)
+    flush()
+    return chunks
+
+
+def fts_query(query: str) -> str:
+    """Any of the query's words, quoted so FTS5 syntax in the question cannot break the match"""
+    words = re.findall(r"\w+", query.lower())
+    return " OR ".join(f'"{word}"' for word in words if len(word) > 1)
+
+
+# ==========================================
+# Sources
+# ==========================================
+
+class LlmsTxtSource:
+    """Docs pages listed in a site's llms.txt, fetched as markdown with conditional requests"""
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        self.url = url
+        self.client = httpx.Client(timeout=timeout, follow_redirects=True)
+        self.requests = 0
+
+    def pages(self) -> List[Dict[str, str]]:
+        self.requests += 1
+        response = self.client.get(self.url)
+        response.raise_for_status()
+        pages: Dict[str, Dict[str, str]] = {}
+        for title, url in LINK_PATTERN.findall(response.text):
+            pages.setdefault(url, {"url": url, "title": title})
+        return list(pages.values())
+
+    def fetch(self, url: str, etag: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+        """The page's markdown and ETag, or None if it did not change since etag"""
+        self.requests += 1
+        response = self.client.get(url, headers={"If-None-Match": etag} if etag else None)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        return response.text, response.headers.get("etag")
+
+
+class FixtureDocsSource:
+    """Docs pages from a JSON file ({"pages": [{"url", "title", "content"}]}), for offline runs"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = {page["url"]: page for page in json.loads(Path(path).read_text())["pages"]}
+        self.requests = 0
+
+    def pages(self) -> List[Dict[str, str]]:
+        self.requests += 1
+        return [{"url": page["url"], "title": page["title"]} for page in self.data.values()]
+
+    def fetch(self, url: str, etag: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+        self.requests += 1
+        content = self.data[url]["content"]
+        page_etag = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        return None if page_etag == etag else (content, page_etag)
+
+
+# ==========================================
+# Index
+# ==========================================
+
+class DocsIndex:
+    """FTS5 keyword index and memory-mapped vector matrix over docs chunks, refreshed incrementally"""
+
+    def __init__(self, index_dir: str = "tmp/phoenix_docs", dim: int = 2048, max_chars: int = 1500):
+        self.index_dir = index_dir
+        self.dim = dim
+        self.max_chars = max_chars
+        Path(index_dir).mkdir(parents=True, exist_ok=True)
+        self.matrix_file = str(Path(index_dir) / "embeddings.f32")
+        self.vectorizer = HashedNgramVectorizer(dim=dim)
+        self._conn = sqlite3.connect(str(Path(index_dir) / "docs.db"), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+        self._matrix: Optional[np.memmap] = None
+        self._matrix_version: Optional[str] = None
+
+        self.searches = 0
+        self.search_ms = 0.0
+        self.last_refresh: Optional[Dict[str, Any]] = None
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, **values: Any) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)", [(k, None if v is None else str(v)) for k, v in values.items()]
+        )
+
+    # ==========================================
+    # Embedding matrix
+    # ==========================================
+
+    def _open_matrix(self) -> Optional[np.memmap]:
+        """The current matrix, reopened if another process (or a refresh) replaced it"""
+        version = self._meta("version")
+        if version != self._matrix_version or self._matrix is None:
+            capacity = int(self._meta("capacity") or 0)
+            self._matrix = (
+                np.memmap(self.matrix_file, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+                if capacity and os.path.exists(self.matrix_file) else None
+            )
+            self._matrix_version = version
+        return self._matrix
+
+    def _ensure_capacity(self, rows: int) -> np.memmap:
+        matrix = self._open_matrix()
+        capacity = len(matrix) if matrix is not None else 0
+        if rows <= capacity:
+            return matrix
+        new_capacity = max(256, capacity * 2, rows)
+        # Write the grown matrix next to the old one and swap it in, so readers never see a short file
+        grown_file = f"{self.matrix_file}.grow"
+        grown = np.memmap(grown_file, dtype=np.float32, mode="w+", shape=(new_capacity, self.dim))
+        if matrix is not None:
+            grown[:capacity] = matrix
+        grown.flush()
+        del grown
+        os.replace(grown_file, self.matrix_file)
+        self._set_meta(capacity=new_capacity)
+        self._matrix = np.memmap(self.matrix_file, dtype=np.float32, mode="r+", shape=(new_capacity, self.dim))
+        return self._matrix
+
+    # ==========================================
+    # Refresh
+    # ==========================================
+
+    def claim_refresh(self, interval_seconds: float, lease_seconds: float = 900.0) -> bool:
+        """Claim the refresh if it is due and no other process is refreshing"""
+        now = time.time()
+        with self._lock, self._conn:
+            if float(self._meta("lease_until") or 0) > now or float(self._meta("refreshed_at") or 0) > now - interval_seconds:
+                return False
+            self._set_meta(lease_until=now + lease_seconds)
+        return True
+
+    def refresh_if_due(self, source: Any, interval_seconds: float) -> Optional[Dict[str, Any]]:
+        """Refresh unless the index was refreshed within interval_seconds or another process is refreshing it"""
+        if not self.claim_refresh(interval_seconds):
+            return None
+        return self.refresh(source)
+
+    def refresh(self, source: Any) -> Dict[str, Any]:
+        """Re-index pages that changed at the source, add new ones and remove those that are gone"""
+        with self._refresh_lock:
+            start = time.perf_counter()
+            added = updated = unchanged = removed = failed = 0
+            error = None
+            try:
+                listing = source.pages()
+            except (httpx.HTTPError, OSError, ValueError, KeyError) as e:
+                listing = None
+                error = f"{type(e).__name__}: {e}"
+            if listing is not None:
+                known = {row["url"]: row for row in self._conn.execute("SELECT url, content_hash, etag FROM pages")}
+                for page in listing:
+                    previous = known.get(page["url"])
+                    try:
+                        fetched = source.fetch(page["url"], previous["etag"] if previous else None)
+                    except (httpx.HTTPError, OSError, ValueError, KeyError) as e:
+                        failed += 1
+                        error = f"{page['url']}: {type(e).__name__}: {e}"
+                        continue
+                    if fetched is None:
+                        unchanged += 1
+                        continue
+                    content, etag = fetched
+                    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+                    if previous and previous["content_hash"] == content_hash:
+                        unchanged += 1
+                        with self._lock, self._conn:
+                            self._conn.execute(
+                                "UPDATE pages SET etag = ?, fetched_at = ? WHERE url = ?", (etag, time.time(), page["url"])
+                            )
+                        continue
+                    self._index_page(page["url"], page["title"], content, content_hash, etag)
+                    added += previous is None
+                    updated += previous is not None
+                # Pages that failed to fetch stay; only pages missing from the listing are removed
+                listed = {page["url"] for page in listing}
+                for url in set(known) - listed:
+                    self._remove_page(url)
+                    removed += 1
+            with self._lock, self._conn:
+                self._set_meta(refreshed_at=time.time(), lease_until=None, last_error=error)
+            self.last_refresh = {
+                "added": added,
+                "updated": updated,
+                "unchanged": unchanged,
+                "removed": removed,
+                "failed": failed,
+                "error": error,
+                "seconds": round(time.perf_counter() - start, 3),
+            }
+            return self.last_refresh
+
+    def _remove_chunks(self, url: str, matrix: Optional[np.memmap]) -> None:
+        rows = self._conn.execute("SELECT id, slot FROM chunks WHERE url = ?", (url,)).fetchall()
+        if matrix is not None and rows:
+            # Zeroed rows score 0 and are never returned, until a new chunk takes the slot
+            matrix[[row["slot"] for row in rows]] = 0
+        self._conn.executemany("DELETE FROM chunks_fts WHERE rowid = ?", [(row["id"],) for row in rows])
+        self._conn.execute("DELETE FROM chunks WHERE url = ?", (url,))
+
+    def _index_page(self, url: str, title: str, content: str, content_hash: str, etag: Optional[str]) -> None:
+        chunks = chunk_markdown(title, content, self.max_chars)
+        vectors = [self.vectorizer.transform(f"{title} {heading}\n{text}") for heading, text in chunks]
+        with self._lock, self._conn:
+            old = self._conn.execute("SELECT COUNT(*) AS n FROM chunks WHERE url = ?", (url,)).fetchone()["n"]
+            total = self._conn.execute("SELECT COUNT(*) AS n FROM chunks").fetchone()["n"]
+            matrix = self._ensure_capacity(total - old + len(chunks))
+            self._remove_chunks(url, matrix)
+            used = {row["slot"] for row in self._conn.execute("SELECT slot FROM chunks")}
+            free = (slot for slot in range(len(matrix)) if slot not in used)
+            for position, ((heading, text), vector) in enumerate(zip(chunks, vectors)):
+                slot = next(free)
+                matrix[slot] = vector
+                chunk_id = self._conn.execute(
+                    "INSERT INTO chunks (url, position, slot) VALUES (?, ?, ?)", (url, position, slot)
+                ).lastrowid
+                self._conn.execute(
+                    "INSERT INTO chunks_fts (rowid, title, heading, text) VALUES (?, ?, ?, ?)",
+                    (chunk_id, title, heading, text),
+                )
+            matrix.flush()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (url, title, content_hash, etag, time.time(), len(chunks)),
+            )
+            self._set_meta(version=time.time_ns())
+            self._matrix_version = self._meta("version")
+
+    def _remove_page(self, url: str) -> None:
+        with self._lock, self._conn:
+            self._remove_chunks(url, self._open_matrix())
+            if self._matrix is not None:
+                self._matrix.flush()
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self._set_meta(version=time.time_ns())
+            self._matrix_version = self._meta("version")
+
+    # ==========================================
+    # Search
+    # ==========================================
+
+    def _keyword_ranking(self, query: str, limit: int) -> List[int]:
+        match = fts_query(query)
+        if not match:
+            return []
+        rows = self._conn.execute(
+            "SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH ? ORDER BY bm25(chunks_fts, 2.0, 3.0, 1.0) LIMIT ?",
+            (match, limit),
+        ).fetchall()
+        return [row["rowid"] for row in rows]
+
+    def _vector_ranking(self, query: str, limit: int) -> List[int]:
+        matrix = self._open_matrix()
+        if matrix is None:
+            return []
+        scores = matrix @ self.vectorizer.transform(query)
+        top = np.argpartition(-scores, min(limit, len(scores) - 1))[:limit]
+        slots = [int(slot) for slot in top[np.argsort(-scores[top])] if scores[slot] > 0]
+        if not slots:
+            return []
+        placeholders = ",".join("?" * len(slots))
+        ids = {
+            row["slot"]: row["id"]
+            for row in self._conn.execute(f"SELECT id, slot FROM chunks WHERE slot IN ({placeholders})", slots)
+        }
+        return [ids[slot] for slot in slots if slot in ids]
+
+    def search(self, query: str, limit: int = 5, mode: str = "hybrid") -> List[Dict[str, Any]]:
+        """Best matching chunks for a query; mode is keyword, vector or hybrid (both, fused by rank)"""
+        start = time.perf_counter()
+        limit = max(1, min(limit, 20))
+        candidates = limit * 4
+        with self._lock:
+            rankings = []
+            if mode in ("keyword", "hybrid"):
+                rankings.append(self._keyword_ranking(query, candidates))
+            if mode in ("vector", "hybrid"):
+                rankings.append(self._vector_ranking(query, candidates))
+            fused: Dict[int, float] = {}
+            for ranking in rankings:
+                for rank, chunk_id in enumerate(ranking):
+                    fused[chunk_id] = fused.get(chunk_id, 0.0) + 1 / (RRF_K + rank + 1)
+            best = sorted(fused, key=lambda chunk_id: -fused[chunk_id])[:limit]
+            results = []
+            for chunk_id in best:
+                row = self._conn.execute(
+                    "SELECT c.url, f.title, f.heading, f.text FROM chunks c JOIN chunks_fts f ON f.rowid = c.id "
+                    "WHERE c.id = ?",
+                    (chunk_id,),
+                ).fetchone()
+                if row:
+                    results.append({
+                        "title": row["title"],
+                        "section": row["heading"],
+                        "url": row["url"].removesuffix(".md"),
+                        "text": row["text"],
+                        "score": round(fused[chunk_id], 4),
+                    })
+        self.searches += 1
+        self.search_ms += (time.perf_counter() - start) * 1000
+        return results
+
+    def get_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """A whole indexed page, reassembled from its chunks"""
+        with self._lock:
+            page = self._conn.execute(
+                "SELECT * FROM pages WHERE url IN (?, ?)", (url, url if url.endswith(".md") else f"{url}.md")
+            ).fetchone()
+            if page is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT f.heading, f.text FROM chunks c JOIN chunks_fts f ON f.rowid = c.id "
+                "WHERE c.url = ? ORDER BY c.position",
+                (page["url"],),
+            ).fetchall()
+        return {
+            "title": page["title"],
+            "url": page["url"].removesuffix(".md"),
+            "sections": [{"section": row["heading"], "text": row["text"]} for row in rows],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return index size, freshness, the last refresh and search timings"""
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) AS n FROM pages").fetchone()["n"]
+            chunks = self._conn.execute("SELECT COUNT(*) AS n FROM chunks").fetchone()["n"]
+            refreshed_at = self._meta("refreshed_at")
+            last_error = self._meta("last_error")
+            capacity = int(self._meta("capacity") or 0)
+        return {
+            "index_dir": self.index_dir,
+            "pages": pages,
+            "chunks": chunks,
+            "matrix_rows": capacity,
+            "matrix_mb": round(capacity * self.dim * 4 / 1e6, 1),
+            "refreshed_at": float(refreshed_at) if refreshed_at else None,
+            "last_error": last_error,
+            "last_refresh": self.last_refresh,
+            "searches": self.searches,
+            "avg_search_ms": round(self.search_ms / self.searches, 3) if self.searches else None,
+        }
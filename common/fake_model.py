@@ -0,0 +1,337 @@
+"""
+Fake Model - Deterministic offline stand-in for Claude
+
+Lets the Agent OS, the team clients and the demo scripts run without an
+Anthropic API key or network access, so benchmarks and profiles measure
+Agno, MCP and server overhead instead of model latency and variance.
+
+For every user message the fake model either:
+- replays a recorded turn: the tool calls and answer captured from a real
+  run (see RecordingClaude in common/models.py), matched on the message, or
+- falls back to a heuristic: call the tool whose name and description best
+  match the message, filling required arguments from it, then answer with
+  a short summary of the tool results
+
+Synthetic latency is added per model call: latency_seconds plus the prompt
+at prefill_tokens_per_second before the first token, then output tokens at
+tokens_per_second. Structured output requests (used for session summaries)
+get a JSON object. Token usage is estimated from text length (or taken from
+the recording) so run metrics stay populated; like Claude's, the prompt
+tokens include the tool definitions.
+
+Recording file format:
+    {"turns": [{"match": "last 5 issues", "steps": [
+        {"tool_calls": [{"name": "run_agent", "arguments": {"agent_id": "community-support-agent", "message": "{query}"}}]},
+        {"content": "Here are the latest issues ...", "output_tokens": 120}
+    ]}]}
+
+"match" is a case-insensitive substring of the user message ("" matches any
+message), and "{query}" in string arguments is replaced by the message.
+A turn is only used when every tool it calls is available to the agent.
+"""
+
+import asyncio
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.metrics import Metrics
+from agno.models.response import ModelResponse
+from pydantic import BaseModel
+
+from common.tokens import estimate_tokens
+
+
+def _words(text: str) -> set:
+    return set(re.findall(r"[a-z]+", text.lower()))
+
+
+def current_turn(messages: List[Message]) -> Tuple[str, int, List[Message]]:
+    """Return the last user message, how many model calls it already had, and its tool results"""
+    user_indexes = [i for i, m in enumerate(messages) if m.role == "user"]
+    if not user_indexes:
+        return "", 0, []
+    last_user = user_indexes[-1]
+    after = messages[last_user + 1 :]
+    return (
+        messages[last_user].get_content_string(),
+        sum(m.role == "assistant" for m in after),
+        [m for m in after if m.role == "tool"],
+    )
+
+
+def _tool_name_matches(available: str, recorded: str) -> bool:
+    # Agno may prefix MCP tool names, so compare without leading underscores
+    return available.lstrip("_") == recorded.lstrip("_")
+
+
+class ModelRecording:
+    """Recorded turns (tool calls and answers) keyed by user message, stored as JSON"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self.turns: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            self.turns = json.loads(self.path.read_text()).get("turns", [])
+
+    def find(self, query: str, tool_names: List[str]) -> Optional[Dict[str, Any]]:
+        """Return the most specific recorded turn for a message whose tools are all available"""
+        candidates = []
+        for turn in self.turns:
+            if turn.get("match", "").lower() not in query.lower():
+                continue
+            recorded_tools = [c["name"] for step in turn["steps"] for c in step.get("tool_calls", [])]
+            if all(any(_tool_name_matches(t, r) for t in tool_names) for r in recorded_tools):
+                candidates.append(turn)
+        return max(candidates, key=lambda turn: len(turn.get("match", "")), default=None)
+
+    def record(self, query: str, step: int, response: Dict[str, Any]) -> None:
+        """Store one model call of a turn and write the file"""
+        with self._lock:
+            turn = next((t for t in self.turns if t["match"] == query), None)
+            if turn is None or step == 0:
+                if turn is not None:
+                    self.turns.remove(turn)
+                turn = {"match": query, "steps": []}
+                self.turns.append(turn)
+            del turn["steps"][step:]
+            turn["steps"].append(response)
+            self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"turns": self.turns}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+@dataclass
+class FakeModel(Model):
+    """Deterministic model that replays recorded turns or calls the best matching tool"""
+
+    id: str = "fake-model"
+    name: str = "FakeModel"
+    provider: str = "Fake"
+
+    # Seconds before the first token of every model call
+    latency_seconds: float = 0.0
+    # Output tokens generated per second, 0 for instant output
+    tokens_per_second: float = 0.0
+    # Prompt tokens processed per second before the first token, 0 for instant
+    prefill_tokens_per_second: float = 0.0
+    # JSON file with recorded turns to replay
+    recording_file: Optional[str] = None
+
+    _recording: Optional[ModelRecording] = field(default=None, init=False, repr=False)
+
+    @property
+    def recording(self) -> ModelRecording:
+        if self._recording is None:
+            self._recording = ModelRecording(self.recording_file)
+        return self._recording
+
+    # ==========================================
+    # Response generation
+    # ==========================================
+
+    def _generate(
+        self,
+        messages: List[Message],
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> ModelResponse:
+        query, step, tool_results = current_turn(messages)
+        functions = [tool.get("function", tool) for tool in tools or []]
+
+        response = ModelResponse(role="assistant")
+        output_tokens = None
+        turn = self.recording.find(query, [f["name"] for f in functions]) if response_format is None else None
+
+        if response_format is not None:
+            response.content = self._structured_content(query or messages[-1].get_content_string())
+        elif turn is not None and step < len(turn["steps"]):
+            recorded = turn["steps"][step]
+            response.content = recorded.get("content")
+            response.tool_calls = [
+                self._replay_tool_call(call, query, functions, f"call_{len(messages)}_{i}")
+                for i, call in enumerate(recorded.get("tool_calls", []))
+            ]
+            output_tokens = recorded.get("output_tokens")
+        elif functions and not tool_results:
+            response.tool_calls = [self._tool_call(query, functions, call_id=f"call_{len(messages)}")]
+        elif tool_results:
+            summary = " ".join(m.get_content_string() for m in tool_results)
+            response.content = f"Here is what I found for: {query}\n\n{summary[:500]}"
+        else:
+            response.content = f"This is a deterministic answer to: {query}"
+
+        prompt = "".join(m.get_content_string() for m in messages)
+        input_tokens = estimate_tokens(prompt + (json.dumps(tools) if tools else ""))
+        output_tokens = output_tokens or estimate_tokens(response.content or json.dumps(response.tool_calls))
+        response.response_usage = Metrics(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+        )
+        return response
+
+    def _replay_tool_call(
+        self, call: Dict[str, Any], query: str, functions: List[Dict[str, Any]], call_id: str
+    ) -> Dict[str, Any]:
+        name = next(f["name"] for f in functions if _tool_name_matches(f["name"], call["name"]))
+        arguments = {
+            key: value.replace("{query}", query) if isinstance(value, str) else value
+            for key, value in call.get("arguments", {}).items()
+        }
+        return {"id": call_id, "type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+    def _tool_call(self, query: str, functions: List[Dict[str, Any]], call_id: str) -> Dict[str, Any]:
+        """Pick the best matching tool and fill its required arguments from the query"""
+        query_words = _words(query)
+
+        def score(function: Dict[str, Any]) -> int:
+            return len(query_words & _words(f"{function['name']} {function.get('description') or ''}"))
+
+        function = max(functions, key=score)
+        parameters = function.get("parameters") or {}
+        arguments = {}
+        for name in parameters.get("required", []):
+            schema = parameters.get("properties", {}).get(name, {})
+            if "default" in schema:
+                arguments[name] = schema["default"]
+            elif schema.get("enum"):
+                arguments[name] = schema["enum"][0]
+            elif schema.get("type") == "integer":
+                arguments[name] = 5
+            elif schema.get("type") == "boolean":
+                arguments[name] = False
+            else:
+                arguments[name] = query
+
+        return {
+            "id": call_id,
+            "type": "function",
+            "function": {"name": function["name"], "arguments": json.dumps(arguments)},
+        }
+
+    def _structured_content(self, text: str) -> str:
+        # Session summaries are the only structured output this repo asks for
+        return json.dumps({"summary": text[:200], "topics": sorted(_words(text))[:3]})
+
+    def _first_token_seconds(self, response: ModelResponse) -> float:
+        if not self.prefill_tokens_per_second or response.response_usage is None:
+            return self.latency_seconds
+        return self.latency_seconds + response.response_usage.input_tokens / self.prefill_tokens_per_second
+
+    def _generation_seconds(self, response: ModelResponse) -> float:
+        if not self.tokens_per_second or response.response_usage is None:
+            return 0.0
+        return response.response_usage.output_tokens / self.tokens_per_second
+
+    def _chunks(self, response: ModelResponse) -> List[ModelResponse]:
+        chunks = [ModelResponse(role="assistant")]
+        if response.tool_calls:
+            chunks.append(ModelResponse(tool_calls=response.tool_calls))
+        chunks.extend(ModelResponse(content=word) for word in re.findall(r"\S+\s*", response.content or ""))
+        chunks.append(ModelResponse(response_usage=response.response_usage))
+        return chunks
+
+    # ==========================================
+    # Model interface
+    # ==========================================
+
+    def invoke(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[Any] = None,
+    ) -> ModelResponse:
+        assistant_message.metrics.start_timer()
+        response = self._generate(messages, response_format, tools)
+        time.sleep(self._first_token_seconds(response))
+        if run_response and run_response.metrics:
+            run_response.metrics.set_time_to_first_token()
+        time.sleep(self._generation_seconds(response))
+        assistant_message.metrics.stop_timer()
+        return response
+
+    async def ainvoke(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[Any] = None,
+    ) -> ModelResponse:
+        assistant_message.metrics.start_timer()
+        response = self._generate(messages, response_format, tools)
+        await asyncio.sleep(self._first_token_seconds(response))
+        if run_response and run_response.metrics:
+            run_response.metrics.set_time_to_first_token()
+        await asyncio.sleep(self._generation_seconds(response))
+        assistant_message.metrics.stop_timer()
+        return response
+
+    def invoke_stream(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[Any] = None,
+    ) -> Iterator[ModelResponse]:
+        assistant_message.metrics.start_timer()
+        response = self._generate(messages, response_format, tools)
+        chunks = self._chunks(response)
+        delay = self._generation_seconds(response) / len(chunks)
+
+        time.sleep(self._first_token_seconds(response))
+        if run_response and run_response.metrics:
+            run_response.metrics.set_time_to_first_token()
+        for chunk in chunks:
+            yield chunk
+            time.sleep(delay)
+        assistant_message.metrics.stop_timer()
+
+    async def ainvoke_stream(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        response_format: Optional[Union[Dict, Type[BaseModel]]] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[Union[str, Dict[str, Any]]] = None,
+        run_response: Optional[Any] = None,
+    ) -> AsyncIterator[ModelResponse]:
+        assistant_message.metrics.start_timer()
+        response = self._generate(messages, response_format, tools)
+        chunks = self._chunks(response)
+        delay = self._generation_seconds(response) / len(chunks)
+
+        await asyncio.sleep(self._first_token_seconds(response))
+        if run_response and run_response.metrics:
+            run_response.metrics.set_time_to_first_token()
+        for chunk in chunks:
+            yield chunk
+            await asyncio.sleep(delay)
+        assistant_message.metrics.stop_timer()
+
+    def _parse_provider_response(self, response: ModelResponse, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: ModelResponse) -> ModelResponse:
+        return response
@@ -0,0 +1,607 @@
+"""
+GitHub Analytics - Precomputed community aggregates over the GitHub mirror
+
+The PM, engineering and sales questions ("top feature requests", "most
+critical bugs", "most active contributors and organizations") made the
+agent page through hundreds of raw issues and re-derive the same
+aggregates in its prompt on every run. CommunityAnalytics computes them
+after each mirror sync, stores them next to the mirror in SQLite, and
+serves each one as a small JSON summary:
+
+- Themes: TF-IDF vectors of issue titles and bodies, clustered with
+  spherical k-means in NumPy; each theme is named by its top terms and
+  counts its open issues, bugs and feature requests
+- Severity: every issue gets a 0-100 score from its labels, wording (crash,
+  data loss, security, regression, ...) and discussion; open bugs are
+  ranked by it
+- Feature requests: open enhancement issues ranked by discussion plus the
+  number of other open issues in the same theme
+- Contributors: issues, PRs and merges per author, and the same rolled up
+  by GitHub author association (maintainers, contributors, community)
+- Labels: issues and PRs per label, open and recent
+
+Refreshes are incremental: only issues updated since the last refresh are
+vectorized, scored and assigned to the nearest theme. The themes are refit
+from scratch when more than refit_ratio of the issues changed, or when
+there is no model yet. "Recent" is relative to the newest mirrored
+activity, so summaries of an older mirror or of fixture data stay useful.
+
+Usage:
+    analytics = CommunityAnalytics("tmp/github_mirror.db")
+    analytics.refresh("Arize-ai/phoenix")
+    analytics.summary("Arize-ai/phoenix", "bugs")
+"""
+
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issue_scores (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    theme INTEGER NOT NULL,
+    severity REAL NOT NULL,
+    is_bug INTEGER NOT NULL,
+    is_request INTEGER NOT NULL,
+    PRIMARY KEY (repo, number)
+);
+CREATE INDEX IF NOT EXISTS idx_issue_scores_theme ON issue_scores (repo, theme);
+CREATE TABLE IF NOT EXISTS analytics_state (
+    repo TEXT PRIMARY KEY,
+    processed_until TEXT,
+    refreshed_at REAL,
+    vocabulary TEXT,
+    idf BLOB,
+    centroids BLOB,
+    fitted_at REAL,
+    fitted_issues INTEGER
+);
+CREATE TABLE IF NOT EXISTS analytics_summaries (
+    repo TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    computed_at REAL NOT NULL,
+    PRIMARY KEY (repo, name)
+);
+"""
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9_+.-]*[a-z0-9+]")
+
+# Common English plus issue-template words that say nothing about the topic
+STOP_WORDS = frozenset(
+    """
+    about above after again all also and any are because been before being below between both but can cannot
+    could did does doing don down during each few for from further get gets got had has have having her here
+    how however into its itself just more most much must not now off once only other our out over own same
+    should some such than that the their them then there these they this those through too under until very
+    was were what when where which while who whom why will with would you your yes use used using want way
+    bug bugs feature features request requests issue issues please thanks thank hello problem support add
+    adding allow steps environment logs log thread expected behavior behaviour actual version describe
+    description reproduce reproduction screenshot screenshots context additional information happen happens
+    """.split()
+)
+
+# Points for labels and wording that signal a severe bug; the strongest label
+# counts, wording adds up to WORDING_CAP
+SEVERITY_LABELS = {
+    "critical": 40, "p0": 40, "security": 35, "regression": 30, "data loss": 35, "p1": 25,
+    "high priority": 25, "priority: high": 25, "bug": 15, "performance": 10,
+}
+SEVERITY_TERMS = {
+    "data loss": 30, "vulnerability": 30, "security": 20, "corrupt": 25, "crash": 20, "regression": 20,
+    "memory leak": 20, "deadlock": 20, "hang": 15, "broken": 12, "fails": 10, "failing": 10, "500": 10,
+    "exception": 8, "error": 8, "wrong": 8, "missing": 6, "slow": 6, "timeout": 8, "drops": 8, "loses": 10,
+}
+WORDING_CAP = 40
+REQUEST_LABELS = ("enhancement", "feature", "request", "proposal")
+REQUEST_PREFIXES = ("feature request", "[feature", "feat:", "feat(", "request:", "proposal:", "add ", "support ", "allow ")
+SEVERITY_LEVELS = ((70, "critical"), (45, "high"), (25, "medium"), (0, "low"))
+
+# GitHub author associations rolled up into three groups
+ASSOCIATION_GROUPS = {
+    "OWNER": "maintainers", "MEMBER": "maintainers", "COLLABORATOR": "maintainers",
+    "CONTRIBUTOR": "contributors",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if len(t) > 2 and t not in STOP_WORDS]
+
+
+def issue_tokens(title: str, body: Optional[str]) -> List[str]:
+    # Titles say what an issue is about more reliably than bodies, so they count twice
+    title_tokens = tokenize(title)
+    return title_tokens + title_tokens + tokenize((body or "")[:2000])
+
+
+def severity_score(title: str, body: Optional[str], labels: Sequence[str], comments: int) -> float:
+    """0-100 from the strongest severity label, severe wording and how much the issue is discussed"""
+    names = [label.lower() for label in labels]
+    label_points = max((points for key, points in SEVERITY_LABELS.items() for name in names if key in name), default=0)
+    text = f"{title} {title} {(body or '')[:2000]}".lower()
+    wording = min(WORDING_CAP, sum(points for term, points in SEVERITY_TERMS.items() if term in text))
+    discussion = min(20.0, 6 * math.log1p(comments))
+    return round(min(100.0, label_points + wording + discussion), 1)
+
+
+def severity_level(score: float) -> str:
+    return next(level for bound, level in SEVERITY_LEVELS if score >= bound)
+
+
+def is_feature_request(title: str, labels: Sequence[str]) -> bool:
+    names = [label.lower() for label in labels]
+    return any(key in name for key in REQUEST_LABELS for name in names) or title.lower().startswith(REQUEST_PREFIXES)
+
+
+def is_bug_report(labels: Sequence[str], severity: float, request: bool) -> bool:
+    names = [label.lower() for label in labels]
+    return any("bug" in name or "regression" in name for name in names) or (not request and severity >= 45)
+
+
+# ==========================================
+# TF-IDF and spherical k-means in NumPy
+# ==========================================
+
+class SparseRows(NamedTuple):
+    """L2-normalized TF-IDF rows in CSR form: row i is indices/data[indptr[i]:indptr[i + 1]]"""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+
+    @property
+    def rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def row_ids(self) -> np.ndarray:
+        return np.repeat(np.arange(self.rows), np.diff(self.indptr))
+
+
+def fit_vocabulary(documents: List[List[str]], size: int) -> Tuple[List[str], np.ndarray]:
+    """The size most frequent terms that appear in at least two documents and at most half of them, with IDF weights"""
+    frequency = Counter(term for tokens in documents for term in set(tokens))
+    count = len(documents)
+    min_df = 2 if count >= 20 else 1
+    max_df = max(min_df, count // 2)
+    terms = [term for term, df in frequency.most_common() if min_df <= df <= max_df][:size]
+    terms.sort()
+    idf = np.array([math.log((1 + count) / (1 + frequency[term])) + 1 for term in terms], dtype=np.float32)
+    return terms, idf
+
+
+def vectorize(documents: List[List[str]], vocabulary: List[str], idf: np.ndarray) -> SparseRows:
+    """Sublinear TF-IDF rows over a fixed vocabulary; documents without known terms are empty rows"""
+    index = {term: i for i, term in enumerate(vocabulary)}
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+    for tokens in documents:
+        counts = Counter(index[t] for t in tokens if t in index)
+        columns = sorted(counts)
+        weights = np.array([(1 + math.log(counts[c])) * idf[c] for c in columns], dtype=np.float32)
+        norm = float(np.linalg.norm(weights)) if columns else 0.0
+        indices.extend(columns)
+        data.extend((weights / norm).tolist() if norm else [])
+        indptr.append(len(indices))
+    return SparseRows(np.array(indptr), np.array(indices, dtype=np.int64), np.array(data, dtype=np.float32))
+
+
+def similarities(matrix: SparseRows, centroids: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every row to every centroid, shape (rows, centroids)"""
+    row_ids = matrix.row_ids()
+    products = centroids[:, matrix.indices] * matrix.data
+    return np.stack([np.bincount(row_ids, weights=p, minlength=matrix.rows) for p in products], axis=1)
+
+
+def assign(matrix: SparseRows, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid per row, -1 for empty rows"""
+    if matrix.rows == 0:
+        return np.zeros(0, dtype=np.int64)
+    labels = similarities(matrix, centroids).argmax(axis=1)
+    labels[np.diff(matrix.indptr) == 0] = -1
+    return labels
+
+
+def _normalize(centroids: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+    return centroids / np.where(norms == 0, 1, norms)
+
+
+def spherical_kmeans(matrix: SparseRows, vocabulary_size: int, k: int, iterations: int = 30, seed: int = 7) -> np.ndarray:
+    """Centroids of k clusters of unit rows by cosine similarity, seeded with k-means++"""
+    rng = np.random.default_rng(seed)
+    nonempty = np.flatnonzero(np.diff(matrix.indptr))
+    k = max(1, min(k, len(nonempty)))
+
+    def dense(row: int) -> np.ndarray:
+        vector = np.zeros(vocabulary_size, dtype=np.float32)
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        vector[matrix.indices[start:end]] = matrix.data[start:end]
+        return vector
+
+    centroids = dense(rng.choice(nonempty))[None, :]
+    while len(centroids) < k:
+        distance = 1 - similarities(matrix, centroids).max(axis=1)[nonempty]
+        weights = np.clip(distance, 0, None) ** 2
+        if weights.sum() == 0:
+            break
+        centroids = np.vstack([centroids, dense(rng.choice(nonempty, p=weights / weights.sum()))])
+
+    row_ids = matrix.row_ids()
+    labels = None
+    for _ in range(iterations):
+        new_labels = assign(matrix, centroids)
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        keep = labels[row_ids] >= 0
+        flat = labels[row_ids][keep] * vocabulary_size + matrix.indices[keep]
+        sums = np.bincount(flat, weights=matrix.data[keep], minlength=len(centroids) * vocabulary_size)
+        sums = sums.reshape(len(centroids), vocabulary_size).astype(np.float32)
+        # A cluster that lost all its rows keeps its old centroid
+        empty = np.bincount(labels[labels >= 0], minlength=len(centroids)) == 0
+        sums[empty] = centroids[empty]
+        centroids = _normalize(sums)
+    return centroids
+
+
+# ==========================================
+# Analytics
+# ==========================================
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _days_before(timestamp: str, days: float) -> str:
+    return _iso(datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ") - timedelta(days=days))
+
+
+class CommunityAnalytics:
+    """Themes, severity, feature requests and contributor rollups, precomputed per mirror sync"""
+
+    def __init__(
+        self,
+        db_file: str = "tmp/github_mirror.db",
+        max_themes: int = 12,
+        vocabulary_size: int = 2000,
+        refit_ratio: float = 0.2,
+        recent_days: float = 90.0,
+    ):
+        self.db_file = db_file
+        self.max_themes = max_themes
+        self.vocabulary_size = vocabulary_size
+        self.refit_ratio = refit_ratio
+        self.recent_days = recent_days
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        # Same file as the mirror: its items table is the input, WAL lets readers run during a refresh
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+        self.refreshes = 0
+        self.refits = 0
+        self.last_refresh: Optional[Dict[str, Any]] = None
+        self.reads = 0
+
+    def _rows(self, sql: str, params: Tuple[Any, ...] = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _labels(self, repo: str) -> Dict[int, List[str]]:
+        labels: Dict[int, List[str]] = {}
+        for row in self._rows("SELECT number, label FROM item_labels WHERE repo = ?", (repo,)):
+            labels.setdefault(row["number"], []).append(row["label"])
+        return labels
+
+    # ==========================================
+    # Refresh
+    # ==========================================
+
+    def refresh(self, repo: str, full: bool = False) -> Dict[str, Any]:
+        """Score and cluster issues changed since the last refresh, then recompute every summary"""
+        with self._refresh_lock:
+            start = time.perf_counter()
+            state = self._rows("SELECT * FROM analytics_state WHERE repo = ?", (repo,))
+            state = dict(state[0]) if state else {}
+            total = self._rows("SELECT COUNT(*) AS n FROM items WHERE repo = ? AND kind = 'issue'", (repo,))[0]["n"]
+            # >= : items that share the watermark's timestamp may have arrived after the last refresh
+            since = None if full or not state.get("centroids") else state["processed_until"]
+            changed = self._rows(
+                "SELECT number, title, body, comments, updated_at FROM items "
+                "WHERE repo = ? AND kind = 'issue' AND updated_at >= ?",
+                (repo, since or ""),
+            )
+            refit = since is None or len(changed) > self.refit_ratio * max(state.get("fitted_issues") or 0, 1)
+            if refit and since is not None:
+                changed = self._rows(
+                    "SELECT number, title, body, comments, updated_at FROM items WHERE repo = ? AND kind = 'issue'",
+                    (repo,),
+                )
+            if changed:
+                self._score(repo, changed, state, refit)
+            processed_until = max((row["updated_at"] for row in changed), default=state.get("processed_until"))
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO analytics_state (repo, processed_until, refreshed_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (repo) DO UPDATE SET processed_until = excluded.processed_until, "
+                    "refreshed_at = excluded.refreshed_at",
+                    (repo, processed_until, time.time()),
+                )
+            if changed or not self.summary(repo, "overview"):
+                self._summarize(repo)
+
+            self.refreshes += 1
+            self.refits += int(refit and bool(changed))
+            self.last_refresh = {
+                "repo": repo,
+                "issues": total,
+                "changed": len(changed),
+                "mode": "refit" if refit else "incremental",
+                "seconds": round(time.perf_counter() - start, 3),
+            }
+            return self.last_refresh
+
+    def _score(self, repo: str, rows: List[sqlite3.Row], state: Dict[str, Any], refit: bool) -> None:
+        labels = self._labels(repo)
+        documents = [issue_tokens(row["title"], row["body"]) for row in rows]
+        if refit:
+            vocabulary, idf = fit_vocabulary(documents, self.vocabulary_size)
+            matrix = vectorize(documents, vocabulary, idf)
+            k = round(math.sqrt(len(rows) / 2))
+            centroids = spherical_kmeans(matrix, len(vocabulary), max(1, min(self.max_themes, k)))
+        else:
+            vocabulary = json.loads(state["vocabulary"])
+            idf = np.frombuffer(state["idf"], dtype=np.float32)
+            centroids = np.frombuffer(state["centroids"], dtype=np.float32).reshape(-1, len(vocabulary))
+            matrix = vectorize(documents, vocabulary, idf)
+        themes = assign(matrix, centroids) if vocabulary else np.full(len(rows), -1)
+
+        scores = []
+        for row, theme in zip(rows, themes.tolist()):
+            names = labels.get(row["number"], [])
+            severity = severity_score(row["title"], row["body"], names, row["comments"])
+            request = is_feature_request(row["title"], names)
+            scores.append((repo, row["number"], theme, severity, int(is_bug_report(names, severity, request)), int(request)))
+        with self._lock, self._conn:
+            if refit:
+                self._conn.execute("DELETE FROM issue_scores WHERE repo = ?", (repo,))
+                self._conn.execute(
+                    "INSERT INTO analytics_state (repo, vocabulary, idf, centroids, fitted_at, fitted_issues) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (repo) DO UPDATE SET vocabulary = excluded.vocabulary, "
+                    "idf = excluded.idf, centroids = excluded.centroids, fitted_at = excluded.fitted_at, "
+                    "fitted_issues = excluded.fitted_issues",
+                    (
+                        repo, json.dumps(vocabulary), idf.astype(np.float32).tobytes(),
+                        centroids.astype(np.float32).tobytes(), time.time(), len(rows),
+                    ),
+                )
+            self._conn.executemany("INSERT OR REPLACE INTO issue_scores VALUES (?, ?, ?, ?, ?, ?)", scores)
+
+    # ==========================================
+    # Summaries
+    # ==========================================
+
+    def _summarize(self, repo: str) -> None:
+        items = [
+            dict(row) for row in self._rows(
+                "SELECT i.number, i.kind, i.title, i.state, i.author, i.author_association, i.comments, "
+                "i.created_at, i.updated_at, i.merged_at, i.url, s.theme, s.severity, s.is_bug, s.is_request "
+                "FROM items i LEFT JOIN issue_scores s ON s.repo = i.repo AND s.number = i.number WHERE i.repo = ?",
+                (repo,),
+            )
+        ]
+        if not items:
+            return
+        labels = self._labels(repo)
+        for item in items:
+            item["labels"] = sorted(labels.get(item["number"], []))
+        as_of = max(item["updated_at"] for item in items)
+        recent_since = _days_before(as_of, self.recent_days)
+        state = self._rows("SELECT vocabulary, centroids FROM analytics_state WHERE repo = ?", (repo,))
+        theme_terms = self._theme_terms(dict(state[0])) if state and state[0]["centroids"] else {}
+
+        issues = [item for item in items if item["kind"] == "issue"]
+        open_issues = [item for item in issues if item["state"] == "open"]
+        themes = self._themes(open_issues, issues, theme_terms)
+        summaries = {
+            "themes": {"as_of": as_of, "themes": themes},
+            "feature_requests": self._feature_requests(open_issues, theme_terms),
+            "bugs": self._bugs(open_issues, theme_terms, as_of),
+            "contributors": self._contributors(repo, items, recent_since),
+            "labels": self._label_frequency(items, recent_since),
+        }
+        summaries["feature_requests"]["as_of"] = summaries["bugs"]["as_of"] = as_of
+        summaries["overview"] = {
+            "as_of": as_of,
+            "recent_days": self.recent_days,
+            "issues": len(issues),
+            "open_issues": len(open_issues),
+            "open_prs": sum(1 for item in items if item["kind"] == "pr" and item["state"] == "open"),
+            "recent": {
+                "issues_opened": sum(1 for item in issues if item["created_at"] >= recent_since),
+                "prs_merged": sum(1 for item in items if (item["merged_at"] or "") >= recent_since),
+                "active_authors": len({item["author"] for item in items if item["created_at"] >= recent_since}),
+            },
+            "open_bugs_by_severity": summaries["bugs"]["open_by_severity"],
+            "top_themes": [{"terms": t["terms"], "open": t["open"]} for t in themes[:5]],
+            "top_feature_requests": [
+                {"number": r["number"], "title": r["title"], "demand": r["demand"]}
+                for r in summaries["feature_requests"]["requests"][:5]
+            ],
+            "top_bugs": [
+                {"number": b["number"], "title": b["title"], "severity": b["severity"]} for b in summaries["bugs"]["bugs"][:5]
+            ],
+            "top_labels": summaries["labels"]["labels"][:5],
+        }
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO analytics_summaries VALUES (?, ?, ?, ?)",
+                [(repo, name, json.dumps(data), now) for name, data in summaries.items()],
+            )
+
+    def _theme_terms(self, state: Dict[str, Any], count: int = 4) -> Dict[int, List[str]]:
+        vocabulary = json.loads(state["vocabulary"])
+        centroids = np.frombuffer(state["centroids"], dtype=np.float32).reshape(-1, len(vocabulary))
+        top = np.argsort(-centroids, axis=1)[:, :count]
+        return {theme: [vocabulary[i] for i in row if centroids[theme, i] > 0] for theme, row in enumerate(top.tolist())}
+
+    def _themes(
+        self, open_issues: List[Dict[str, Any]], issues: List[Dict[str, Any]], theme_terms: Dict[int, List[str]]
+    ) -> List[Dict[str, Any]]:
+        themes: Dict[int, Dict[str, Any]] = {}
+        for item in issues:
+            if item["theme"] is None or item["theme"] < 0:
+                continue
+            theme = themes.setdefault(item["theme"], {
+                "theme": item["theme"], "terms": theme_terms.get(item["theme"], []), "issues": 0, "open": 0,
+                "open_bugs": 0, "open_requests": 0, "comments": 0, "examples": [],
+            })
+            theme["issues"] += 1
+            theme["comments"] += item["comments"]
+        for item in sorted(open_issues, key=lambda i: -i["comments"]):
+            theme = themes.get(item["theme"] if item["theme"] is not None else -1)
+            if theme is None:
+                continue
+            theme["open"] += 1
+            theme["open_bugs"] += item["is_bug"] or 0
+            theme["open_requests"] += item["is_request"] or 0
+            if len(theme["examples"]) < 3:
+                theme["examples"].append({"number": item["number"], "title": item["title"]})
+        return sorted(themes.values(), key=lambda t: (-t["open"], -t["issues"]))
+
+    def _feature_requests(self, open_issues: List[Dict[str, Any]], theme_terms: Dict[int, List[str]]) -> Dict[str, Any]:
+        theme_open = Counter(item["theme"] for item in open_issues if item["theme"] is not None and item["theme"] >= 0)
+        requests = []
+        for item in open_issues:
+            if not item["is_request"]:
+                continue
+            related = theme_open[item["theme"]] - 1 if item["theme"] is not None and item["theme"] >= 0 else 0
+            requests.append({
+                "number": item["number"],
+                "title": item["title"],
+                "labels": item["labels"],
+                "comments": item["comments"],
+                "related_open_issues": related,
+                "demand": item["comments"] + 2 * related,
+                "theme": theme_terms.get(item["theme"], []),
+                "url": item["url"],
+            })
+        requests.sort(key=lambda r: (-r["demand"], -r["number"]))
+        return {"open_requests": len(requests), "requests": requests[:50]}
+
+    def _bugs(self, open_issues: List[Dict[str, Any]], theme_terms: Dict[int, List[str]], as_of: str) -> Dict[str, Any]:
+        now = datetime.strptime(as_of, "%Y-%m-%dT%H:%M:%SZ")
+        bugs = []
+        for item in open_issues:
+            if not item["is_bug"]:
+                continue
+            age = now - datetime.strptime(item["created_at"], "%Y-%m-%dT%H:%M:%SZ")
+            bugs.append({
+                "number": item["number"],
+                "title": item["title"],
+                "severity": item["severity"],
+                "level": severity_level(item["severity"]),
+                "labels": item["labels"],
+                "comments": item["comments"],
+                "age_days": age.days,
+                "theme": theme_terms.get(item["theme"], []),
+                "url": item["url"],
+            })
+        bugs.sort(key=lambda b: (-b["severity"], -b["comments"]))
+        return {"open_by_severity": dict(Counter(b["level"] for b in bugs)), "bugs": bugs[:50]}
+
+    def _contributors(self, repo: str, items: List[Dict[str, Any]], recent_since: str) -> Dict[str, Any]:
+        commits = {row["login"]: row["contributions"] for row in self._rows(
+            "SELECT login, contributions FROM contributors WHERE repo = ?", (repo,)
+        )}
+        people: Dict[str, Dict[str, Any]] = {}
+        for item in sorted(items, key=lambda i: i["created_at"]):
+            if not item["author"]:
+                continue
+            person = people.setdefault(item["author"], {
+                "login": item["author"], "group": "community", "issues": 0, "prs": 0, "merged_prs": 0,
+                "recent_items": 0, "commits": commits.get(item["author"], 0),
+                "first_seen": item["created_at"], "last_seen": item["created_at"],
+            })
+            person["issues" if item["kind"] == "issue" else "prs"] += 1
+            person["merged_prs"] += 1 if item["merged_at"] else 0
+            person["recent_items"] += 1 if item["created_at"] >= recent_since else 0
+            person["last_seen"] = item["created_at"]
+            # The latest association wins: people become contributors or members over time
+            if item["author_association"]:
+                person["group"] = ASSOCIATION_GROUPS.get(item["author_association"], "community")
+
+        groups: Dict[str, Dict[str, Any]] = {}
+        for person in people.values():
+            group = groups.setdefault(person["group"], {
+                "group": person["group"], "people": 0, "new_people": 0, "active_people": 0,
+                "issues": 0, "prs": 0, "merged_prs": 0,
+            })
+            group["people"] += 1
+            group["new_people"] += 1 if person["first_seen"] >= recent_since else 0
+            group["active_people"] += 1 if person["recent_items"] else 0
+            for key in ("issues", "prs", "merged_prs"):
+                group[key] += person[key]
+        ranked = sorted(people.values(), key=lambda p: (-p["recent_items"], -(p["issues"] + p["prs"]), -p["commits"]))
+        return {
+            "recent_since": recent_since,
+            "people": len(people),
+            "by_group": sorted(groups.values(), key=lambda g: -(g["issues"] + g["prs"])),
+            "contributors": ranked[:50],
+        }
+
+    def _label_frequency(self, items: List[Dict[str, Any]], recent_since: str) -> Dict[str, Any]:
+        counts: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            for label in item["labels"]:
+                entry = counts.setdefault(label, {"label": label, "issues": 0, "prs": 0, "open": 0, "recent": 0})
+                entry["issues" if item["kind"] == "issue" else "prs"] += 1
+                entry["open"] += 1 if item["state"] == "open" else 0
+                entry["recent"] += 1 if item["created_at"] >= recent_since else 0
+        return {"labels": sorted(counts.values(), key=lambda c: (-(c["issues"] + c["prs"]), c["label"]))}
+
+    # ==========================================
+    # Reads
+    # ==========================================
+
+    def summary(self, repo: str, name: str) -> Optional[Dict[str, Any]]:
+        """A stored summary with the time it was computed, or None before the first refresh"""
+        rows = self._rows("SELECT data, computed_at FROM analytics_summaries WHERE repo = ? AND name = ?", (repo, name))
+        if not rows:
+            return None
+        self.reads += 1
+        return {**json.loads(rows[0]["data"]), "computed_at": _iso(datetime.fromtimestamp(rows[0]["computed_at"], timezone.utc))}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return refresh counts, the last refresh and the fitted model per repository"""
+        repos = {
+            row["repo"]: {
+                "processed_until": row["processed_until"],
+                "refreshed_at": row["refreshed_at"],
+                "fitted_issues": row["fitted_issues"],
+                "vocabulary": len(json.loads(row["vocabulary"])) if row["vocabulary"] else 0,
+            }
+            for row in self._rows("SELECT * FROM analytics_state")
+        }
+        return {
+            "refreshes": self.refreshes,
+            "refits": self.refits,
+            "last_refresh": self.last_refresh,
+            "summary_reads": self.reads,
+            "repos": repos,
+        }
@@ -0,0 +1,498 @@
+"""
+GitHub Mirror - Issues, PRs and contributor activity in a local SQLite mirror
+
+Every "last 10 community issues" or "most active contributors" question
+went to the GitHub MCP server, which pages through the rate-limited GitHub
+API on every call. GitHubMirror keeps a copy of the repositories the teams
+ask about and answers those questions from local indexes:
+
+- Incremental sync: each sync asks GitHub only for issues and PRs updated
+  since the newest one already mirrored (the issues API returns both), in
+  pages of 100, oldest first, so an interrupted sync resumes where it
+  stopped. Contributor commit counts are refreshed on every sync
+- Rate limits: a sync stops at max_pages, or as soon as GitHub reports the
+  rate limit is used up, and picks up from there next time
+- One syncer at a time: every process serving the mirror may call
+  sync_if_due(), but only the one that claims the repository's sync lease
+  in SQLite actually syncs
+- Queries (list, search, contributor and label aggregates) use indexes on
+  state, kind, dates, author and labels, and take milliseconds
+
+FixtureSource serves the same data from a JSON file in GitHub's API format,
+so the mirror can be synced and queried without network access or a token.
+
+Usage:
+    mirror = GitHubMirror("tmp/github_mirror.db")
+    mirror.sync("Arize-ai/phoenix", GitHubSource(token))
+    mirror.list_items("Arize-ai/phoenix", kind="issue", state="open", limit=10)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT,
+    state TEXT NOT NULL,
+    author TEXT,
+    comments INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    closed_at TEXT,
+    merged_at TEXT,
+    url TEXT,
+    author_association TEXT,
+    PRIMARY KEY (repo, number)
+);
+CREATE INDEX IF NOT EXISTS idx_items_kind_state_created ON items (repo, kind, state, created_at);
+CREATE INDEX IF NOT EXISTS idx_items_updated ON items (repo, updated_at);
+CREATE INDEX IF NOT EXISTS idx_items_author ON items (repo, author, created_at);
+CREATE TABLE IF NOT EXISTS item_labels (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (repo, number, label)
+);
+CREATE INDEX IF NOT EXISTS idx_item_labels_label ON item_labels (repo, label, number);
+CREATE TABLE IF NOT EXISTS contributors (
+    repo TEXT NOT NULL,
+    login TEXT NOT NULL,
+    contributions INTEGER NOT NULL,
+    PRIMARY KEY (repo, login)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo TEXT PRIMARY KEY,
+    synced_until TEXT,
+    last_sync_at REAL,
+    lease_until REAL,
+    items_synced INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+"""
+
+SORT_COLUMNS = {"created": "created_at", "updated": "updated_at", "comments": "comments"}
+
+
+def iso_days_ago(days: float) -> str:
+    """An ISO 8601 UTC timestamp, in GitHub's format, for days ago"""
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class RateLimited(Exception):
+    """GitHub's API rate limit is used up"""
+
+    def __init__(self, reset_at: Optional[float]):
+        self.reset_at = reset_at
+        super().__init__("GitHub API rate limit exceeded")
+
+
+# ==========================================
+# Sources
+# ==========================================
+
+class GitHubSource:
+    """Issues, PRs and contributors from the GitHub REST API"""
+
+    def __init__(self, token: Optional[str] = None, base_url: str = "https://api.github.com", timeout: float = 30.0):
+        headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        self.client = httpx.Client(base_url=base_url, headers=headers, timeout=timeout)
+        self.requests = 0
+
+    def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+        self.requests += 1
+        response = self.client.get(url, params=params)
+        if response.status_code in (403, 429) and response.headers.get("x-ratelimit-remaining") == "0":
+            reset = response.headers.get("x-ratelimit-reset")
+            raise RateLimited(float(reset) if reset else None)
+        response.raise_for_status()
+        return response
+
+    def issues(self, repo: str, since: Optional[str]) -> Iterator[List[Dict[str, Any]]]:
+        """Pages of issues and PRs updated since a timestamp, least recently updated first"""
+        params: Optional[Dict[str, Any]] = {"state": "all", "sort": "updated", "direction": "asc", "per_page": 100}
+        if since:
+            params["since"] = since
+        url: Optional[str] = f"/repos/{repo}/issues"
+        while url:
+            response = self._get(url, params)
+            yield response.json()
+            # The next link already carries every query parameter
+            url, params = response.links.get("next", {}).get("url"), None
+
+    def contributors(self, repo: str) -> List[Dict[str, Any]]:
+        """Commit counts per contributor"""
+        contributors: List[Dict[str, Any]] = []
+        url: Optional[str] = f"/repos/{repo}/contributors"
+        params: Optional[Dict[str, Any]] = {"per_page": 100}
+        while url:
+            response = self._get(url, params)
+            contributors.extend(response.json() if response.status_code == 200 else [])
+            url, params = response.links.get("next", {}).get("url"), None
+        return contributors
+
+
+class FixtureSource:
+    """Issues, PRs and contributors from a JSON file in GitHub's API format, for offline runs"""
+
+    def __init__(self, path: str, page_size: int = 100):
+        self.path = path
+        self.page_size = page_size
+        self.data = json.loads(Path(path).read_text())
+        self.requests = 0
+
+    def issues(self, repo: str, since: Optional[str]) -> Iterator[List[Dict[str, Any]]]:
+        items = [i for i in self.data.get(repo, {}).get("issues", []) if not since or i["updated_at"] >= since]
+        items.sort(key=lambda i: i["updated_at"])
+        for start in range(0, len(items), self.page_size):
+            self.requests += 1
+            yield items[start:start + self.page_size]
+
+    def contributors(self, repo: str) -> List[Dict[str, Any]]:
+        self.requests += 1
+        return self.data.get(repo, {}).get("contributors", [])
+
+
+# ==========================================
+# Mirror
+# ==========================================
+
+def _item_row(repo: str, issue: Dict[str, Any]) -> Tuple[Any, ...]:
+    pull_request = issue.get("pull_request")
+    return (
+        repo,
+        issue["number"],
+        "pr" if pull_request else "issue",
+        issue["title"],
+        issue.get("body"),
+        issue["state"],
+        (issue.get("user") or {}).get("login"),
+        issue.get("comments", 0),
+        issue["created_at"],
+        issue["updated_at"],
+        issue.get("closed_at"),
+        (pull_request or {}).get("merged_at"),
+        issue.get("html_url"),
+        issue.get("author_association"),
+    )
+
+
+class GitHubMirror:
+    """SQLite mirror of GitHub issues, PRs and contributors with incremental sync"""
+
+    def __init__(self, db_file: str = "tmp/github_mirror.db", max_pages: int = 50, initial_days: float = 365.0):
+        self.db_file = db_file
+        self.max_pages = max_pages
+        self.initial_days = initial_days
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(items)")}
+        if "author_association" not in columns:
+            # Mirrors created before author associations were stored
+            self._conn.execute("ALTER TABLE items ADD COLUMN author_association TEXT")
+        self._lock = threading.Lock()
+
+        self.queries = 0
+        self.query_ms = 0.0
+
+    # ==========================================
+    # Sync
+    # ==========================================
+
+    def claim_sync(self, repo: str, interval_seconds: float, lease_seconds: float = 600.0) -> bool:
+        """Claim the sync of a repository if it is due and no other process is syncing it"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO sync_state (repo) VALUES (?)", (repo,))
+            claimed = self._conn.execute(
+                "UPDATE sync_state SET lease_until = ? WHERE repo = ? "
+                "AND (lease_until IS NULL OR lease_until < ?) AND (last_sync_at IS NULL OR last_sync_at < ?)",
+                (now + lease_seconds, repo, now, now - interval_seconds),
+            ).rowcount
+        return claimed == 1
+
+    def sync_if_due(self, repo: str, source: Any, interval_seconds: float) -> Optional[Dict[str, Any]]:
+        """Sync a repository unless it was synced within interval_seconds or another process is syncing it"""
+        if not self.claim_sync(repo, interval_seconds):
+            return None
+        return self.sync(repo, source)
+
+    def sync(self, repo: str, source: Any) -> Dict[str, Any]:
+        """Fetch issues and PRs updated since the last sync, and refresh contributor counts"""
+        start = time.perf_counter()
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR IGNORE INTO sync_state (repo) VALUES (?)", (repo,))
+        state = self.sync_status(repo)
+        since = state.get("synced_until") or (iso_days_ago(self.initial_days) if self.initial_days else None)
+        synced_until = since
+        items = pages = 0
+        error = None
+        try:
+            for page in source.issues(repo, since):
+                pages += 1
+                if page:
+                    self._store_items(repo, page)
+                    items += len(page)
+                    synced_until = max(issue["updated_at"] for issue in page)
+                    self._save_progress(repo, synced_until, len(page))
+                if pages >= self.max_pages:
+                    error = f"stopped after {pages} pages, continuing next sync"
+                    break
+            self._store_contributors(repo, source.contributors(repo))
+        except RateLimited as e:
+            reset = time.strftime("%H:%M:%S", time.localtime(e.reset_at)) if e.reset_at else "later"
+            error = f"rate limited, resets at {reset}"
+        except (httpx.HTTPError, OSError, ValueError, KeyError) as e:
+            error = f"{type(e).__name__}: {e}"
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE sync_state SET last_sync_at = ?, lease_until = NULL, last_error = ? WHERE repo = ?",
+                (time.time(), error, repo),
+            )
+        return {
+            "repo": repo,
+            "since": since,
+            "synced_until": synced_until,
+            "pages": pages,
+            "items": items,
+            "error": error,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+
+    def _store_items(self, repo: str, page: List[Dict[str, Any]]) -> None:
+        rows = [_item_row(repo, issue) for issue in page]
+        labels = [
+            (repo, issue["number"], label["name"] if isinstance(label, dict) else label)
+            for issue in page
+            for label in issue.get("labels", [])
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            # Labels can be removed, so an updated item's labels are replaced
+            self._conn.executemany(
+                "DELETE FROM item_labels WHERE repo = ? AND number = ?", [(repo, issue["number"]) for issue in page]
+            )
+            self._conn.executemany("INSERT OR IGNORE INTO item_labels VALUES (?, ?, ?)", labels)
+
+    def _save_progress(self, repo: str, synced_until: str, items: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE sync_state SET synced_until = ?, items_synced = items_synced + ? WHERE repo = ?",
+                (synced_until, items, repo),
+            )
+
+    def _store_contributors(self, repo: str, contributors: List[Dict[str, Any]]) -> None:
+        if not contributors:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM contributors WHERE repo = ?", (repo,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO contributors VALUES (?, ?, ?)",
+                [(repo, c["login"], c.get("contributions", 0)) for c in contributors if c.get("login")],
+            )
+
+    def sync_status(self, repo: str) -> Dict[str, Any]:
+        row = self._query("SELECT * FROM sync_state WHERE repo = ?", (repo,), timed=False)
+        return dict(row[0]) if row else {"repo": repo}
+
+    # ==========================================
+    # Queries
+    # ==========================================
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = (), timed: bool = True) -> List[sqlite3.Row]:
+        start = time.perf_counter()
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        if timed:
+            self.queries += 1
+            self.query_ms += (time.perf_counter() - start) * 1000
+        return rows
+
+    def _labels(self, repo: str, numbers: List[int]) -> Dict[int, List[str]]:
+        if not numbers:
+            return {}
+        placeholders = ",".join("?" * len(numbers))
+        rows = self._query(
+            # No ORDER BY: sorting by label would make SQLite walk the label index
+            f"SELECT number, label FROM item_labels WHERE repo = ? AND number IN ({placeholders})",
+            (repo, *numbers),
+        )
+        labels: Dict[int, List[str]] = {}
+        for row in rows:
+            labels.setdefault(row["number"], []).append(row["label"])
+        return {number: sorted(names) for number, names in labels.items()}
+
+    def _items(self, repo: str, rows: List[sqlite3.Row], with_body: bool = False) -> List[Dict[str, Any]]:
+        labels = self._labels(repo, [row["number"] for row in rows])
+        items = []
+        for row in rows:
+            item = {
+                "number": row["number"],
+                "kind": row["kind"],
+                "title": row["title"],
+                "state": row["state"],
+                "author": row["author"],
+                "labels": labels.get(row["number"], []),
+                "comments": row["comments"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "url": row["url"],
+            }
+            if row["closed_at"]:
+                item["closed_at"] = row["closed_at"]
+            if row["merged_at"]:
+                item["merged_at"] = row["merged_at"]
+            if with_body:
+                item["body"] = row["body"]
+            items.append(item)
+        return items
+
+    def list_items(
+        self,
+        repo: str,
+        kind: str = "issue",
+        state: str = "open",
+        label: Optional[str] = None,
+        author: Optional[str] = None,
+        since: Optional[str] = None,
+        sort: str = "created",
+        order: str = "desc",
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Issues or PRs filtered by state, label, author and creation date"""
+        where = ["i.repo = ?"]
+        params: List[Any] = [repo]
+        if kind != "all":
+            where.append("i.kind = ?")
+            params.append(kind)
+        if state != "all":
+            where.append("i.state = ?")
+            params.append(state)
+        if author:
+            where.append("i.author = ?")
+            params.append(author)
+        if since:
+            where.append("i.created_at >= ?")
+            params.append(since)
+        join = ""
+        if label:
+            join = "JOIN item_labels l ON l.repo = i.repo AND l.number = i.number AND l.label = ?"
+            params.insert(0, label)
+        column = SORT_COLUMNS.get(sort, "created_at")
+        direction = "ASC" if order.lower() == "asc" else "DESC"
+        rows = self._query(
+            f"SELECT i.* FROM items i {join} WHERE {' AND '.join(where)} "
+            f"ORDER BY i.{column} {direction} LIMIT ?",
+            (*params, max(1, min(limit, 100))),
+        )
+        return self._items(repo, rows)
+
+    def get_item(self, repo: str, number: int) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM items WHERE repo = ? AND number = ?", (repo, number))
+        items = self._items(repo, rows, with_body=True)
+        return items[0] if items else None
+
+    def search(self, repo: str, query: str, kind: str = "all", state: str = "all", limit: int = 10) -> List[Dict[str, Any]]:
+        """Issues and PRs whose title or body contains every word of the query, most recently updated first"""
+        where = ["repo = ?"]
+        params: List[Any] = [repo]
+        for word in query.split():
+            where.append("(title LIKE ? OR body LIKE ?)")
+            params += [f"%{word}%", f"%{word}%"]
+        if kind != "all":
+            where.append("kind = ?")
+            params.append(kind)
+        if state != "all":
+            where.append("state = ?")
+            params.append(state)
+        rows = self._query(
+            f"SELECT * FROM items WHERE {' AND '.join(where)} ORDER BY updated_at DESC LIMIT ?",
+            (*params, max(1, min(limit, 100))),
+        )
+        return self._items(repo, rows)
+
+    def top_contributors(self, repo: str, since: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most active people by issues and PRs opened since a date, with their commit counts"""
+        rows = self._query(
+            "SELECT i.author AS login, "
+            "SUM(i.kind = 'issue') AS issues, SUM(i.kind = 'pr') AS prs, "
+            "SUM(i.merged_at IS NOT NULL) AS merged_prs, SUM(i.comments) AS comments_received, "
+            "COALESCE(c.contributions, 0) AS commits "
+            "FROM items i LEFT JOIN contributors c ON c.repo = i.repo AND c.login = i.author "
+            "WHERE i.repo = ? AND i.author IS NOT NULL AND i.created_at >= ? "
+            "GROUP BY i.author ORDER BY issues + prs DESC, commits DESC LIMIT ?",
+            (repo, since or "", max(1, min(limit, 100))),
+        )
+        return [dict(row) for row in rows]
+
+    def label_counts(
+        self, repo: str, kind: str = "issue", state: str = "all", since: Optional[str] = None, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Issue or PR counts per label, most used first"""
+        where = ["i.repo = ?", "i.created_at >= ?"]
+        params: List[Any] = [repo, since or ""]
+        if kind != "all":
+            where.append("i.kind = ?")
+            params.append(kind)
+        if state != "all":
+            where.append("i.state = ?")
+            params.append(state)
+        rows = self._query(
+            "SELECT l.label, COUNT(*) AS count, SUM(i.state = 'open') AS open "
+            "FROM item_labels l JOIN items i ON i.repo = l.repo AND i.number = l.number "
+            f"WHERE {' AND '.join(where)} GROUP BY l.label ORDER BY count DESC LIMIT ?",
+            (*params, max(1, min(limit, 100))),
+        )
+        return [dict(row) for row in rows]
+
+    def activity(self, repo: str, since: Optional[str] = None) -> Dict[str, Any]:
+        """Issues and PRs opened, closed and merged since a date"""
+        since = since or ""
+        row = self._query(
+            "SELECT "
+            "SUM(kind = 'issue' AND created_at >= ?) AS issues_opened, "
+            "SUM(kind = 'issue' AND closed_at >= ?) AS issues_closed, "
+            "SUM(kind = 'pr' AND created_at >= ?) AS prs_opened, "
+            "SUM(kind = 'pr' AND merged_at >= ?) AS prs_merged, "
+            "SUM(kind = 'issue' AND state = 'open') AS open_issues, "
+            "SUM(kind = 'pr' AND state = 'open') AS open_prs, "
+            "COUNT(DISTINCT CASE WHEN created_at >= ? THEN author END) AS active_authors "
+            "FROM items WHERE repo = ?",
+            (since, since, since, since, since, repo),
+        )[0]
+        return {"since": since or None, **{key: row[key] or 0 for key in row.keys()}}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return mirrored row counts, sync state per repository and query timings"""
+        counts = self._query("SELECT repo, kind, COUNT(*) AS n FROM items GROUP BY repo, kind", timed=False)
+        repos: Dict[str, Dict[str, Any]] = {}
+        for row in counts:
+            repos.setdefault(row["repo"], {})[f"{row['kind']}s"] = row["n"]
+        for row in self._query("SELECT * FROM sync_state", timed=False):
+            repos.setdefault(row["repo"], {}).update(
+                {k: row[k] for k in ("synced_until", "last_sync_at", "items_synced", "last_error")}
+            )
+        return {
+            "db_file": self.db_file,
+            "repos": repos,
+            "queries": self.queries,
+            "avg_query_ms": round(self.query_ms / self.queries, 3) if self.queries else None,
+        }
@@ -0,0 +1,228 @@
+"""
+History Context - Token-budgeted, incremental conversation history
+
+Agno's add_history_to_context copies every message of the last
+num_history_runs runs into the prompt on every turn, including every tool
+call and tool result, however large. HistoryAssembler replaces that step:
+
+- Each earlier run is prepared once and cached per session: its full
+  messages (tool calls and results included) and a brief form (just the
+  question and the final answer), each with an estimated token count
+- On the next turn only runs the cache has not seen are prepared, so a
+  long session is never re-copied or re-counted from scratch
+- Runs are picked newest first under max_tokens: full while they fit, then
+  brief, and older runs are left out once neither fits
+
+Tokens are estimated locally (about four characters per token), so picking
+history needs no tokenizer download or API call.
+
+Usage:
+    history = HistoryAssembler(max_tokens=4000)
+    agent = Agent(db=db, add_history_to_context=True, ...)
+    enable_history_budget(agent, history)
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from agno.agent import Agent
+from agno.models.message import Message
+from agno.run.agent import RunOutput
+from agno.run.base import RunStatus
+from agno.session import AgentSession
+
+from common.tokens import estimate_tokens
+
+# Runs in these states are never shown to the model again, as in Agno
+SKIPPED_STATUSES = {RunStatus.paused, RunStatus.cancelled, RunStatus.error}
+
+# Per-message overhead for the role and message framing
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_message_tokens(message: Message) -> int:
+    """Rough token count of a message, including its tool calls"""
+    tokens = MESSAGE_OVERHEAD_TOKENS + estimate_tokens(message.get_content_string() or "")
+    if message.tool_calls:
+        tokens += estimate_tokens(json.dumps(message.tool_calls, default=str))
+    return tokens
+
+
+def _history_copy(message: Message) -> Message:
+    # Tagged as history so Agno never stores or replays it as part of the new run
+    return message.model_copy(update={"from_history": True})
+
+
+@dataclass
+class RunHistory:
+    """One earlier run, prepared for the prompt in a full and a brief form"""
+
+    run_id: str
+    full: List[Message]
+    full_tokens: int
+    brief: List[Message]
+    brief_tokens: int
+
+    @classmethod
+    def from_run(cls, run: RunOutput) -> "RunHistory":
+        messages = [m for m in run.messages or [] if not m.from_history and m.role != "system"]
+        full = [_history_copy(m) for m in messages]
+
+        # Brief form: the question and the final answer, without tool traffic
+        question = next((m for m in full if m.role == "user"), None)
+        answer = next((m for m in reversed(full) if m.role == "assistant" and not m.tool_calls), None)
+        brief = [m for m in (question, answer) if m is not None]
+
+        return cls(
+            run_id=run.run_id,
+            full=full,
+            full_tokens=sum(estimate_message_tokens(m) for m in full),
+            brief=brief,
+            brief_tokens=sum(estimate_message_tokens(m) for m in brief),
+        )
+
+
+class HistoryAssembler:
+    """Picks earlier runs under a token budget, caching prepared runs per session"""
+
+    def __init__(self, max_tokens: int = 4000, max_runs: Optional[int] = None, max_sessions: int = 1000):
+        self.max_tokens = max_tokens
+        self.max_runs = max_runs
+        self.max_sessions = max_sessions
+
+        # session_id -> prepared runs in session order, least recently used session first
+        self._sessions: "OrderedDict[str, List[RunHistory]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.runs_prepared = 0
+        self.rebuilds = 0
+        self.history_tokens = 0
+        self.assembly_seconds = 0.0
+        self.runs_full = 0
+        self.runs_brief = 0
+        self.runs_dropped = 0
+
+    def _prepared_runs(self, session: AgentSession, agent_id: Optional[str]) -> List[RunHistory]:
+        runs = [
+            run for run in session.runs or []
+            if run.parent_run_id is None
+            and run.status not in SKIPPED_STATUSES
+            and run.messages
+            and (agent_id is None or run.agent_id == agent_id)
+        ]
+
+        with self._lock:
+            prepared = self._sessions.get(session.session_id, [])
+            # The cache is only extended while the session it saw is a prefix of this one
+            if len(prepared) > len(runs) or any(p.run_id != r.run_id for p, r in zip(prepared, runs)):
+                prepared = []
+                self.rebuilds += 1
+
+        new_runs = [RunHistory.from_run(run) for run in runs[len(prepared):]]
+
+        with self._lock:
+            prepared = prepared + new_runs
+            self.runs_prepared += len(new_runs)
+            self._sessions[session.session_id] = prepared
+            self._sessions.move_to_end(session.session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return prepared
+
+    def history_for(self, session: AgentSession, agent_id: Optional[str] = None) -> List[Message]:
+        """Return the history messages for the next run of a session, oldest first"""
+        start = time.perf_counter()
+        prepared = self._prepared_runs(session, agent_id)
+        candidates = prepared[-self.max_runs:] if self.max_runs else prepared
+
+        selected: List[List[Message]] = []
+        budget = self.max_tokens
+        full = brief = 0
+        for run in reversed(candidates):
+            if run.full_tokens <= budget:
+                selected.append(run.full)
+                budget -= run.full_tokens
+                full += 1
+            elif run.brief and run.brief_tokens <= budget:
+                selected.append(run.brief)
+                budget -= run.brief_tokens
+                brief += 1
+            else:
+                break
+
+        # Fresh copies, so nothing done to this run's messages leaks into the cache
+        history = [message.model_copy() for messages in reversed(selected) for message in messages]
+
+        with self._lock:
+            self.requests += 1
+            self.runs_full += full
+            self.runs_brief += brief
+            self.runs_dropped += len(prepared) - full - brief
+            self.history_tokens += self.max_tokens - budget
+            self.assembly_seconds += time.perf_counter() - start
+        return history
+
+    def forget(self, session_id: str) -> None:
+        """Drop the prepared runs of a session"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return selection counters and average history size and assembly time"""
+        requests = self.requests or 1
+        return {
+            "max_tokens": self.max_tokens,
+            "sessions": len(self._sessions),
+            "requests": self.requests,
+            "runs_prepared": self.runs_prepared,
+            "rebuilds": self.rebuilds,
+            "runs_full": self.runs_full,
+            "runs_brief": self.runs_brief,
+            "runs_dropped": self.runs_dropped,
+            "avg_history_tokens": round(self.history_tokens / requests, 1),
+            "avg_assembly_ms": round(self.assembly_seconds / requests * 1000, 3),
+        }
+
+
+def _insert_history(run_messages, history: List[Message]) -> None:
+    # History goes right before this run's user message, where Agno puts it
+    index = next(
+        (i for i, m in enumerate(run_messages.messages) if m is run_messages.user_message),
+        len(run_messages.messages),
+    )
+    run_messages.messages[index:index] = history
+
+
+def enable_history_budget(agent: Agent, assembler: HistoryAssembler) -> None:
+    """
+    Build an agent's history with the assembler instead of num_history_runs.
+
+    Applies whenever the agent would add history to the context; Agno's own
+    history step is skipped for those runs.
+    """
+    original_get_run_messages = agent._get_run_messages
+    original_aget_run_messages = agent._aget_run_messages
+    agent_id = agent.id if agent.team_id is not None else None
+
+    def wants_history(add_history_to_context: Optional[bool]) -> bool:
+        return agent.add_history_to_context if add_history_to_context is None else add_history_to_context
+
+    def get_run_messages(*, session: AgentSession, add_history_to_context: Optional[bool] = None, **kwargs):
+        run_messages = original_get_run_messages(session=session, add_history_to_context=False, **kwargs)
+        if wants_history(add_history_to_context):
+            _insert_history(run_messages, assembler.history_for(session, agent_id))
+        return run_messages
+
+    async def aget_run_messages(*, session: AgentSession, add_history_to_context: Optional[bool] = None, **kwargs):
+        run_messages = await original_aget_run_messages(session=session, add_history_to_context=False, **kwargs)
+        if wants_history(add_history_to_context):
+            _insert_history(run_messages, assembler.history_for(session, agent_id))
+        return run_messages
+
+    agent._get_run_messages = get_run_messages
+    agent._aget_run_messages = aget_run_messages
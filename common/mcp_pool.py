@@ -0,0 +1,299 @@
+"""
+MCP Session Pool - Warm client sessions per upstream MCP server
+
+A single MCPTools instance holds one client session, so every concurrent
+agent run shares it (one stdio subprocess for GitHub MCP, one HTTP session
+for Phoenix Docs). The pool keeps several warm sessions per upstream and
+hands tool calls to the least loaded one.
+
+- Sessions are opened lazily up to max_size, min_size are kept warm
+- Each session serves at most session_concurrency calls at a time
+- Callers wait for a free session; beyond max_waiters, or after
+  acquire_timeout, calls fail fast with PoolExhaustedError
+- A background task pings idle sessions, replaces dead ones and
+  closes sessions idle for longer than idle_timeout
+
+Each session is opened and closed by its own task (ManagedConnection),
+because the MCP client transports must be exited from the task that
+entered them.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from agno.tools.mcp import MCPTools
+
+from common.schema_cache import SchemaCache, connect_with_schema_cache
+
+
+class PoolExhaustedError(Exception):
+    """Raised when an upstream has no capacity left for another call"""
+
+
+class ManagedConnection:
+    """Keeps an MCPTools connection open from a dedicated owner task"""
+
+    def __init__(self, tools: MCPTools, schema_cache: Optional[SchemaCache] = None):
+        self.tools = tools
+        self.schema_cache = schema_cache
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def open(self, timeout: Optional[float] = None) -> None:
+        """Connect and wait until the upstream's tools are registered"""
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            raise ConnectionError(f"Timed out connecting to {self.tools.url or self.tools.server_params}")
+        if not self.tools.initialized:
+            raise ConnectionError(f"Failed to connect to {self.tools.url or self.tools.server_params}")
+
+    async def _run(self) -> None:
+        try:
+            if self.schema_cache is not None:
+                await connect_with_schema_cache(self.tools, self.schema_cache)
+            else:
+                await self.tools.connect()
+        except Exception as e:
+            print(f"Warning: could not connect to {self.tools.url or self.tools.server_params}: {e}")
+        finally:
+            self._ready.set()
+
+        if self.tools.initialized:
+            await self._closing.wait()
+            await self.tools.close()
+
+    async def close(self) -> None:
+        """Close the connection from its owner task"""
+        self._closing.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def is_alive(self) -> bool:
+        return self.tools.initialized and await self.tools.is_alive()
+
+
+class PooledSession(ManagedConnection):
+    """A pool member: a private copy of the upstream's MCPTools plus usage tracking"""
+
+    def __init__(self, template: MCPTools, schema_cache: Optional[SchemaCache] = None):
+        super().__init__(
+            MCPTools(
+                transport=template.transport,
+                url=template.url,
+                server_params=template.server_params,
+                timeout_seconds=template.timeout_seconds,
+                include_tools=template.include_tools,
+                exclude_tools=template.exclude_tools,
+                tool_name_prefix=template.tool_name_prefix,
+            ),
+            schema_cache=schema_cache,
+        )
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+
+class MCPSessionPool:
+    """Pool of warm MCP client sessions for a single upstream"""
+
+    def __init__(
+        self,
+        template: MCPTools,
+        name: str,
+        min_size: int = 1,
+        max_size: int = 4,
+        session_concurrency: int = 1,
+        max_waiters: int = 64,
+        acquire_timeout: float = 30.0,
+        idle_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+        schema_cache: Optional[SchemaCache] = None,
+    ):
+        self.template = template
+        self.name = name
+        self.schema_cache = schema_cache
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size, 1)
+        self.session_concurrency = session_concurrency
+        self.max_waiters = max_waiters
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._sessions: List[PooledSession] = []
+        self._opening = 0
+        self._waiters = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._started = False
+
+        self.calls = 0
+        self.rejected = 0
+        self.replaced = 0
+        self.reaped = 0
+
+    def handles(self, function_name: str) -> bool:
+        """Whether the function belongs to this pool's upstream"""
+        return function_name in self.template.functions
+
+    async def start(self) -> None:
+        """Open min_size sessions and start the health check task"""
+        if self._started:
+            return
+        self._started = True
+        self._condition = asyncio.Condition()
+        await asyncio.gather(*(self._grow() for _ in range(self.min_size)), return_exceptions=True)
+        self._maintenance_task = asyncio.create_task(self._maintain())
+
+    async def close(self) -> None:
+        """Close every pooled session"""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        sessions, self._sessions = self._sessions, []
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+        self._started = False
+
+    async def _grow(self) -> Optional[PooledSession]:
+        self._opening += 1
+        session = PooledSession(self.template, self.schema_cache)
+        try:
+            await session.open()
+        except Exception as e:
+            print(f"Warning: {self.name} pool could not open a session: {e}")
+            self._opening -= 1
+            async with self._condition:
+                self._condition.notify_all()
+            return None
+
+        self._opening -= 1
+
+        async with self._condition:
+            self._sessions.append(session)
+            self._condition.notify_all()
+        return session
+
+    def _pick(self) -> Optional[PooledSession]:
+        free = [s for s in self._sessions if s.in_flight < self.session_concurrency]
+        if not free:
+            return None
+        return min(free, key=lambda s: s.in_flight)
+
+    async def _acquire(self) -> PooledSession:
+        if not self._started:
+            await self.start()
+
+        if self._waiters >= self.max_waiters:
+            self.rejected += 1
+            raise PoolExhaustedError(f"{self.name}: {self._waiters} calls already waiting for a session")
+
+        self._waiters += 1
+        deadline = time.monotonic() + self.acquire_timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.rejected += 1
+                    raise PoolExhaustedError(f"{self.name}: no session free after {self.acquire_timeout}s")
+
+                async with self._condition:
+                    session = self._pick()
+                    if session is not None:
+                        session.in_flight += 1
+                        return session
+
+                    if len(self._sessions) + self._opening >= self.max_size:
+                        try:
+                            await asyncio.wait_for(self._condition.wait(), remaining)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+
+                # Open another session outside the lock, then pick again
+                if await self._grow() is None and not self._sessions:
+                    self.rejected += 1
+                    raise PoolExhaustedError(f"{self.name}: upstream is not accepting connections")
+        finally:
+            self._waiters -= 1
+
+    async def _release(self, session: PooledSession) -> None:
+        async with self._condition:
+            session.in_flight -= 1
+            session.last_used = time.monotonic()
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[PooledSession]:
+        """Borrow a session for the duration of the block"""
+        session = await self._acquire()
+        try:
+            yield session
+        finally:
+            await self._release(session)
+
+    async def call(self, function_name: str, arguments: Dict[str, Any]) -> Any:
+        """Run a tool call on a pooled session"""
+        async with self.session() as session:
+            self.calls += 1
+            return await session.tools.functions[function_name].entrypoint(**arguments)
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            now = time.monotonic()
+            for session in list(self._sessions):
+                if session.in_flight:
+                    continue
+
+                idle_for = now - session.last_used
+                if idle_for > self.idle_timeout and len(self._sessions) > self.min_size:
+                    self.reaped += 1
+                elif await session.is_alive():
+                    continue
+                else:
+                    self.replaced += 1
+
+                async with self._condition:
+                    if session.in_flight or session not in self._sessions:
+                        continue
+                    self._sessions.remove(session)
+                await session.close()
+
+            while len(self._sessions) + self._opening < self.min_size:
+                if await self._grow() is None:
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size and call counters"""
+        return {
+            "sessions": len(self._sessions),
+            "in_flight": sum(s.in_flight for s in self._sessions),
+            "waiting": self._waiters,
+            "max_size": self.max_size,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "replaced": self.replaced,
+            "reaped": self.reaped,
+        }
+
+
+def create_pool_hook(pools: List[MCPSessionPool]) -> Callable:
+    """
+    Create an Agno tool hook that runs MCP tool calls on pooled sessions.
+
+    The agent still uses the original MCPTools for tool schemas; only the
+    calls themselves are routed through the pool of the owning upstream.
+    """
+
+    async def pool_hook(function_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Any:
+        for pool in pools:
+            if pool.handles(function_name):
+                return await pool.call(function_name, arguments)
+        return await function_call(**arguments)
+
+    return pool_hook
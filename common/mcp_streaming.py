@@ -0,0 +1,152 @@
+"""
+MCP Streaming - Partial agent output over the AgentOS /mcp endpoint
+
+AgentOS's run_agent MCP tool awaits the whole inner run and returns it in
+one piece, so a team client chained on top of the Community Support Agent
+sees nothing until both agents are done. Streaming adds two halves:
+
+- Server: enable_streaming_run_agent() replaces run_agent with a version
+  that streams the inner run and sends its content as MCP progress
+  notifications (the text delta in the notification message) while it
+  runs. The final result is the same RunOutput as before, so clients that
+  don't ask for progress see no difference
+- Client: enable_tool_progress() asks the server for progress on run_agent
+  calls of a connected MCPTools and hands each text delta to a callback,
+  so a team client can show the inner answer while it is written
+
+Progress is only sent to clients that ask for it (a progressToken in the
+request), and deltas are sent at most every min_interval seconds.
+
+Usage:
+    app = agent_os.get_app()
+    streaming = enable_streaming_run_agent(agent_os)
+
+    async with MCPTools(url=".../mcp") as community_mcp:
+        enable_tool_progress(community_mcp, print_progress)
+"""
+
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from agno.os import AgentOS
+from agno.os.utils import get_agent_by_id
+from agno.run.agent import RunContentEvent, RunErrorEvent, RunOutput
+from agno.tools.mcp import MCPTools
+from fastmcp import Context
+
+
+class StreamingStats:
+    """Counters for streamed run_agent calls"""
+
+    def __init__(self):
+        self.runs = 0
+        self.streamed_runs = 0
+        self.notifications = 0
+        self.first_chunk_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return run counts and the average time to the first streamed chunk"""
+        streamed = self.streamed_runs or 1
+        runs = self.runs or 1
+        return {
+            "runs": self.runs,
+            "streamed_runs": self.streamed_runs,
+            "notifications": self.notifications,
+            "avg_first_chunk_seconds": round(self.first_chunk_seconds / streamed, 3),
+            "avg_run_seconds": round(self.run_seconds / runs, 3),
+        }
+
+
+def enable_streaming_run_agent(agent_os: AgentOS, min_interval: float = 0.05) -> StreamingStats:
+    """
+    Replace the run_agent tool of AgentOS's MCP server with one that streams progress.
+
+    Call after agent_os.get_app(), which creates the MCP server.
+    """
+    server = agent_os._mcp_app.state.fastmcp_server
+    server.remove_tool("run_agent")
+    streaming = StreamingStats()
+
+    @server.tool(name="run_agent", description="Run an agent", tags={"core"})  # type: ignore
+    async def run_agent(agent_id: str, message: str, ctx: Context) -> RunOutput:
+        agent = get_agent_by_id(agent_id, agent_os.agents)
+        if agent is None:
+            raise Exception(f"Agent {agent_id} not found")
+
+        start = time.monotonic()
+        streaming.runs += 1
+        wants_progress = ctx.request_context.meta is not None and ctx.request_context.meta.progressToken is not None
+        if not wants_progress:
+            # Explicit: Agno keeps agent.stream on once any run of the agent has streamed
+            run_output = await agent.arun(message, stream=False)
+            streaming.run_seconds += time.monotonic() - start
+            return run_output
+
+        streaming.streamed_runs += 1
+        sent, pending, last_sent = 0, "", 0.0
+        run_output: Optional[RunOutput] = None
+        error: Optional[str] = None
+
+        async def send(delta: str) -> None:
+            nonlocal sent, last_sent
+            if sent == 0:
+                streaming.first_chunk_seconds += time.monotonic() - start
+            sent += len(delta)
+            last_sent = time.monotonic()
+            streaming.notifications += 1
+            await ctx.report_progress(progress=sent, message=delta)
+
+        async for event in agent.arun(message, stream=True, yield_run_output=True):
+            if isinstance(event, RunOutput):
+                run_output = event
+            elif isinstance(event, RunContentEvent) and isinstance(event.content, str):
+                pending += event.content
+                if pending and time.monotonic() - last_sent >= min_interval:
+                    await send(pending)
+                    pending = ""
+            elif isinstance(event, RunErrorEvent):
+                error = event.content
+        if pending:
+            await send(pending)
+
+        streaming.run_seconds += time.monotonic() - start
+        if run_output is None:
+            raise Exception(error or f"Agent {agent_id} returned no result")
+        return run_output
+
+    return streaming
+
+
+def print_progress(delta: str) -> None:
+    """Write streamed text to stdout as it arrives"""
+    sys.stdout.write(delta)
+    sys.stdout.flush()
+
+
+def enable_tool_progress(
+    toolkit: MCPTools,
+    on_progress: Callable[[str], None] = print_progress,
+    tool_names: Iterable[str] = ("run_agent",),
+) -> None:
+    """
+    Ask the server for progress on calls to the given tools and pass each text delta to on_progress.
+
+    Call once the toolkit is connected; the progress request goes on its
+    current client session.
+    """
+    session = toolkit.session
+    original_call_tool = session.call_tool
+    streamed = set(tool_names)
+
+    async def report(progress: float, total: Optional[float], message: Optional[str]) -> None:
+        if message:
+            on_progress(message)
+
+    async def call_tool(name: str, arguments: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        if name in streamed and kwargs.get("progress_callback") is None:
+            kwargs["progress_callback"] = report
+        return await original_call_tool(name, arguments, *args, **kwargs)
+
+    session.call_tool = call_tool
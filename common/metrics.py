@@ -0,0 +1,364 @@
+"""
+Run Metrics - Per-stage timings of agent runs as Prometheus histograms
+
+The only tracing so far is the optional Arize exporter, which needs an
+external service. RunMetrics records where the time of every run goes,
+locally, with no extra dependency:
+
+- agent_stage_seconds{stage}: session reads and writes (the history load),
+  background session flushes, prompt assembly (history included), each
+  model call and its first token, and background session summaries
+- agent_run_seconds{agent,status} for whole runs, and
+  agent_time_to_first_token_seconds{agent} from Agno's run metrics
+- mcp_tool_call_seconds{upstream,tool,status} for every MCP tool call
+- mcp_tool_result_bytes_total and mcp_tool_result_tokens_total
+  {upstream,stage}: size of tool results before (raw) and after compaction
+  (compacted), fed by common/tool_compaction.py
+
+render() returns the Prometheus text format for a scrape endpoint. With
+span_file set, every timing is also appended to a file as one JSON span per
+line (OTLP field names, the run id as trace id), for offline analysis;
+call close() on shutdown to write out the last batch.
+Nothing is wrapped unless instrumentation is enabled, so disabled metrics
+cost nothing on the request path.
+
+Usage:
+    metrics = RunMetrics(span_file="tmp/spans.jsonl")
+    agent = Agent(tools=[docs_mcp], tool_hooks=[create_metrics_hook(metrics, {"phoenix_docs": docs_mcp})])
+    enable_run_metrics(agent, metrics)
+    print(metrics.render())
+"""
+
+import atexit
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from agno.agent import Agent
+from agno.run import RunContext
+from agno.run.agent import RunOutput
+from agno.tools.function import ToolResult
+from agno.tools.mcp import MCPTools
+
+# Seconds; covers a cached tool call up to a slow multi-tool run
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Run id of the agent run the current task is working on, for exported spans
+current_run_id: ContextVar[Optional[str]] = ContextVar("current_run_id", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """A Prometheus histogram with labels"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> [count per bucket..., count in +Inf], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, labels: Tuple[str, ...]) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += seconds
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total[0]) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            prefix = f"{label_text}," if label_text else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            braces = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{self.name}_sum{braces} {total:.6f}")
+            lines.append(f"{self.name}_count{braces} {cumulative}")
+        return lines
+
+
+class Counter:
+    """A Prometheus counter with labels"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float, labels: Tuple[str, ...]) -> None:
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = dict(self._series)
+        for labels, total in sorted(series.items()):
+            label_text = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            lines.append(f"{self.name}{{{label_text}}} {total:g}" if label_text else f"{self.name} {total:g}")
+        return lines
+
+
+class SpanFileExporter:
+    """Appends spans to a file as JSON lines, in batches of flush_every or every flush_seconds"""
+
+    def __init__(self, path: str, flush_every: int = 100, flush_seconds: float = 1.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._buffer: List[str] = []
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def export(self, span: Dict[str, Any]) -> None:
+        with self._lock:
+            self._buffer.append(json.dumps(span, default=str))
+            if len(self._buffer) < self.flush_every and time.monotonic() - self._flushed_at < self.flush_seconds:
+                return
+            lines, self._buffer = self._buffer, []
+            self._flushed_at = time.monotonic()
+        self._write(lines)
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if lines:
+            self._write(lines)
+
+    def _write(self, lines: List[str]) -> None:
+        try:
+            with open(self.path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            print(f"Warning: could not write spans to {self.path}: {e}")
+
+
+class RunMetrics:
+    """Stage, run and tool call histograms, with optional span export"""
+
+    def __init__(self, span_file: Optional[str] = None, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.stage_seconds = Histogram(
+            "agent_stage_seconds", "Time spent in each stage of an agent run", ("stage",), buckets
+        )
+        self.run_seconds = Histogram(
+            "agent_run_seconds", "Total duration of agent runs", ("agent", "status"), buckets
+        )
+        self.first_token_seconds = Histogram(
+            "agent_time_to_first_token_seconds", "Time from run start to the first model token", ("agent",), buckets
+        )
+        self.tool_seconds = Histogram(
+            "mcp_tool_call_seconds", "Duration of MCP tool calls per upstream", ("upstream", "tool", "status"), buckets
+        )
+        self.tool_result_bytes = Counter(
+            "mcp_tool_result_bytes_total", "Bytes of MCP tool results, raw and as passed to the model", ("upstream", "stage")
+        )
+        self.tool_result_tokens = Counter(
+            "mcp_tool_result_tokens_total", "Estimated tokens of MCP tool results, raw and as passed to the model",
+            ("upstream", "stage"),
+        )
+        self.exporter = SpanFileExporter(span_file) if span_file else None
+
+    def observe(
+        self,
+        histogram: Histogram,
+        seconds: float,
+        labels: Dict[str, str],
+        run_id: Optional[str] = None,
+        start_ns: Optional[int] = None,
+    ) -> None:
+        """Record a timing that started at start_ns, or one that ended now"""
+        histogram.observe(seconds, tuple(labels[name] for name in histogram.labelnames))
+        if self.exporter is not None:
+            start = start_ns if start_ns is not None else time.time_ns() - int(seconds * 1e9)
+            self.exporter.export({
+                "name": labels.get("stage") or histogram.name,
+                "trace_id": run_id or current_run_id.get(),
+                "start_time_unix_nano": start,
+                "end_time_unix_nano": start + int(seconds * 1e9),
+                "attributes": labels,
+            })
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block as one stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(self.stage_seconds, time.perf_counter() - start, {"stage": name})
+
+    def timed(self, name: str, function: Callable) -> Callable:
+        """Wrap a sync function so every call is timed as a stage"""
+
+        def timed_call(*args, **kwargs):
+            with self.stage(name):
+                return function(*args, **kwargs)
+
+        return timed_call
+
+    def timed_async(self, name: str, function: Callable) -> Callable:
+        """Wrap an async function so every call is timed as a stage"""
+
+        async def timed_call(*args, **kwargs):
+            with self.stage(name):
+                return await function(*args, **kwargs)
+
+        return timed_call
+
+    async def close(self) -> None:
+        """Write out buffered spans; uvicorn exits on SIGTERM without running atexit"""
+        if self.exporter is not None:
+            self.exporter.flush()
+
+    def render(self) -> str:
+        """All histograms and counters in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in (
+            self.stage_seconds, self.run_seconds, self.first_token_seconds, self.tool_seconds,
+            self.tool_result_bytes, self.tool_result_tokens,
+        ):
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+def create_metrics_hook(metrics: RunMetrics, upstreams: Dict[str, MCPTools]) -> Callable:
+    """
+    Create an Agno tool hook that times each tool call, labelled with its upstream.
+
+    Place it first among the MCP hooks, so cache hits, guard timeouts and
+    pool waits are all part of the call time the agent sees.
+    """
+
+    def upstream_of(function_name: str) -> str:
+        for name, toolkit in upstreams.items():
+            if function_name in toolkit.functions:
+                return name
+        return "local"
+
+    async def metrics_hook(
+        function_name: str, function_call: Callable, arguments: Dict[str, Any], run_context: Optional[RunContext] = None
+    ) -> Any:
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = await function_call(**arguments)
+            content = result.content if isinstance(result, ToolResult) else result
+            status = "error" if isinstance(content, str) and content.startswith("Error") else "ok"
+            return result
+        finally:
+            metrics.observe(
+                metrics.tool_seconds,
+                time.perf_counter() - start,
+                {"upstream": upstream_of(function_name), "tool": function_name, "status": status},
+                run_id=run_context.run_id if run_context is not None else None,
+            )
+
+    return metrics_hook
+
+
+def enable_run_metrics(agent: Agent, metrics: RunMetrics, summary_manager: Optional[Any] = None) -> None:
+    """
+    Time the stages of an agent's async runs: session reads and writes, prompt assembly, model calls, summaries.
+
+    Apply after enable_history_budget, so prompt assembly includes building
+    the history. Pass the BackgroundSummaryManager to time summaries too.
+    """
+    db = agent.db
+    if db is not None:
+        db.get_session = metrics.timed("session_read", db.get_session)
+        db.upsert_session = metrics.timed("session_write", db.upsert_session)
+        if hasattr(db, "flush"):
+            # TunedSqliteDb's background writer: only flushes that wrote something count
+            original_flush = db.flush
+
+            def flush() -> int:
+                start = time.perf_counter()
+                written = original_flush()
+                if written:
+                    metrics.observe(metrics.stage_seconds, time.perf_counter() - start, {"stage": "session_flush"})
+                return written
+
+            db.flush = flush
+
+    agent._get_run_messages = metrics.timed("prompt_assembly", agent._get_run_messages)
+    agent._aget_run_messages = metrics.timed_async("prompt_assembly", agent._aget_run_messages)
+
+    model = agent.model
+    if model is not None:
+        model.ainvoke = metrics.timed_async("model_call", model.ainvoke)
+        original_ainvoke_stream = model.ainvoke_stream
+
+        async def ainvoke_stream(*args, **kwargs) -> AsyncIterator[Any]:
+            start = time.perf_counter()
+            first = True
+            try:
+                async for chunk in original_ainvoke_stream(*args, **kwargs):
+                    if first:
+                        first = False
+                        metrics.observe(metrics.stage_seconds, time.perf_counter() - start, {"stage": "model_first_token"})
+                    yield chunk
+            finally:
+                metrics.observe(metrics.stage_seconds, time.perf_counter() - start, {"stage": "model_call"})
+
+        model.ainvoke_stream = ainvoke_stream
+
+    if summary_manager is not None and hasattr(summary_manager, "_summarize"):
+        summary_manager._summarize = metrics.timed_async("session_summary", summary_manager._summarize)
+
+    def record_run(run_response: RunOutput, start: float, start_ns: int, failed: bool) -> None:
+        agent_id = run_response.agent_id or agent.id or "agent"
+        status = "error" if failed or run_response.status is None else run_response.status.value.lower()
+        labels = {"agent": agent_id, "status": status}
+        metrics.observe(metrics.run_seconds, time.perf_counter() - start, labels, run_response.run_id, start_ns)
+        first_token = run_response.metrics.time_to_first_token if run_response.metrics is not None else None
+        if first_token is not None:
+            metrics.observe(metrics.first_token_seconds, first_token, {"agent": agent_id}, run_response.run_id, start_ns)
+
+    # _arun and _arun_stream get the run before the session is read, so every
+    # stage of the run, the history load included, is tagged with its id
+    original_arun = agent._arun
+    original_arun_stream = agent._arun_stream
+
+    async def timed_arun(*args, run_response: RunOutput, **kwargs) -> RunOutput:
+        current_run_id.set(run_response.run_id)
+        start, start_ns, failed = time.perf_counter(), time.time_ns(), True
+        try:
+            result = await original_arun(*args, run_response=run_response, **kwargs)
+            failed = False
+            return result
+        finally:
+            record_run(run_response, start, start_ns, failed)
+
+    async def timed_arun_stream(*args, run_response: RunOutput, **kwargs) -> AsyncIterator[Any]:
+        current_run_id.set(run_response.run_id)
+        start, start_ns, failed = time.perf_counter(), time.time_ns(), True
+        try:
+            async for event in original_arun_stream(*args, run_response=run_response, **kwargs):
+                yield event
+            failed = False
+        finally:
+            record_run(run_response, start, start_ns, failed)
+
+    agent._arun = timed_arun
+    agent._arun_stream = timed_arun_stream
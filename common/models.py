@@ -0,0 +1,131 @@
+"""
+Model Selection - Pick the agent model from the environment
+
+Every agent in servers/, clients/ and scripts/ gets its model from
+get_model(), so one environment variable switches the whole demo between
+the real Claude API and the offline fake model:
+
+- AGENT_MODEL=claude (default): Claude with the id the agent asks for, with
+  tools and static instructions sent as a cached prompt prefix
+- AGENT_MODEL=fake: FakeModel, replaying FAKE_MODEL_RECORDING if it exists
+- AGENT_MODEL=record: Claude, saving every turn to FAKE_MODEL_RECORDING
+  so it can be replayed offline later
+
+Prompt caching (Claude and record):
+- PROMPT_CACHE_ENABLED: set to false to send prompts without cache breakpoints
+- PROMPT_CACHE_TTL: 5m (default) or 1h
+
+Fake model timing:
+- FAKE_MODEL_LATENCY_SECONDS: delay before the first token of each call
+- FAKE_MODEL_TOKENS_PER_SECOND: output token rate, 0 for instant output
+- FAKE_MODEL_PREFILL_TOKENS_PER_SECOND: prompt token rate before the first
+  token, 0 for instant prefill
+"""
+
+import json
+from dataclasses import dataclass, field
+from os import getenv
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+from common.fake_model import FakeModel, ModelRecording, current_turn
+from common.prompt_cache import PromptCachingClaude
+
+DEFAULT_RECORDING_FILE = str(Path(__file__).resolve().parent / "fake_recordings.json")
+
+
+def _recorded_step(response: ModelResponse) -> Dict[str, Any]:
+    step: Dict[str, Any] = {}
+    if response.content:
+        step["content"] = response.content
+    if response.tool_calls:
+        step["tool_calls"] = [
+            {
+                "name": call["function"]["name"],
+                "arguments": json.loads(call["function"].get("arguments") or "{}"),
+            }
+            for call in response.tool_calls
+        ]
+    if response.response_usage is not None:
+        step["output_tokens"] = response.response_usage.output_tokens
+    return step
+
+
+@dataclass
+class RecordingClaude(PromptCachingClaude):
+    """Claude that saves each turn's tool calls and answers for FakeModel to replay"""
+
+    recording_file: str = DEFAULT_RECORDING_FILE
+
+    _recording: Optional[ModelRecording] = field(default=None, init=False, repr=False)
+
+    @property
+    def recording(self) -> ModelRecording:
+        if self._recording is None:
+            self._recording = ModelRecording(self.recording_file)
+        return self._recording
+
+    def _record(self, messages: List[Message], response: ModelResponse, **kwargs) -> None:
+        # Structured outputs (session summaries) are generated, not replayed
+        if kwargs.get("response_format") is not None:
+            return
+        query, step, _ = current_turn(messages)
+        self.recording.record(query, step, _recorded_step(response))
+
+    def invoke(self, messages: List[Message], *args, **kwargs) -> ModelResponse:
+        response = super().invoke(messages, *args, **kwargs)
+        self._record(messages, response, **kwargs)
+        return response
+
+    async def ainvoke(self, messages: List[Message], *args, **kwargs) -> ModelResponse:
+        response = await super().ainvoke(messages, *args, **kwargs)
+        self._record(messages, response, **kwargs)
+        return response
+
+    def _collect(self, deltas: List[ModelResponse]) -> ModelResponse:
+        response = ModelResponse(role="assistant", content="")
+        for delta in deltas:
+            response.content += delta.content or ""
+            response.tool_calls.extend(delta.tool_calls or [])
+            if delta.response_usage is not None:
+                response.response_usage = delta.response_usage
+        return response
+
+    def invoke_stream(self, messages: List[Message], *args, **kwargs) -> Iterator[ModelResponse]:
+        deltas = []
+        for delta in super().invoke_stream(messages, *args, **kwargs):
+            deltas.append(delta)
+            yield delta
+        self._record(messages, self._collect(deltas), **kwargs)
+
+    async def ainvoke_stream(self, messages: List[Message], *args, **kwargs) -> AsyncIterator[ModelResponse]:
+        deltas = []
+        async for delta in super().ainvoke_stream(messages, *args, **kwargs):
+            deltas.append(delta)
+            yield delta
+        self._record(messages, self._collect(deltas), **kwargs)
+
+
+def get_model(claude_id: str) -> Model:
+    """Return the model selected by AGENT_MODEL, defaulting to Claude with the given id"""
+    backend = getenv("AGENT_MODEL", "claude").lower()
+    recording_file = getenv("FAKE_MODEL_RECORDING", DEFAULT_RECORDING_FILE)
+
+    if backend == "fake":
+        return FakeModel(
+            latency_seconds=float(getenv("FAKE_MODEL_LATENCY_SECONDS", "0")),
+            tokens_per_second=float(getenv("FAKE_MODEL_TOKENS_PER_SECOND", "0")),
+            prefill_tokens_per_second=float(getenv("FAKE_MODEL_PREFILL_TOKENS_PER_SECOND", "0")),
+            recording_file=recording_file,
+        )
+    cache_settings = {
+        "cache_prefix": getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true",
+        "extended_cache_time": getenv("PROMPT_CACHE_TTL", "5m") == "1h",
+    }
+    if backend == "record":
+        return RecordingClaude(id=claude_id, recording_file=recording_file, **cache_settings)
+    return PromptCachingClaude(id=claude_id, **cache_settings)
@@ -0,0 +1,158 @@
+"""
+Parallel Tool Calls - Concurrency cap and per-call timing for one agent run
+
+When Claude asks for several tools in one turn (a GitHub issue search plus
+a Phoenix docs lookup), Agno's async run starts them all at once and feeds
+the results back in the order the model asked for them. Two things were
+missing for mixed-source questions:
+
+- A cap: at most max_concurrency tool calls of one run are in flight; the
+  rest wait for a slot, so one turn can't take every pooled session
+- Timing: every call's start offset, wait for a slot and duration are added
+  to the run's metadata under "tool_calls", in the order the calls started
+
+stats() adds up how much tool time overlapped, which is the latency saved
+over running the same calls one after another.
+
+Usage:
+    parallel = ParallelToolCalls(max_concurrency=4)
+    agent = Agent(tools=[docs_mcp, github_mcp], ...)
+    enable_parallel_tools(agent, parallel)
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from agno.agent import Agent
+from agno.run import RunContext
+from agno.run.agent import RunOutput
+from agno.tools.function import ToolResult
+
+
+class RunToolCalls:
+    """Slots and call timings of one run"""
+
+    def __init__(self, max_concurrency: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.started = time.monotonic()
+        self.calls: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.busy_since = 0.0
+        self.busy_seconds = 0.0
+
+
+class ParallelToolCalls:
+    """Caps concurrent tool calls per run and records how long each one took"""
+
+    def __init__(self, max_concurrency: int = 4, max_runs: int = 1000):
+        self.max_concurrency = max_concurrency
+        self.max_runs = max_runs
+
+        # run_id -> calls of a run still in progress, oldest run first
+        self._runs: "OrderedDict[str, RunToolCalls]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.runs = 0
+        self.calls = 0
+        self.overlapping_calls = 0
+        self.queued_calls = 0
+        self.max_in_flight = 0
+        self.tool_seconds = 0.0
+        self.busy_seconds = 0.0
+
+    def _run(self, run_id: str) -> RunToolCalls:
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                run = self._runs[run_id] = RunToolCalls(self.max_concurrency)
+                # Runs that failed before their post-hook are dropped eventually
+                while len(self._runs) > self.max_runs:
+                    self._runs.popitem(last=False)
+            return run
+
+    async def call(self, run_id: str, function_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Any:
+        """Run one tool call of a run once a slot is free, timing it"""
+        run = self._run(run_id)
+        entry: Dict[str, Any] = {"tool": function_name}
+        run.calls.append(entry)
+
+        queued = time.monotonic()
+        if run.semaphore.locked():
+            self.queued_calls += 1
+        async with run.semaphore:
+            start = time.monotonic()
+            if run.in_flight:
+                self.overlapping_calls += 1
+            else:
+                run.busy_since = start
+            run.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, run.in_flight)
+            try:
+                result = await function_call(**arguments)
+                content = result.content if isinstance(result, ToolResult) else result
+                entry["error"] = isinstance(content, str) and content.startswith("Error")
+                return result
+            except BaseException:
+                entry["error"] = True
+                raise
+            finally:
+                end = time.monotonic()
+                run.in_flight -= 1
+                if not run.in_flight:
+                    run.busy_seconds += end - run.busy_since
+                entry["start_ms"] = round((start - run.started) * 1000, 1)
+                entry["wait_ms"] = round((start - queued) * 1000, 1)
+                entry["duration_ms"] = round((end - start) * 1000, 1)
+                self.calls += 1
+                self.tool_seconds += end - start
+
+    def finish(self, run_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the call timings of a finished run and forget the run"""
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return None
+        self.runs += 1
+        self.busy_seconds += run.busy_seconds
+        return run.calls
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call counters and the tool time saved by overlapping calls"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "runs": self.runs,
+            "calls": self.calls,
+            "overlapping_calls": self.overlapping_calls,
+            "queued_calls": self.queued_calls,
+            "max_in_flight": self.max_in_flight,
+            "tool_seconds": round(self.tool_seconds, 3),
+            "saved_seconds": round(max(0.0, self.tool_seconds - self.busy_seconds), 3),
+        }
+
+
+def enable_parallel_tools(agent: Agent, parallel: ParallelToolCalls) -> None:
+    """
+    Cap an agent's concurrent tool calls per run and add their timings to the run metadata.
+
+    The hook goes first in the agent's tool hooks, so the timing covers
+    every other hook (cache, guard, pool) as well.
+    """
+
+    async def parallel_hook(
+        function_name: str, function_call: Callable, arguments: Dict[str, Any], run_context: Optional[RunContext] = None
+    ) -> Any:
+        if run_context is None:
+            return await function_call(**arguments)
+        return await parallel.call(run_context.run_id, function_name, function_call, arguments)
+
+    def attach_tool_timings(run_output: RunOutput) -> None:
+        calls = parallel.finish(run_output.run_id)
+        if calls:
+            # A new dict: run metadata may be the agent's own metadata dict
+            run_output.metadata = {**(run_output.metadata or {}), "tool_calls": calls}
+
+    agent.tool_hooks = [parallel_hook, *(agent.tool_hooks or [])]
+    agent.post_hooks = [*(agent.post_hooks or []), attach_tool_timings]
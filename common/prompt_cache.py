@@ -0,0 +1,128 @@
+"""
+Prompt Cache - Stable, cacheable prompt prefix for Claude
+
+Every request of an agent repeats the same tool schemas and instructions.
+Anthropic caches a request prefix (tools, then system, then messages) up to
+a cache_control breakpoint, but Agno's system prompt embeds the current
+time from add_datetime_to_context, so the prefix changes every second and
+never hits, and with session summaries it also embeds the summary of the
+session, which differs per session and changes whenever it is rewritten.
+PromptCachingClaude arranges each request so it can:
+
+- Tools are sorted by name, so the order never depends on upstream timing
+- The last tool carries a breakpoint, so the tools are cached even when
+  the system prompt changes
+- The system prompt is split into a static block, which ends with a second
+  breakpoint, and a dynamic block after it with the current time and the
+  session summary
+- Cache reads and writes reported by the API are added up in
+  prompt_cache_stats, next to the uncached input tokens
+
+Anthropic only caches prefixes above a minimum size (1024 tokens for
+Sonnet), so an agent with few tools and short instructions may see no hits.
+
+Usage:
+    model = PromptCachingClaude(id="claude-sonnet-4-5")
+    print(prompt_cache_stats.stats())
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from agno.models.anthropic import Claude
+from agno.models.metrics import Metrics
+
+# Lines Agno adds to the system prompt that change between requests
+DYNAMIC_SYSTEM_LINES = re.compile(r"^- (The current time is .*)$\n?", re.MULTILINE)
+# The session summary Agno adds with add_session_summary_to_context, with its lead-in and note
+SESSION_SUMMARY_SECTION = re.compile(
+    r"(?:Here is a brief summary of your previous interactions:\n\n)?"
+    r"<summary_of_previous_interactions>\n.*?\n</summary_of_previous_interactions>\n\n"
+    r"(?:Note: this information is from previous interactions[^\n]*\n\n)?",
+    re.DOTALL,
+)
+
+
+class PromptCacheStats:
+    """Token counters for cached and uncached prompt input"""
+
+    def __init__(self):
+        self.calls = 0
+        self.calls_with_hit = 0
+        self.input_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, metrics: Metrics) -> None:
+        with self._lock:
+            self.calls += 1
+            self.calls_with_hit += metrics.cache_read_tokens > 0
+            self.input_tokens += metrics.input_tokens
+            self.cache_read_tokens += metrics.cache_read_tokens
+            self.cache_write_tokens += metrics.cache_write_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """Return token totals and the share of prompt tokens read from the cache"""
+        prompt_tokens = self.input_tokens + self.cache_read_tokens + self.cache_write_tokens
+        return {
+            "calls": self.calls,
+            "calls_with_hit": self.calls_with_hit,
+            "input_tokens": self.input_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "cached_share": round(self.cache_read_tokens / prompt_tokens, 4) if prompt_tokens else 0.0,
+        }
+
+
+# Shared by every PromptCachingClaude in the process
+prompt_cache_stats = PromptCacheStats()
+
+
+def split_system_message(system_message: str) -> Tuple[str, str]:
+    """Split a system prompt into its static part and the parts that change per request or session"""
+    dynamic = [match.group(0).strip() for match in SESSION_SUMMARY_SECTION.finditer(system_message)]
+    static = SESSION_SUMMARY_SECTION.sub("", system_message)
+    dynamic += [match.group(1) for match in DYNAMIC_SYSTEM_LINES.finditer(static)]
+    return DYNAMIC_SYSTEM_LINES.sub("", static), "\n\n".join(dynamic)
+
+
+@dataclass
+class PromptCachingClaude(Claude):
+    """Claude with tools and static instructions as a cached prompt prefix"""
+
+    # False sends requests exactly as Claude does, but still counts cache tokens
+    cache_prefix: bool = True
+
+    def _prepare_request_kwargs(
+        self, system_message: str, tools: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        if not self.cache_prefix:
+            return super()._prepare_request_kwargs(system_message, tools)
+
+        if tools:
+            tools = sorted(tools, key=lambda tool: (tool.get("function") or tool).get("name", ""))
+        request_kwargs = super()._prepare_request_kwargs("", tools)
+        cache_control: Dict[str, Any] = {"type": "ephemeral"}
+        if self.extended_cache_time:
+            cache_control["ttl"] = "1h"
+
+        if request_kwargs.get("tools"):
+            # Tools come first in the prefix: cached on their own even when the system prompt changes
+            request_kwargs["tools"][-1] = {**request_kwargs["tools"][-1], "cache_control": cache_control}
+        static, dynamic = split_system_message(system_message or "")
+        system: List[Dict[str, Any]] = []
+        if static.strip():
+            system.append({"type": "text", "text": static, "cache_control": cache_control})
+        if dynamic:
+            system.append({"type": "text", "text": dynamic})
+        if system:
+            request_kwargs["system"] = system
+        return request_kwargs
+
+    def _get_metrics(self, response_usage: Any) -> Metrics:
+        metrics = super()._get_metrics(response_usage)
+        prompt_cache_stats.record(metrics)
+        return metrics
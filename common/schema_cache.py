@@ -0,0 +1,227 @@
+"""
+Tool Schema Cache - Skip the list_tools round trip on connect
+
+Every `async with MCPTools(...)` runs the MCP initialize handshake and then
+list_tools to fetch every tool's JSON schema. The schemas almost never
+change, so they are saved per endpoint in a local JSON file and reused on
+the next connect.
+
+- Validation: the cached entry is only used when the server name, version
+  and protocol version reported by initialize (which runs anyway) match
+  the ones the schemas were fetched from. FastMCP servers report the mcp
+  library's version, so for servers started from a local script the hash
+  of that script is part of the endpoint key as well
+- Freshness: entries older than refresh_after_seconds are still served,
+  but refreshed in the background; entries older than max_age_seconds
+  are refetched on the spot
+
+Usage in a client:
+    async with schema_cached(MCPTools(transport="streamable-http", url=URL)) as mcp_tools:
+        agent = Agent(tools=[mcp_tools])
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import asdict
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from agno.tools.mcp import MCPTools
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import InitializeResult, ListToolsResult, Tool
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "mcp-agent-os" / "tool_schemas.json"
+
+
+def source_version(*paths: str) -> str:
+    """Short hash of source files: changes whenever the tools defined in them can"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def endpoint_key(tools: MCPTools) -> str:
+    """Identify an MCP endpoint by URL or command line (never its env, which holds tokens)"""
+    if tools.transport in ("streamable-http", "sse"):
+        return tools.url or getattr(tools.server_params, "url", "")
+    params = tools.server_params
+    key = " ".join([params.command, *params.args])
+    cwd = Path(params.cwd or ".")
+    scripts = [str(cwd / arg) for arg in params.args if arg.endswith(".py") and (cwd / arg).is_file()]
+    return f"{key} @{source_version(*scripts)}" if scripts else key
+
+
+class SchemaCache:
+    """Tool schemas per MCP endpoint, persisted as a JSON file"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        refresh_after_seconds: float = 3600,
+        max_age_seconds: float = 7 * 24 * 3600,
+    ):
+        self.path = Path(path or os.getenv("MCP_SCHEMA_CACHE", str(DEFAULT_CACHE_PATH))).expanduser()
+        self.refresh_after_seconds = refresh_after_seconds
+        self.max_age_seconds = max_age_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+        try:
+            self._entries: Dict[str, Dict[str, Any]] = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def get(self, endpoint: str, server_version: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry if it matches the server version and is not too old"""
+        entry = self._entries.get(endpoint)
+        if (
+            entry is None
+            or entry.get("server_version") != server_version
+            or time.time() - entry.get("fetched_at", 0) > self.max_age_seconds
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def is_stale(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry.get("fetched_at", 0) > self.refresh_after_seconds
+
+    def put(self, endpoint: str, server_version: str, tools: List[Dict[str, Any]]) -> None:
+        """Store the schemas for an endpoint and write the cache file"""
+        self._entries[endpoint] = {"server_version": server_version, "fetched_at": time.time(), "tools": tools}
+        self._save()
+
+    def _save(self) -> None:
+        # Write atomically so concurrent client processes never read a partial file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "refreshes": self.refreshes, "endpoints": len(self._entries)}
+
+
+class SchemaCachingSession(ClientSession):
+    """ClientSession that answers list_tools from the schema cache when it is valid"""
+
+    def __init__(self, *args, cache: SchemaCache, endpoint: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+        self.endpoint = endpoint
+        self.server_version: Optional[str] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def initialize(self) -> InitializeResult:
+        result = await super().initialize()
+        info = result.serverInfo
+        self.server_version = f"{info.name}/{info.version}/{result.protocolVersion}"
+        return result
+
+    async def list_tools(self, cursor: Optional[str] = None, **kwargs) -> ListToolsResult:
+        # Paginated requests always go to the server
+        if cursor is not None or kwargs.get("params") is not None:
+            return await super().list_tools(cursor, **kwargs)
+
+        entry = self.cache.get(self.endpoint, self.server_version)
+        if entry is None:
+            return await self._fetch()
+
+        tools = [Tool.model_validate(tool) for tool in entry["tools"]]
+        for tool in tools:
+            # ClientSession validates structured tool output against these
+            self._tool_output_schemas[tool.name] = tool.outputSchema
+        if self.cache.is_stale(entry) and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return ListToolsResult(tools=tools)
+
+    async def _fetch(self) -> ListToolsResult:
+        result = await super().list_tools()
+        self.cache.put(
+            self.endpoint,
+            self.server_version,
+            [tool.model_dump(mode="json", exclude_none=True) for tool in result.tools],
+        )
+        return result
+
+    async def _refresh(self) -> None:
+        try:
+            await self._fetch()
+            self.cache.refreshes += 1
+        except Exception:
+            # The session may close before a background refresh finishes;
+            # the stale entry is simply refreshed on a later connect
+            pass
+
+
+async def connect_with_schema_cache(tools: MCPTools, cache: SchemaCache) -> None:
+    """
+    Connect an MCPTools instance, reusing cached tool schemas when valid.
+
+    Mirrors MCPTools._connect, but opens a SchemaCachingSession so the
+    list_tools call made while registering tools can be served from disk.
+    """
+    if tools.initialized:
+        return
+
+    client_timeout = tools.timeout_seconds
+    if tools.transport in ("streamable-http", "sse"):
+        params = asdict(tools.server_params) if tools.server_params is not None else {}
+        params.setdefault("url", tools.url)
+        client = streamablehttp_client if tools.transport == "streamable-http" else sse_client
+        transport = client(**params)
+        params_timeout = params.get("timeout", client_timeout)
+        if isinstance(params_timeout, timedelta):
+            params_timeout = params_timeout.total_seconds()
+        client_timeout = min(client_timeout, params_timeout)
+    else:
+        transport = stdio_client(tools.server_params)
+
+    async with AsyncExitStack() as stack:
+        read, write = (await stack.enter_async_context(transport))[0:2]
+        session = SchemaCachingSession(
+            read,
+            write,
+            read_timeout_seconds=timedelta(seconds=client_timeout),
+            cache=cache,
+            endpoint=endpoint_key(tools),
+        )
+        tools.session = await stack.enter_async_context(session)
+        await tools.initialize()
+        if not tools.initialized:
+            raise ConnectionError(f"Failed to initialize MCP session for {endpoint_key(tools)}")
+
+        # Hand the open contexts over to MCPTools so close() tears them down
+        tools._context = transport
+        tools._session_context = session
+        tools._active_contexts = [transport, session]
+        stack.pop_all()
+
+
+@asynccontextmanager
+async def schema_cached(tools: MCPTools, cache: Optional[SchemaCache] = None) -> AsyncIterator[MCPTools]:
+    """Drop-in replacement for `async with MCPTools(...)` that uses the schema cache"""
+    if cache is None and os.getenv("MCP_SCHEMA_CACHE_ENABLED", "true").lower() != "true":
+        async with tools:
+            yield tools
+        return
+
+    await connect_with_schema_cache(tools, cache or SchemaCache())
+    try:
+        yield tools
+    finally:
+        await tools.close()
@@ -0,0 +1,379 @@
+"""
+Session Store - SQLite session storage tuned for concurrent agent runs
+
+Agno's SqliteDb opens the file in rollback-journal mode and writes the whole
+session (every run, plus the summary) synchronously on the request path, so
+concurrent sessions queue on the database write lock and block the event
+loop while they wait. TunedSqliteDb keeps the same schema and API, but:
+
+- WAL journaling with synchronous=NORMAL: readers never wait for writers
+- A pooled SQLAlchemy engine with a busy timeout instead of lock errors
+- Write-behind: upsert_session() snapshots the session into a buffer and
+  returns; a background thread writes the buffer in one transaction every
+  flush_interval_seconds. Repeated saves of the same session between two
+  flushes are coalesced into a single row write.
+- Reads see buffered writes, so an agent always gets its latest history
+- Recently used sessions stay in memory as their serialized rows
+  (session_cache_size), so a turn does not re-read every earlier run from
+  SQLite. Each read builds a new session object from the row, so a caller
+  changing its session never changes the cached one. This assumes the
+  process is the only writer for the sessions it serves.
+- With several worker processes on one file, set write_behind=False and
+  session_cache_size=0: each save is written before upsert_session()
+  returns and every read goes to SQLite, so any worker can serve the next
+  turn of any session
+- Indexes for the session_id/agent_id/user_id lookups the Agent OS makes
+
+Buffered writes are flushed on close() and at interpreter exit; a crash can
+lose at most the last flush interval of session updates.
+
+Usage:
+    db = TunedSqliteDb(db_file="tmp/mcp_meetup_demo.db")
+    agent = Agent(db=db, add_history_to_context=True, ...)
+"""
+
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from agno.db.base import SessionType
+from agno.db.sqlite import SqliteDb
+from agno.db.utils import deserialize_session_json_fields, serialize_session_json_fields
+from agno.session import AgentSession, Session, TeamSession, WorkflowSession
+from sqlalchemy import event, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Engine, create_engine
+from sqlalchemy.schema import Table
+
+SESSION_COLUMNS = [
+    "session_id", "session_type", "agent_id", "team_id", "workflow_id", "user_id", "session_data",
+    "agent_data", "team_data", "workflow_data", "metadata", "runs", "summary", "created_at", "updated_at",
+]
+
+# Columns that are never overwritten when an existing session is saved again
+INSERT_ONLY_COLUMNS = {"session_id", "session_type", "created_at"}
+
+SESSION_CLASSES = {
+    SessionType.AGENT.value: AgentSession,
+    SessionType.TEAM.value: TeamSession,
+    SessionType.WORKFLOW.value: WorkflowSession,
+}
+
+# (index name suffix, columns) added on top of Agno's own session indexes
+SESSION_INDEXES = [
+    ("agent_id_created_at", ["agent_id", "created_at"]),
+    ("user_id", ["user_id"]),
+    ("session_type_updated_at", ["session_type", "updated_at"]),
+]
+
+
+def create_session_engine(db_file: str, pool_size: int = 8, busy_timeout_ms: int = 5000) -> Engine:
+    """Create a pooled SQLite engine with WAL journaling enabled on every connection"""
+    engine = create_engine(
+        f"sqlite:///{db_file}",
+        pool_size=pool_size,
+        max_overflow=pool_size,
+        connect_args={"check_same_thread": False, "timeout": busy_timeout_ms / 1000},
+    )
+
+    @event.listens_for(engine, "connect")
+    def configure_connection(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+        cursor.execute("PRAGMA cache_size=-16000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return engine
+
+
+def _session_row(session: Session) -> Dict[str, Any]:
+    """A session as a sessions table row, with its JSON columns serialized"""
+    data = serialize_session_json_fields(session.to_dict())
+    row = {column: data.get(column) for column in SESSION_COLUMNS}
+    row["session_type"] = _session_type(session)
+    return row
+
+
+def _session_type(session: Session) -> str:
+    if isinstance(session, AgentSession):
+        return SessionType.AGENT.value
+    if isinstance(session, TeamSession):
+        return SessionType.TEAM.value
+    return SessionType.WORKFLOW.value
+
+
+class TunedSqliteDb(SqliteDb):
+    """SqliteDb with WAL, a connection pool, write-behind batching and extra indexes"""
+
+    def __init__(
+        self,
+        db_file: str,
+        pool_size: int = 8,
+        flush_interval_seconds: float = 0.1,
+        max_pending: int = 256,
+        session_cache_size: int = 256,
+        write_behind: bool = True,
+        **kwargs,
+    ):
+        db_path = Path(db_file).resolve()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(db_file=db_file, db_engine=create_session_engine(str(db_path), pool_size), **kwargs)
+
+        self.pool_size = pool_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self.session_cache_size = session_cache_size
+        self.write_behind = write_behind
+
+        # session_id -> serialized row waiting to be written
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # session_id -> serialized row, least recently used first
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._tables: Dict[str, Table] = {}
+        self._table_lock = threading.Lock()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.writes_requested = 0
+        self.writes_coalesced = 0
+        self.rows_written = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.last_batch_ms: Optional[float] = None
+
+        self._writer = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # ==========================================
+    # Tables and indexes
+    # ==========================================
+
+    def _get_table(self, table_type: str, create_table_if_not_found: Optional[bool] = False) -> Optional[Table]:
+        # SqliteDb checks and reflects the table schema on every call; once a
+        # table exists its schema does not change, so load it only once
+        table = self._tables.get(table_type)
+        if table is not None:
+            return table
+        with self._table_lock:
+            if table_type not in self._tables:
+                table = super()._get_table(table_type, create_table_if_not_found=create_table_if_not_found)
+                if table is None:
+                    return None
+                if table_type == "sessions":
+                    self._create_session_indexes()
+                self._tables[table_type] = table
+            return self._tables[table_type]
+
+    def _create_session_indexes(self) -> None:
+        with self.db_engine.begin() as conn:
+            for suffix, columns in SESSION_INDEXES:
+                conn.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS idx_{self.session_table_name}_{suffix} "
+                        f"ON {self.session_table_name} ({', '.join(columns)})"
+                    )
+                )
+
+    # ==========================================
+    # Write-behind session writes
+    # ==========================================
+
+    def upsert_session(
+        self, session: Session, deserialize: Optional[bool] = True
+    ) -> Optional[Union[Session, Dict[str, Any]]]:
+        """Queue a session write and return without touching the database"""
+        if self._closed:
+            return super().upsert_session(session, deserialize=deserialize)
+
+        row = _session_row(session)
+        now = int(time.time())
+        row["created_at"] = row["created_at"] or now
+        row["updated_at"] = now
+
+        with self._lock:
+            self.writes_requested += 1
+            if row["session_id"] in self._pending:
+                self.writes_coalesced += 1
+            self._pending[row["session_id"]] = row
+            backlog = len(self._pending)
+            self._cache(row)
+
+        if not self.write_behind:
+            self.flush()
+        elif backlog >= self.max_pending:
+            self._wake.set()
+        return session if deserialize else deserialize_session_json_fields(dict(row))
+
+    def upsert_sessions(
+        self,
+        sessions: List[Session],
+        deserialize: Optional[bool] = True,
+        preserve_updated_at: bool = False,
+    ) -> List[Union[Session, Dict[str, Any]]]:
+        self.flush()
+        self._uncache(*(session.session_id for session in sessions))
+        return super().upsert_sessions(sessions, deserialize=deserialize, preserve_updated_at=preserve_updated_at)
+
+    def _write_loop(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every buffered session in one transaction and return how many were written"""
+        # One writer at a time, so an older batch can never land after a newer one
+        with self._write_lock:
+            with self._lock:
+                rows, self._pending = list(self._pending.values()), {}
+            if not rows:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                table = self._get_table(table_type="sessions", create_table_if_not_found=True)
+                stmt = sqlite.insert(table)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["session_id"],
+                    set_={
+                        column: stmt.excluded[column]
+                        for column in SESSION_COLUMNS
+                        if column not in INSERT_ONLY_COLUMNS
+                    },
+                )
+                with self.db_engine.begin() as conn:
+                    conn.execute(stmt, rows)
+            except Exception as e:
+                print(f"Warning: session store flush failed, will retry: {e}")
+                self.failed_batches += 1
+                with self._lock:
+                    # Keep any newer version that was queued while writing
+                    for row in rows:
+                        self._pending.setdefault(row["session_id"], row)
+                return 0
+
+            self.batches += 1
+            self.rows_written += len(rows)
+            self.last_batch_ms = round((time.perf_counter() - start) * 1000, 2)
+            return len(rows)
+
+    def close(self) -> None:
+        """Stop the background writer and write anything still buffered"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
+
+    # ==========================================
+    # Reads that must see buffered writes
+    # ==========================================
+
+    def _cache(self, row: Dict[str, Any]) -> None:
+        # Callers hold self._lock. Rows hold JSON strings, so no reader can
+        # change them; each read deserializes its own session
+        if self.session_cache_size <= 0:
+            return
+        self._sessions[row["session_id"]] = row
+        self._sessions.move_to_end(row["session_id"])
+        while len(self._sessions) > self.session_cache_size:
+            self._sessions.popitem(last=False)
+
+    def _uncache(self, *session_ids: str) -> None:
+        with self._lock:
+            for session_id in session_ids:
+                self._pending.pop(session_id, None)
+                self._sessions.pop(session_id, None)
+
+    def get_session(
+        self,
+        session_id: str,
+        session_type: SessionType,
+        user_id: Optional[str] = None,
+        deserialize: Optional[bool] = True,
+    ) -> Optional[Union[Session, Dict[str, Any]]]:
+        with self._lock:
+            row = self._sessions.get(session_id)
+            if row is not None:
+                self._sessions.move_to_end(session_id)
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+                row = self._pending.get(session_id)
+
+        if row is None:
+            session = super().get_session(session_id, session_type, user_id=user_id, deserialize=deserialize)
+            if deserialize and session is not None:
+                with self._lock:
+                    self._cache(_session_row(session))
+            return session
+
+        if user_id is not None and row["user_id"] != user_id:
+            return None
+        session_raw = deserialize_session_json_fields(dict(row))
+        if not deserialize:
+            return session_raw
+        return SESSION_CLASSES[row["session_type"]].from_dict(session_raw)
+
+    def get_sessions(self, *args, **kwargs):
+        self.flush()
+        return super().get_sessions(*args, **kwargs)
+
+    def rename_session(self, session_id: str, *args, **kwargs):
+        self.flush()
+        self._uncache(session_id)
+        return super().rename_session(session_id, *args, **kwargs)
+
+    def delete_session(self, session_id: str) -> bool:
+        # Holding the write lock keeps a flush in progress from writing the
+        # session back after it was deleted
+        with self._write_lock:
+            self._uncache(session_id)
+            return super().delete_session(session_id)
+
+    def delete_sessions(self, session_ids: List[str]) -> None:
+        with self._write_lock:
+            self._uncache(*session_ids)
+            super().delete_sessions(session_ids)
+
+    def _get_all_sessions_for_metrics_calculation(self, *args, **kwargs):
+        self.flush()
+        return super()._get_all_sessions_for_metrics_calculation(*args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return write-behind counters and the current backlog"""
+        return {
+            "journal_mode": "wal",
+            "pool_size": self.pool_size,
+            "write_behind": self.write_behind,
+            "flush_interval_seconds": self.flush_interval_seconds,
+            "pending": len(self._pending),
+            "cached_sessions": len(self._sessions),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "writes_requested": self.writes_requested,
+            "writes_coalesced": self.writes_coalesced,
+            "rows_written": self.rows_written,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "last_batch_ms": self.last_batch_ms,
+        }
+
+
+def create_session_db(db_file: str, mode: str = "tuned", **kwargs) -> SqliteDb:
+    """Return the session database for a mode: "tuned" (TunedSqliteDb) or "plain" (Agno's SqliteDb)"""
+    if mode == "plain":
+        return SqliteDb(db_file=db_file)
+    return TunedSqliteDb(db_file=db_file, **kwargs)
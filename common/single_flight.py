@@ -0,0 +1,223 @@
+"""
+Single Flight - One agent run for identical questions asked at the same time
+
+The nightly demo_runner.py and the individual team crons send the same
+questions to /mcp at the same moment, and each request ran the Community
+Support Agent on its own. enable_single_flight() merges them: while a run
+for a question is in flight, identical questions for the same agent wait
+for that run instead of starting another, and all of them get its result.
+
+- Questions are keyed on the agent id plus the normalized text (case,
+  whitespace and punctuation ignored)
+- The shared run is always streamed into a buffer by its own task, so
+  streaming callers replay the events so far and then follow live, and
+  non-streaming callers get the final RunOutput. A caller that disconnects
+  never cancels the run for the others
+- Only stand-alone questions are merged: runs that continue a session with
+  earlier runs, or carry media or other run options, run on their own
+
+The run is stored once, in the session of the request that started it.
+Merged callers get a copy of its RunOutput marked with
+metadata["single_flight"].
+
+Usage:
+    flights = SingleFlight()
+    enable_single_flight(agent, flights)
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import replace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from agno.agent import Agent
+from agno.db.base import SessionType
+from agno.run.agent import RunOutput
+
+# Run options a merged request may set; anything else must be left unset
+MERGEABLE_OPTIONS = {"session_id", "user_id", "stream_events", "stream_intermediate_steps", "yield_run_output"}
+
+
+def normalize_question(text: str) -> str:
+    """Lowercase words only, so questions differing in case, spacing or punctuation match"""
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+class Flight:
+    """One in-flight run: the events it produced so far and its result"""
+
+    def __init__(self, key: Tuple[str, str, bool]):
+        self.key = key
+        self.events: List[Any] = []
+        self.run_output: Optional[RunOutput] = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.waiters = 1
+        self._changed = asyncio.Condition()
+        self.task: Optional[asyncio.Task] = None
+
+    async def run(self, stream: AsyncIterator[Any]) -> None:
+        try:
+            async for event in stream:
+                async with self._changed:
+                    if isinstance(event, RunOutput):
+                        self.run_output = event
+                    else:
+                        self.events.append(event)
+                    self._changed.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            async with self._changed:
+                self.done = True
+                self._changed.notify_all()
+
+    async def follow(self) -> AsyncIterator[Any]:
+        """Yield every event of the run, from the first one, until it is done"""
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.events) or self.done)
+                new_events = self.events[index:]
+                done = self.done
+            index += len(new_events)
+            for event in new_events:
+                yield event
+            if done and index >= len(self.events):
+                break
+        if self.error is not None:
+            raise self.error
+
+    async def result(self) -> RunOutput:
+        """Wait for the run to finish and return its RunOutput"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.done)
+        if self.error is not None:
+            raise self.error
+        if self.run_output is None:
+            raise RuntimeError("Coalesced run finished without a result")
+        return self.run_output
+
+
+class SingleFlight:
+    """Registry of in-flight runs keyed on agent and normalized question"""
+
+    def __init__(self):
+        self._flights: Dict[Tuple[str, str, bool], Flight] = {}
+
+        self.runs = 0
+        self.merged = 0
+        self.passthrough = 0
+        self.max_waiters = 0
+
+    def find(self, agent_id: str, question: str, events: Optional[bool]) -> Optional[Flight]:
+        """Return the in-flight run for a question; events=None accepts either kind of run"""
+        normalized = normalize_question(question)
+        for with_events in ((False, True) if events is None else (events,)):
+            flight = self._flights.get((agent_id, normalized, with_events))
+            if flight is not None:
+                return flight
+        return None
+
+    def start(self, agent_id: str, question: str, events: bool, stream: AsyncIterator[Any]) -> Flight:
+        """Start a shared run of a question in its own task"""
+        flight = Flight((agent_id, normalize_question(question), events))
+        self._flights[flight.key] = flight
+        self.runs += 1
+
+        async def run() -> None:
+            try:
+                await flight.run(stream)
+            finally:
+                self._flights.pop(flight.key, None)
+
+        flight.task = asyncio.get_running_loop().create_task(run())
+        return flight
+
+    def join(self, flight: Flight) -> Flight:
+        flight.waiters += 1
+        self.merged += 1
+        self.max_waiters = max(self.max_waiters, flight.waiters)
+        return flight
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how many requests shared a run"""
+        return {
+            "in_flight": len(self._flights),
+            "runs": self.runs,
+            "merged": self.merged,
+            "passthrough": self.passthrough,
+            "max_waiters": self.max_waiters,
+        }
+
+
+def enable_single_flight(agent: Agent, flights: SingleFlight) -> None:
+    """
+    Merge identical concurrent questions to an agent into one run.
+
+    Apply after enable_answer_cache, so a merged run is answered from the
+    cache when it can be and its answer is cached once.
+    """
+    original_arun = agent.arun
+
+    async def continues_session(session_id: Optional[str]) -> bool:
+        if session_id is None or agent.db is None:
+            return False
+        # The session store is synchronous; keep its read off the event loop
+        session = await asyncio.to_thread(agent.db.get_session, session_id=session_id, session_type=SessionType.AGENT)
+        return session is not None and bool(session.runs)
+
+    def shared_copy(run_output: RunOutput, flight: Flight, started: float) -> RunOutput:
+        metadata = {
+            **(run_output.metadata or {}),
+            "single_flight": {"merged": True, "waited_seconds": round(time.monotonic() - started, 3)},
+        }
+        return replace(run_output, metadata=metadata)
+
+    def start_or_join(question: str, stream: bool, kwargs: Dict[str, Any]) -> Tuple[Flight, bool]:
+        events = bool(kwargs.get("stream_events") or kwargs.get("stream_intermediate_steps"))
+        flight = flights.find(agent.id, question, events if stream else None)
+        if flight is not None:
+            flights.join(flight)
+            return flight, False
+        shared = {k: v for k, v in kwargs.items() if k in ("session_id", "user_id")}
+        # Agno leaves agent.stream on after a streamed run; the shared run is
+        # streamed even for non-streaming callers, so put the settings back
+        settings = (agent.stream, agent.stream_events)
+        shared_stream = original_arun(question, stream=True, stream_events=events, yield_run_output=True, **shared)
+        agent.stream, agent.stream_events = settings
+        return flights.start(agent.id, question, events, shared_stream), True
+
+    async def run(question: str, **kwargs) -> RunOutput:
+        if await continues_session(kwargs.get("session_id")):
+            flights.passthrough += 1
+            return await original_arun(question, stream=False, **kwargs)
+        started = time.monotonic()
+        flight, leader = start_or_join(question, False, kwargs)
+        run_output = await flight.result()
+        return run_output if leader else shared_copy(run_output, flight, started)
+
+    async def run_stream(question: str, **kwargs) -> AsyncIterator[Any]:
+        if await continues_session(kwargs.get("session_id")):
+            flights.passthrough += 1
+            async for event in original_arun(question, stream=True, **kwargs):
+                yield event
+            return
+        started = time.monotonic()
+        flight, leader = start_or_join(question, True, kwargs)
+        async for event in flight.follow():
+            yield event
+        if kwargs.get("yield_run_output") and flight.run_output is not None:
+            yield flight.run_output if leader else shared_copy(flight.run_output, flight, started)
+
+    def single_flight_arun(input: Any = None, *, stream: Optional[bool] = None, **kwargs):
+        stream = stream if stream is not None else agent.stream
+        unmergeable = any(v is not None for k, v in kwargs.items() if k not in MERGEABLE_OPTIONS)
+        if not isinstance(input, str) or unmergeable:
+            flights.passthrough += 1
+            return original_arun(input, stream=stream, **kwargs)
+        # Whether the run continues a session is checked in the run itself, off the event loop
+        return run_stream(input, **kwargs) if stream else run(input, **kwargs)
+
+    agent.arun = single_flight_arun
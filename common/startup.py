@@ -0,0 +1,112 @@
+"""
+Upstream Startup - Connect every upstream MCP server before serving traffic
+
+Without a startup phase the first request after boot pays for spawning
+the GitHub MCP subprocess (including `npx -y` package resolution), the MCP
+initialize handshake and list_tools for every upstream. UpstreamStartup
+does that work once, for all upstreams in parallel, from the FastAPI
+lifespan hook, and warms the session pools at the same time.
+
+Usage:
+    startup = UpstreamStartup(upstreams, pools)
+    agent_os = AgentOS(..., lifespan=startup.lifespan)
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from agno.tools.mcp import MCPTools
+
+from common.mcp_pool import ManagedConnection, MCPSessionPool
+from common.schema_cache import SchemaCache
+
+
+class UpstreamStartup:
+    """Connects upstreams in parallel at boot and reports readiness"""
+
+    def __init__(
+        self,
+        upstreams: Dict[str, MCPTools],
+        pools: Optional[Dict[str, MCPSessionPool]] = None,
+        timeout: float = 120.0,
+        schema_cache: Optional[SchemaCache] = None,
+        shutdown_hooks: Optional[List[Callable[[], Awaitable[Any]]]] = None,
+    ):
+        self.upstreams = upstreams
+        self.pools = pools or {}
+        self.timeout = timeout
+        self.schema_cache = schema_cache
+        # Run on shutdown before the upstreams close, e.g. to drain background work
+        self.shutdown_hooks = shutdown_hooks or []
+
+        self.connections: Dict[str, ManagedConnection] = {}
+        self.status: Dict[str, Dict[str, Any]] = {name: {"connected": False} for name in upstreams}
+        self.schemas: Dict[str, List[Dict[str, Any]]] = {}
+        self.ready = False
+        self.startup_seconds: Optional[float] = None
+
+    async def start(self) -> None:
+        """Connect all upstreams, prefetch their tool schemas and warm their pools"""
+        start = time.perf_counter()
+        await asyncio.gather(*(self._start_upstream(name, tools) for name, tools in self.upstreams.items()))
+        self.startup_seconds = time.perf_counter() - start
+        self.ready = all(status["connected"] for status in self.status.values())
+
+    async def _start_upstream(self, name: str, tools: MCPTools) -> None:
+        start = time.perf_counter()
+        connection = ManagedConnection(tools, self.schema_cache)
+        try:
+            await connection.open(timeout=self.timeout)
+        except Exception as e:
+            self.status[name] = {"connected": False, "error": str(e)}
+            print(f"Warning: {name} upstream failed to start: {e}")
+            return
+        self.connections[name] = connection
+
+        # list_tools already ran during connect; keep the schemas it returned
+        self.schemas[name] = [
+            {"name": function.name, "description": function.description, "parameters": function.parameters}
+            for function in tools.functions.values()
+        ]
+
+        pool = self.pools.get(name)
+        if pool is not None:
+            await pool.start()
+
+        self.status[name] = {
+            "connected": True,
+            "tools": len(self.schemas[name]),
+            "startup_seconds": round(time.perf_counter() - start, 3),
+        }
+
+    async def stop(self) -> None:
+        """Run the shutdown hooks, then close pooled sessions and upstream connections"""
+        self.ready = False
+        for hook in self.shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                print(f"Warning: shutdown hook failed: {e}")
+        await asyncio.gather(*(pool.close() for pool in self.pools.values()), return_exceptions=True)
+        await asyncio.gather(*(c.close() for c in self.connections.values()), return_exceptions=True)
+        self.connections = {}
+
+    def health(self) -> Dict[str, Any]:
+        """Readiness summary for the /health endpoint"""
+        return {
+            "status": "ok" if self.ready else "starting" if self.startup_seconds is None else "degraded",
+            "ready": self.ready,
+            "startup_seconds": round(self.startup_seconds, 3) if self.startup_seconds is not None else None,
+            "upstreams": self.status,
+        }
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """FastAPI lifespan: start upstreams before serving, close them on shutdown"""
+        await self.start()
+        try:
+            yield
+        finally:
+            await self.stop()
@@ -0,0 +1,182 @@
+"""
+Summary Worker - Session summaries off the request path
+
+With enable_session_summaries=True Agno makes a second model call at the
+end of every run, before the run is reported complete, so users wait for a
+summary they never see. BackgroundSummaryManager is a drop-in
+session_summary_manager that only queues the session; a worker summarizes
+it after the response has been sent:
+
+- debounce_seconds: a session is summarized once it has been quiet this
+  long, so a burst of runs costs one summary call instead of one per run
+- max_delay_seconds: a busy session is still summarized at least this often
+- max_concurrency: summary calls running at once across all sessions
+
+Runs keep using the latest finished summary in their context; the summary
+of the run that just completed is ready for the next run after the worker
+catches up. Sessions still queued at shutdown are summarized after their
+next run.
+
+Usage:
+    summaries = BackgroundSummaryManager(db=db, debounce_seconds=2.0)
+    agent = Agent(db=db, session_summary_manager=summaries, ...)
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+
+from agno.db.base import BaseDb, SessionType
+from agno.session import AgentSession, TeamSession
+from agno.session.summary import SessionSummary, SessionSummaryManager
+
+MAX_REMEMBERED_SUMMARIES = 1000
+
+
+class BackgroundSummaryManager(SessionSummaryManager):
+    """SessionSummaryManager that summarizes sessions in a debounced background worker"""
+
+    def __init__(
+        self,
+        db: BaseDb,
+        debounce_seconds: float = 2.0,
+        max_delay_seconds: float = 30.0,
+        max_concurrency: int = 2,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.db = db
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_concurrency = max_concurrency
+
+        # session_id -> (monotonic time it is due, first request time, session type)
+        self._due: Dict[str, Any] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Latest summaries by session, so runs that started before one was written keep it
+        self._latest: "OrderedDict[str, SessionSummary]" = OrderedDict()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._draining: Optional[asyncio.Event] = None
+
+        self.requested = 0
+        self.debounced = 0
+        self.completed = 0
+        self.failed = 0
+        self.last_summary_seconds: Optional[float] = None
+
+    # ==========================================
+    # Called by the agent at the end of a run
+    # ==========================================
+
+    def create_session_summary(self, session: Union[AgentSession, TeamSession]) -> Optional[SessionSummary]:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Synchronous runs outside an event loop have no worker to hand off to
+            return super().create_session_summary(session)
+        return self._schedule(session)
+
+    async def acreate_session_summary(self, session: Union[AgentSession, TeamSession]) -> Optional[SessionSummary]:
+        return self._schedule(session)
+
+    def _schedule(self, session: Union[AgentSession, TeamSession]) -> Optional[SessionSummary]:
+        session_id = session.session_id
+        session_type = SessionType.TEAM if isinstance(session, TeamSession) else SessionType.AGENT
+        now = time.monotonic()
+
+        self.requested += 1
+        if session_id in self._due:
+            self.debounced += 1
+            first_requested = self._due[session_id][1]
+        else:
+            first_requested = now
+        due = min(now + self.debounce_seconds, first_requested + self.max_delay_seconds)
+        self._due[session_id] = (due, first_requested, session_type)
+
+        if session_id not in self._tasks:
+            self._tasks[session_id] = asyncio.get_running_loop().create_task(self._run(session_id))
+
+        # The agent saves this session right after we return; keep the newest summary in it
+        latest = self._latest.get(session_id)
+        if latest is not None:
+            session.summary = latest
+        return session.summary
+
+    # ==========================================
+    # Worker
+    # ==========================================
+
+    async def _run(self, session_id: str) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._draining = asyncio.Event()
+        try:
+            # Loop again if the session was queued while its summary was being made
+            while session_id in self._due:
+                while (delay := self._due[session_id][0] - time.monotonic()) > 0:
+                    try:
+                        await asyncio.wait_for(self._draining.wait(), timeout=delay)
+                    except TimeoutError:
+                        pass
+                _, _, session_type = self._due.pop(session_id)
+                async with self._semaphore:
+                    await self._summarize(session_id, session_type)
+        finally:
+            self._tasks.pop(session_id, None)
+
+    async def _summarize(self, session_id: str, session_type: SessionType) -> None:
+        start = time.perf_counter()
+        try:
+            # Session reads and writes are synchronous SQLite calls: keep them off the event loop
+            session = await asyncio.to_thread(self.db.get_session, session_id=session_id, session_type=session_type)
+            if session is None:
+                return
+            summary = await super().acreate_session_summary(session)
+            if summary is None:
+                return
+
+            def save_summary() -> bool:
+                # Re-read right before writing so runs saved during the model call are kept
+                latest = self.db.get_session(session_id=session_id, session_type=session_type)
+                if latest is None:
+                    return False
+                latest.summary = summary
+                self.db.upsert_session(latest)
+                return True
+
+            if not await asyncio.to_thread(save_summary):
+                return
+            self._latest[session_id] = summary
+            self._latest.move_to_end(session_id)
+            if len(self._latest) > MAX_REMEMBERED_SUMMARIES:
+                self._latest.popitem(last=False)
+            self.completed += 1
+            self.last_summary_seconds = round(time.perf_counter() - start, 3)
+        except Exception as e:
+            self.failed += 1
+            print(f"Warning: session summary for {session_id} failed: {e}")
+
+    async def drain(self, timeout: float = 30.0) -> None:
+        """Summarize every queued session now, waiting at most `timeout` seconds"""
+        for session_id, (_, first_requested, session_type) in list(self._due.items()):
+            self._due[session_id] = (time.monotonic(), first_requested, session_type)
+        if self._draining is not None:
+            self._draining.set()
+        tasks = list(self._tasks.values())
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and summary counters"""
+        return {
+            "queued": len(self._due),
+            "running": sum(session_id not in self._due for session_id in self._tasks),
+            "requested": self.requested,
+            "debounced": self.debounced,
+            "completed": self.completed,
+            "failed": self.failed,
+            "last_summary_seconds": self.last_summary_seconds,
+            "debounce_seconds": self.debounce_seconds,
+            "max_concurrency": self.max_concurrency,
+        }
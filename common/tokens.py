@@ -0,0 +1,20 @@
+"""
+Tokens - Prompt size estimates shared by the context, compaction and routing code
+
+History budgets, tool result compaction metrics, tool routing stats and the
+fake model's usage all need a token count without calling a tokenizer on
+the request path. They share one estimate, so their numbers compare:
+
+- About four characters per token, the usual ratio for English text and
+  JSON with Claude's tokenizer
+- Never less than one token, so empty messages still cost something
+
+Usage:
+    from common.tokens import estimate_tokens
+    tokens = estimate_tokens(message.get_content_string())
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token"""
+    return max(1, len(text) // 4)
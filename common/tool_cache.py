@@ -0,0 +1,202 @@
+"""
+Tool Call Cache - Response cache for read-only MCP tool calls
+
+Caches MCP tool results keyed on the tool name plus normalized arguments.
+Entries expire after a TTL and the in-memory store evicts the least recently
+used entry once it is full. Every entry is written through to a SQLite file,
+so a restarted server starts warm and other processes can share hits.
+
+Usage with an Agno agent:
+    cache = ToolCallCache(db_file="tmp/tool_cache.db", ttl_seconds=3600)
+    agent = Agent(tools=[docs_mcp], tool_hooks=[create_cache_hook(cache, [docs_mcp])])
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agno.tools.function import ToolResult
+from agno.tools.mcp import MCPTools
+
+
+def normalize_arguments(arguments: Optional[Dict[str, Any]]) -> Any:
+    """Normalize tool arguments so equivalent calls share a cache key"""
+
+    def _normalize(value: Any) -> Any:
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, dict):
+            return {k: _normalize(v) for k, v in sorted(value.items()) if v is not None}
+        if isinstance(value, (list, tuple)):
+            return [_normalize(v) for v in value]
+        return value
+
+    return _normalize(arguments or {})
+
+
+def make_cache_key(tool_name: str, arguments: Optional[Dict[str, Any]]) -> str:
+    """Build a stable cache key from a tool name and its arguments"""
+    payload = json.dumps(
+        {"tool": tool_name, "args": normalize_arguments(arguments)},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ToolCallCache:
+    """TTL + LRU cache for tool results, persisted to SQLite"""
+
+    def __init__(
+        self,
+        db_file: Optional[str] = "tmp/tool_cache.db",
+        ttl_seconds: float = 3600,
+        max_entries: int = 1000,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # key -> (created_at, content), ordered from least to most recently used
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_file:
+            Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_cache ("
+                "key TEXT PRIMARY KEY, tool TEXT, created_at REAL, content TEXT)"
+            )
+            self._load()
+
+    def _load(self) -> None:
+        """Warm the in-memory store from disk, newest entries last"""
+        cutoff = time.time() - self.ttl_seconds
+        self._conn.execute("DELETE FROM tool_cache WHERE created_at < ?", (cutoff,))
+        rows = self._conn.execute(
+            "SELECT key, created_at, content FROM tool_cache ORDER BY created_at DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        for key, created_at, content in reversed(rows):
+            self._entries[key] = (created_at, content)
+
+    def _is_fresh(self, created_at: float) -> bool:
+        return time.time() - created_at < self.ttl_seconds
+
+    def get(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Return the cached result for a tool call, or None on a miss"""
+        key = make_cache_key(tool_name, arguments)
+        with self._lock:
+            entry = self._entries.get(key)
+
+            # Another worker may have cached this call since we loaded
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT created_at, content FROM tool_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1])
+                    self._store(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if not self._is_fresh(entry[0]):
+                self._entries.pop(key, None)
+                self._delete(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, tool_name: str, arguments: Optional[Dict[str, Any]], content: str) -> None:
+        """Cache the result of a tool call"""
+        key = make_cache_key(tool_name, arguments)
+        created_at = time.time()
+        with self._lock:
+            self._store(key, (created_at, content))
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tool_cache (key, tool, created_at, content) VALUES (?, ?, ?, ?)",
+                    (key, tool_name, created_at, content),
+                )
+
+    def _store(self, key: str, entry: Tuple[float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._delete(evicted_key)
+            self.evictions += 1
+
+    def _delete(self, key: str) -> None:
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM tool_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Drop every cached entry, in memory and on disk"""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM tool_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def _is_error_result(content: str) -> bool:
+    # Agno's MCP entrypoint reports failures as plain "Error..." strings
+    return content.startswith("Error")
+
+
+def create_cache_hook(cache: ToolCallCache, toolkits: List[MCPTools]) -> Callable:
+    """
+    Create an Agno tool hook that serves cached results for the given toolkits.
+
+    Tools are looked up lazily because MCPTools only registers its functions
+    once connected. Calls to tools outside these toolkits pass straight through.
+    """
+
+    async def cache_hook(function_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Any:
+        if not any(function_name in toolkit.functions for toolkit in toolkits):
+            return await function_call(**arguments)
+
+        cached = cache.get(function_name, arguments)
+        if cached is not None:
+            return ToolResult(content=cached)
+
+        result = await function_call(**arguments)
+        content = result.content if isinstance(result, ToolResult) else result
+        if isinstance(content, str) and not _is_error_result(content):
+            cache.put(function_name, arguments, content)
+        return result
+
+    return cache_hook
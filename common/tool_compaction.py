@@ -0,0 +1,377 @@
+"""
+Tool Result Compaction - Smaller MCP tool results before they reach the model
+
+GitHub MCP results (issue lists with full bodies, nested user and label
+objects, a dozen API URLs per issue) used to go into the context verbatim,
+and with add_history_to_context they were paid for again on every later
+turn. ToolResultCompactor post-processes every upstream result with a
+per-upstream CompactionPolicy:
+
+- Projection: JSON results drop fields the agent never reads (API URLs,
+  node ids, reactions, ...) and empty values, and collapse GitHub user
+  objects to their login and label objects to their name. Rows that only
+  carry a login (the mirror's contributor rows) are kept whole
+- Truncation: long strings such as issue bodies are cut to max_string_chars
+  and lists to max_items. A JSON result still over max_chars gets shorter
+  strings, fewer list items and then fewer fields per object until it fits,
+  so it always stays valid JSON; plain text is cut at max_chars
+- Deduplication: repeated list items and repeated text paragraphs are kept once
+- Out of band: the full payload of every compacted result is stored in SQLite
+  under a handle that is named in the compacted result; the agent's
+  get_full_tool_result tool pages through it when the summary is not enough
+
+Small results and errors pass through untouched. Raw and compacted bytes
+and tokens are counted per upstream, in stats() and in the
+mcp_tool_result_* counters of RunMetrics.
+
+Usage with an Agno agent:
+    compactor = ToolResultCompactor(db_file="tmp/tool_results.db")
+    agent = Agent(
+        tools=[github_mcp, create_full_result_tool(compactor)],
+        tool_hooks=[create_compaction_hook(compactor, {"github": github_mcp})],
+    )
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set
+
+from agno.tools.function import ToolResult
+from agno.tools.mcp import MCPTools
+
+from common.tokens import estimate_tokens
+
+# Fields of GitHub API objects that cost tokens without helping an answer
+NOISE_FIELDS = frozenset({
+    "node_id", "gravatar_id", "site_admin", "user_view_type", "reactions", "performed_via_github_app",
+    "active_lock_reason", "locked", "sub_issues_summary", "issue_dependencies_summary",
+    "permissions", "_links", "score", "text_matches",
+})
+# GitHub API URLs; html_url is the one link worth showing a user
+KEPT_URL_FIELDS = frozenset({"html_url"})
+API_URL_PREFIX = "https://api.github.com/"
+# Fields every GitHub user object has; a dict with a login alone is a data row
+USER_FIELDS = frozenset({"avatar_url", "gravatar_id", "site_admin", "user_view_type"})
+# JSON results over max_chars: strings are shortened down to this, then lists
+# down to one item, then objects from FIRST_MAX_FIELDS fields down to one
+MIN_STRING_CHARS = 120
+FIRST_MAX_FIELDS = 16
+# A compacted result must be at most this share of the raw one to be used
+MAX_KEPT_RATIO = 0.9
+TRAILER_CHARS = 160
+
+
+@dataclass(frozen=True)
+class CompactionPolicy:
+    """How far results of one upstream are compacted"""
+
+    max_chars: int = 12000
+    max_string_chars: int = 600
+    max_items: int = 30
+    min_chars: int = 1024
+    drop_fields: FrozenSet[str] = field(default=NOISE_FIELDS)
+
+
+def default_policies(base: CompactionPolicy) -> Dict[str, CompactionPolicy]:
+    """Per-upstream policies derived from base: docs text is the answer itself, so it keeps longer strings"""
+    docs = replace(base, max_string_chars=max(base.max_string_chars, 2000), max_items=min(base.max_items, 10))
+    return {"phoenix_docs": docs, "phoenix_docs_local": docs}
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _dedupe_paragraphs(text: str) -> str:
+    seen: Set[str] = set()
+    paragraphs = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        key = " ".join(paragraph.split())
+        if key and key in seen:
+            continue
+        seen.add(key)
+        paragraphs.append(paragraph)
+    return "\n\n".join(paragraphs)
+
+
+class _Compaction:
+    """One pass over a result, remembering what was cut"""
+
+    def __init__(self, policy: CompactionPolicy, max_fields: Optional[int] = None):
+        self.policy = policy
+        self.max_fields = max_fields
+        self.reasons: Set[str] = set()
+
+    def value(self, value: Any, depth: int = 0) -> Any:
+        if isinstance(value, dict):
+            return self.mapping(value, depth)
+        if isinstance(value, list):
+            return self.sequence(value, depth)
+        if isinstance(value, str):
+            return self.string(value)
+        return value
+
+    def mapping(self, value: Dict[str, Any], depth: int) -> Any:
+        if depth > 0 and isinstance(value.get("login"), str) and not USER_FIELDS.isdisjoint(value):
+            # A GitHub user, owner or assignee
+            self.reasons.add("fields projected")
+            return value["login"]
+        if depth > 0 and isinstance(value.get("name"), str) and "color" in value:
+            # A GitHub label
+            self.reasons.add("fields projected")
+            return value["name"]
+
+        compacted = {}
+        for key, item in value.items():
+            if (
+                key in self.policy.drop_fields
+                or (key.endswith("_url") and key not in KEPT_URL_FIELDS)
+                or (isinstance(item, str) and item.startswith(API_URL_PREFIX))
+            ):
+                self.reasons.add("fields projected")
+                continue
+            item = self.value(item, depth + 1)
+            if not _is_empty(item):
+                compacted[key] = item
+        if self.max_fields is not None and len(compacted) > self.max_fields:
+            self.reasons.add("fields truncated")
+            kept = dict(list(compacted.items())[: self.max_fields])
+            kept["..."] = f"{len(compacted) - self.max_fields} more fields"
+            return kept
+        return compacted
+
+    def sequence(self, value: List[Any], depth: int) -> List[Any]:
+        items = []
+        seen: Set[str] = set()
+        for item in value:
+            item = self.value(item, depth + 1)
+            key = json.dumps(item, sort_keys=True, default=str)
+            if key in seen:
+                self.reasons.add("duplicates removed")
+                continue
+            seen.add(key)
+            items.append(item)
+        if len(items) > self.policy.max_items:
+            self.reasons.add("list truncated")
+            items = items[: self.policy.max_items] + [f"... {len(items) - self.policy.max_items} more items"]
+        return items
+
+    def string(self, value: str) -> str:
+        limit = self.policy.max_string_chars
+        if "\n\n" in value and len(value) > limit:
+            value = _dedupe_paragraphs(value)
+        if len(value) <= limit:
+            return value
+        self.reasons.add("text truncated")
+        return value[:limit] + f"... [{len(value) - limit} more characters]"
+
+    def text(self, text: str) -> str:
+        """Compact a whole result that is not JSON"""
+        deduped = _dedupe_paragraphs(text)
+        if len(deduped) < len(text):
+            self.reasons.add("duplicates removed")
+        return deduped
+
+
+class ToolResultCompactor:
+    """Compacts MCP tool results per upstream and keeps the full payloads retrievable by handle"""
+
+    def __init__(
+        self,
+        db_file: str = "tmp/tool_results.db",
+        ttl_seconds: float = 86400,
+        default_policy: CompactionPolicy = CompactionPolicy(),
+        policies: Optional[Dict[str, CompactionPolicy]] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.default_policy = default_policy
+        self.policies = policies if policies is not None else default_policies(default_policy)
+
+        # upstream -> counters
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self.expansions = 0
+        self.missing_handles = 0
+
+        # Shared by every worker, so a handle from one resolves in all of them
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_results ("
+            "handle TEXT PRIMARY KEY, upstream TEXT, tool TEXT, created_at REAL, content TEXT)"
+        )
+        self._conn.execute("DELETE FROM tool_results WHERE created_at < ?", (time.time() - ttl_seconds,))
+
+    def policy_for(self, upstream: str) -> CompactionPolicy:
+        return self.policies.get(upstream, self.default_policy)
+
+    def compact(self, upstream: str, tool: str, content: str) -> str:
+        """Return the compacted result, or content itself when it is small or would not shrink"""
+        policy = self.policy_for(upstream)
+        compacted = content
+        if len(content) >= policy.min_chars and not content.startswith("Error"):
+            compacted = self._compact(upstream, tool, content, policy)
+        self._record(upstream, content, compacted)
+        return compacted
+
+    def _compact(self, upstream: str, tool: str, content: str, policy: CompactionPolicy) -> str:
+        try:
+            parsed = json.loads(content)
+        except ValueError:
+            parsed = None
+
+        if isinstance(parsed, (dict, list)):
+            # Shrink the structure, never the serialized text, so the result stays valid JSON
+            string_limit, max_items, max_fields = policy.max_string_chars, policy.max_items, None
+            while True:
+                compaction = _Compaction(replace(policy, max_string_chars=string_limit, max_items=max_items), max_fields)
+                text = json.dumps(compaction.value(parsed), ensure_ascii=False, separators=(",", ":"))
+                if len(text) <= policy.max_chars:
+                    break
+                if string_limit > MIN_STRING_CHARS:
+                    string_limit = max(MIN_STRING_CHARS, string_limit // 2)
+                elif max_items > 1:
+                    max_items = max(1, max_items * 2 // 3)
+                elif max_fields is None or max_fields > 1:
+                    max_fields = FIRST_MAX_FIELDS if max_fields is None else max_fields // 2
+                else:
+                    # Deeply nested beyond any summary: point at the full result only
+                    compaction.reasons.add("result omitted")
+                    text = json.dumps({"omitted": f"{len(content)} characters of JSON, too large to summarize"})
+                    break
+        else:
+            compaction = _Compaction(policy)
+            text = compaction.text(content)
+            if len(text) > policy.max_chars:
+                compaction.reasons.add("result truncated")
+                text = text[: policy.max_chars] + "..."
+
+        # Not worth a handle and a retrieval round trip for a few percent
+        if len(text) + TRAILER_CHARS > len(content) * MAX_KEPT_RATIO:
+            return content
+        handle = self._store(upstream, tool, content)
+        return (
+            f"{text}\n[Compacted from {len(content)} to {len(text)} characters ({', '.join(sorted(compaction.reasons))}). "
+            f'Full result: get_full_tool_result(handle="{handle}")]'
+        )
+
+    def _store(self, upstream: str, tool: str, content: str) -> str:
+        handle = "tr_" + hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tool_results (handle, upstream, tool, created_at, content) VALUES (?, ?, ?, ?, ?)",
+            (handle, upstream, tool, time.time(), content),
+        )
+        with self._lock:
+            self._counters(upstream)["stored"] += 1
+        return handle
+
+    def get(self, handle: str) -> Optional[str]:
+        """Return the full payload stored under handle, or None once it expired"""
+        row = self._conn.execute(
+            "SELECT content FROM tool_results WHERE handle = ? AND created_at >= ?",
+            (handle, time.time() - self.ttl_seconds),
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.missing_handles += 1
+            else:
+                self.expansions += 1
+        return row[0] if row else None
+
+    def _counters(self, upstream: str) -> Dict[str, int]:
+        return self._stats.setdefault(upstream, {
+            "results": 0, "compacted": 0, "stored": 0,
+            "raw_bytes": 0, "compacted_bytes": 0, "raw_tokens": 0, "compacted_tokens": 0,
+        })
+
+    def _record(self, upstream: str, raw: str, compacted: str) -> None:
+        with self._lock:
+            counters = self._counters(upstream)
+            counters["results"] += 1
+            counters["compacted"] += compacted is not raw
+            counters["raw_bytes"] += len(raw.encode("utf-8"))
+            counters["compacted_bytes"] += len(compacted.encode("utf-8"))
+            counters["raw_tokens"] += estimate_tokens(raw)
+            counters["compacted_tokens"] += estimate_tokens(compacted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-upstream byte and token reductions and handle usage"""
+        with self._lock:
+            upstreams = {name: dict(counters) for name, counters in self._stats.items()}
+        for counters in upstreams.values():
+            raw = counters["raw_bytes"]
+            counters["bytes_saved_ratio"] = round(1 - counters["compacted_bytes"] / raw, 4) if raw else 0.0
+        return {
+            "upstreams": upstreams,
+            "expansions": self.expansions,
+            "missing_handles": self.missing_handles,
+            "ttl_seconds": self.ttl_seconds,
+            "default_policy": {
+                "max_chars": self.default_policy.max_chars,
+                "max_string_chars": self.default_policy.max_string_chars,
+                "max_items": self.default_policy.max_items,
+            },
+        }
+
+
+def create_full_result_tool(compactor: ToolResultCompactor, max_limit: int = 20000) -> Callable:
+    """Create the agent tool that reads full tool results back by handle"""
+
+    def get_full_tool_result(handle: str, offset: int = 0, limit: int = 8000) -> str:
+        """Read the full, uncompacted result of an earlier tool call by the handle named in its compacted result. Long results are returned in pages: pass offset to continue where the previous page ended"""
+        content = compactor.get(handle)
+        if content is None:
+            return f"Error: no stored tool result for handle {handle} (unknown or expired)"
+        offset = max(offset, 0)
+        end = min(offset + max(1, min(limit, max_limit)), len(content))
+        page = content[offset:end]
+        if offset == 0 and end == len(content):
+            return page
+        more = f"; continue with offset={end}" if end < len(content) else ""
+        return f"[characters {offset}-{end} of {len(content)}{more}]\n{page}"
+
+    return get_full_tool_result
+
+
+def create_compaction_hook(
+    compactor: ToolResultCompactor, upstreams: Dict[str, MCPTools], metrics: Optional[Any] = None
+) -> Callable:
+    """
+    Create an Agno tool hook that compacts results of the given upstreams.
+
+    Place it right after the metrics hook, so cached results are compacted
+    too and the cache keeps full payloads. With metrics (a RunMetrics), raw
+    and compacted sizes feed its mcp_tool_result_* counters.
+    """
+
+    def upstream_of(function_name: str) -> Optional[str]:
+        for name, toolkit in upstreams.items():
+            if function_name in toolkit.functions:
+                return name
+        return None
+
+    async def compaction_hook(function_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Any:
+        result = await function_call(**arguments)
+        upstream = upstream_of(function_name)
+        content = result.content if isinstance(result, ToolResult) else result
+        if upstream is None or not isinstance(content, str):
+            return result
+
+        compacted = compactor.compact(upstream, function_name, content)
+        if metrics is not None:
+            for stage, text in (("raw", content), ("compacted", compacted)):
+                metrics.tool_result_bytes.inc(len(text.encode("utf-8")), (upstream, stage))
+                metrics.tool_result_tokens.inc(estimate_tokens(text), (upstream, stage))
+        if compacted is content:
+            return result
+        return result.model_copy(update={"content": compacted}) if isinstance(result, ToolResult) else compacted
+
+    return compaction_hook
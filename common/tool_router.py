@@ -0,0 +1,240 @@
+"""
+Tool Router - A per-request subset of the upstream tool catalog
+
+Every model call used to carry the schema of every tool of every upstream:
+the GitHub MCP server alone has dozens, and a docs question paid for all
+of them in prompt tokens and time to first token. ToolRouter picks the
+tools a request needs from the schemas the agent already loaded (from the
+tool schema cache, at no extra upstream call):
+
+- Each tool's name, description and parameter names are embedded once with
+  the hashed n-gram vectorizer of the answer cache, and re-embedded only
+  when an upstream's catalog changes
+- The user message is embedded per request and scored against every tool
+- Upstreams whose best tool scores within upstream_ratio of the overall best
+  are kept, each with all of its tools
+- Upstreams the previous run of the session called a tool of are kept, so
+  follow-up questions can use them again
+- Tools outside the routed upstreams (get_full_tool_result, Agno's own
+  tools) are always kept
+
+When no tool scores min_score (a follow-up like "and the second one?", or a
+question in unexpected words) the request falls back to the full catalog.
+
+Keeping upstreams whole means a request is offered one of a few fixed tool
+lists, one per combination of upstreams, so the tools prefix that
+PromptCachingClaude marks for Anthropic's prompt cache repeats and keeps
+hitting. With top_k > 0, upstreams of more than small_upstream tools only
+contribute their top_k best tools instead: prompts get smaller, but nearly
+every question gets a tools prefix of its own and misses the prompt cache.
+stats() reports how often a request's tool list repeated an earlier one.
+
+Enabling routing fails at startup if the installed Agno has no
+Agent._determine_tools_for_model (written against agno 2.2).
+
+Usage:
+    router = ToolRouter()
+    agent = Agent(tools=[docs_mcp, github_mcp], ...)
+    enable_tool_routing(agent, router, {"phoenix_docs": docs_mcp, "github": github_mcp})
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from importlib.metadata import version
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from agno.agent import Agent
+from agno.run.agent import RunOutput
+from agno.session import AgentSession
+from agno.tools.function import Function
+from agno.tools.mcp import MCPTools
+
+from common.answer_cache import HashedNgramVectorizer
+from common.tokens import estimate_tokens
+
+
+def tool_text(function: Function) -> str:
+    """The text a tool is matched on: its name twice (it is the densest signal), description and parameter names"""
+    name = function.name.lstrip("_").replace("_", " ")
+    parameters = " ".join((function.parameters or {}).get("properties", {}))
+    return f"{name}. {name}. {function.description or ''} {parameters.replace('_', ' ')}"
+
+
+def schema_tokens(functions: List[Any]) -> int:
+    """Estimated prompt tokens of the tool definitions sent to the model"""
+    total = 0
+    for function in functions:
+        if isinstance(function, Function):
+            total += estimate_tokens(f"{function.name}{function.description or ''}{function.parameters}")
+        else:
+            total += estimate_tokens(str(function))
+    return total
+
+
+class ToolRouter:
+    """Scores tools against the user message and keeps the relevant subset per request"""
+
+    def __init__(
+        self,
+        top_k: int = 0,
+        min_score: float = 0.15,
+        upstream_ratio: float = 0.6,
+        small_upstream: int = 6,
+        dim: int = 4096,
+    ):
+        self.top_k = top_k
+        self.min_score = min_score
+        self.upstream_ratio = upstream_ratio
+        self.small_upstream = small_upstream
+        self.vectorizer = HashedNgramVectorizer(dim)
+
+        # tool text -> vector, so only new or changed tools are embedded
+        self._vectors: Dict[str, np.ndarray] = {}
+        # Digests of recently offered tool lists, to count prompt cache friendly repeats
+        self._tool_lists: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.fallbacks = 0
+        self.tools_offered = 0
+        self.tools_available = 0
+        self.tokens_offered = 0
+        self.tokens_available = 0
+        self.route_seconds = 0.0
+        self.repeated_tool_lists = 0
+
+    def _matrix(self, functions: List[Function]) -> np.ndarray:
+        texts = [tool_text(f) for f in functions]
+        with self._lock:
+            for text in texts:
+                if text not in self._vectors:
+                    self._vectors[text] = self.vectorizer.transform(text)
+            return np.stack([self._vectors[text] for text in texts])
+
+    def select(
+        self, query: str, candidates: Dict[str, List[Function]], keep: Optional[Set[str]] = None
+    ) -> Optional[Set[str]]:
+        """Names of the tools to offer for query, or None to offer the full catalog"""
+        functions = [f for group in candidates.values() for f in group]
+        if not query.strip() or not functions:
+            return None
+        scores = self._matrix(functions) @ self.vectorizer.transform(query)
+        best = float(scores.max())
+        if best < self.min_score:
+            return None
+
+        keep = keep or set()
+        selected: Set[str] = set()
+        offset = 0
+        for group in candidates.values():
+            group_scores = scores[offset:offset + len(group)]
+            offset += len(group)
+            if not group:
+                continue
+            relevant = float(group_scores.max()) >= best * self.upstream_ratio
+            if self.top_k <= 0 or len(group) <= self.small_upstream:
+                if relevant or any(f.name in keep for f in group):
+                    selected.update(f.name for f in group)
+                continue
+            selected.update(f.name for f in group if f.name in keep)
+            if relevant:
+                selected.update(group[i].name for i in np.argsort(-group_scores)[: self.top_k])
+        return selected
+
+    def route(
+        self, query: str, functions: List[Any], upstreams: Dict[str, MCPTools], keep: Optional[Set[str]] = None
+    ) -> Tuple[List[Any], bool]:
+        """Filter the functions prepared for the model; returns them and whether the full catalog was kept"""
+        start = time.perf_counter()
+        candidates: Dict[str, List[Function]] = {name: [] for name in upstreams}
+        for function in functions:
+            if not isinstance(function, Function):
+                continue
+            for name, toolkit in upstreams.items():
+                if function.name in toolkit.functions:
+                    candidates[name].append(function)
+                    break
+        routed = {f.name for group in candidates.values() for f in group}
+
+        selected = self.select(query, candidates, keep)
+        offered = functions if selected is None else [
+            f for f in functions if not isinstance(f, Function) or f.name not in routed or f.name in selected
+        ]
+        names = sorted(f.name if isinstance(f, Function) else str(f) for f in offered)
+        digest = hashlib.sha256("\n".join(names).encode("utf-8")).hexdigest()
+
+        with self._lock:
+            self.repeated_tool_lists += digest in self._tool_lists
+            self._tool_lists[digest] = None
+            self._tool_lists.move_to_end(digest)
+            while len(self._tool_lists) > 1024:
+                self._tool_lists.popitem(last=False)
+            self.requests += 1
+            self.fallbacks += selected is None
+            self.tools_offered += len(offered)
+            self.tools_available += len(functions)
+            self.tokens_offered += schema_tokens(offered)
+            self.tokens_available += schema_tokens(functions)
+            self.route_seconds += time.perf_counter() - start
+        return offered, selected is None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return how much of the catalog requests were offered and how often they fell back"""
+        requests = self.requests
+        return {
+            "requests": requests,
+            "fallbacks": self.fallbacks,
+            "fallback_rate": round(self.fallbacks / requests, 4) if requests else 0.0,
+            "avg_tools_offered": round(self.tools_offered / requests, 1) if requests else 0.0,
+            "avg_tools_available": round(self.tools_available / requests, 1) if requests else 0.0,
+            "avg_schema_tokens_offered": round(self.tokens_offered / requests) if requests else 0,
+            "avg_schema_tokens_available": round(self.tokens_available / requests) if requests else 0,
+            "schema_tokens_saved_ratio": (
+                round(1 - self.tokens_offered / self.tokens_available, 4) if self.tokens_available else 0.0
+            ),
+            "avg_route_ms": round(self.route_seconds * 1000 / requests, 3) if requests else 0.0,
+            # A repeated tool list is a tools prefix the prompt cache has seen before
+            "tool_list_repeat_rate": round(self.repeated_tool_lists / requests, 4) if requests else 0.0,
+            "distinct_tool_lists": len(self._tool_lists),
+            "top_k": self.top_k,
+            "min_score": self.min_score,
+        }
+
+
+def _previous_tools(session: AgentSession, run_id: str) -> Set[str]:
+    """Tools called by the session's last run before this one"""
+    earlier = [run for run in session.runs or [] if run.run_id != run_id]
+    last = earlier[-1] if earlier else None
+    return {t.tool_name for t in (getattr(last, "tools", None) or []) if t.tool_name}
+
+
+def enable_tool_routing(agent: Agent, router: ToolRouter, upstreams: Dict[str, MCPTools]) -> None:
+    """
+    Offer an agent's model only the tools of upstreams that the router picks for each run.
+
+    Wraps the step that turns the agent's toolkits into the functions sent to
+    the model, so the run can only call the offered tools. The selection is
+    added to the run metadata under "tool_routing". Raises RuntimeError if
+    the installed Agno has no such step to wrap.
+    """
+    if not callable(getattr(agent, "_determine_tools_for_model", None)):
+        raise RuntimeError(
+            f"Tool routing needs Agent._determine_tools_for_model, which agno {version('agno')} does not have "
+            "(written against agno 2.2). Set TOOL_ROUTING_ENABLED=false or install agno 2.2."
+        )
+    original_determine_tools = agent._determine_tools_for_model
+
+    def determine_tools_for_model(*, run_response: RunOutput, session: AgentSession, **kwargs):
+        functions = original_determine_tools(run_response=run_response, session=session, **kwargs)
+        query = run_response.input.input_content_string() if run_response.input is not None else ""
+        offered, fallback = router.route(query, functions, upstreams, _previous_tools(session, run_response.run_id))
+        routing: Dict[str, Any] = {"offered": len(offered), "available": len(functions), "fallback": fallback}
+        if not fallback:
+            routing["tools"] = [f.name if isinstance(f, Function) else str(f) for f in offered]
+        run_response.metadata = {**(run_response.metadata or {}), "tool_routing": routing}
+        return offered
+
+    agent._determine_tools_for_model = determine_tools_for_model
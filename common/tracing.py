@@ -0,0 +1,273 @@
+"""
+Tracing Export - Sampled, bounded, non-blocking span export for OpenTelemetry
+
+Arize's register() exports every span of every run. Under load that is a
+lot of spans, and when the collector is slow or unreachable the export
+backs up. SampledBatchProcessor keeps all of that off the request path:
+
+- Head-based sampling: sample_ratio of the traces, chosen by trace id, are
+  exported as their spans end
+- The other traces are held until their root span ends and kept anyway if
+  the run was slow (slow_seconds) or any of its spans errored, so the runs
+  worth looking at are never sampled away. At most max_pending_traces traces
+  of at most max_spans_per_trace spans each are held
+- Kept spans go into a bounded queue that a background thread exports in
+  batches. on_end() never waits: when the queue is full, or the collector is
+  down and the queue cannot drain, spans are dropped and counted instead of
+  piling up in memory or slowing down requests
+
+JsonLinesSpanExporter writes spans to a local file, one JSON object per
+line, as a stand-in for a collector when testing; delay_seconds simulates a
+slow one.
+
+Usage:
+    processor = SampledBatchProcessor(OTLPSpanExporter(endpoint=...), sample_ratio=0.1, slow_seconds=10)
+    tracer_provider = create_tracer_provider(processor, project_name="mcp-meetup-demo")
+    AgnoInstrumentor().instrument(tracer_provider=tracer_provider)
+    print(processor.stats())
+"""
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from opentelemetry.trace import StatusCode
+
+# Trace ids are random 128-bit numbers; the low 64 bits decide head sampling,
+# as in OpenTelemetry's TraceIdRatioBased sampler
+TRACE_ID_MASK = (1 << 64) - 1
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Writes spans to a file as JSON lines, a local stand-in for an OTLP collector"""
+
+    def __init__(self, path: str, delay_seconds: float = 0.0):
+        self.path = path
+        self.delay_seconds = delay_seconds
+        self.exported = 0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        if self.delay_seconds:
+            time.sleep(self.delay_seconds)
+        try:
+            with open(self.path, "a") as f:
+                for span in spans:
+                    f.write(json.dumps(json.loads(span.to_json())) + "\n")
+        except OSError as e:
+            print(f"Warning: could not write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        self.exported += len(spans)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+class PendingTrace:
+    """Spans of a trace that was not head-sampled, held until its root span ends"""
+
+    def __init__(self):
+        self.spans: List[ReadableSpan] = []
+        self.error = False
+
+
+class SampledBatchProcessor(SpanProcessor):
+    """Head sampling plus slow and errored runs, exported in batches from a bounded queue"""
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        sample_ratio: float = 1.0,
+        slow_seconds: float = 10.0,
+        max_queue_size: int = 2048,
+        max_export_batch_size: int = 256,
+        schedule_delay_seconds: float = 2.0,
+        max_pending_traces: int = 512,
+        max_spans_per_trace: int = 256,
+    ):
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+        self.slow_seconds = slow_seconds
+        self.max_queue_size = max_queue_size
+        self.max_export_batch_size = max_export_batch_size
+        self.schedule_delay_seconds = schedule_delay_seconds
+        self.max_pending_traces = max_pending_traces
+        self.max_spans_per_trace = max_spans_per_trace
+
+        self._sample_bound = round(sample_ratio * (TRACE_ID_MASK + 1))
+        # trace_id -> spans of unsampled traces, oldest first
+        self._pending: "OrderedDict[int, PendingTrace]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Spans count as unfinished tasks from put() until their batch was exported
+        self._queue: "queue.Queue[ReadableSpan]" = queue.Queue(maxsize=max_queue_size)
+        self._stopped = threading.Event()
+
+        self.traces_sampled = 0
+        self.traces_kept_slow = 0
+        self.traces_kept_error = 0
+        self.traces_discarded = 0
+        self.spans_exported = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.last_export_ms: Optional[float] = None
+        self.dropped: Dict[str, int] = {}
+
+        self._worker = threading.Thread(target=self._export_loop, name="span-exporter", daemon=True)
+        self._worker.start()
+
+    # ==========================================
+    # Sampling (on the request path: never blocks)
+    # ==========================================
+
+    def _drop(self, reason: str, count: int = 1) -> None:
+        self.dropped[reason] = self.dropped.get(reason, 0) + count
+
+    def _enqueue(self, spans: Sequence[ReadableSpan]) -> None:
+        for index, span in enumerate(spans):
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self._drop("queue_full", len(spans) - index)
+                return
+
+    def head_sampled(self, trace_id: int) -> bool:
+        return (trace_id & TRACE_ID_MASK) < self._sample_bound
+
+    def on_start(self, span, parent_context=None) -> None:
+        pass
+
+    def on_end(self, span: ReadableSpan) -> None:
+        if self._stopped.is_set() or span.context is None:
+            return
+        trace_id = span.context.trace_id
+        if self.head_sampled(trace_id):
+            if span.parent is None:
+                self.traces_sampled += 1
+            self._enqueue([span])
+            return
+
+        is_root = span.parent is None or span.parent.is_remote
+        with self._lock:
+            trace = self._pending.get(trace_id)
+            if trace is None:
+                if len(self._pending) >= self.max_pending_traces:
+                    _, evicted = self._pending.popitem(last=False)
+                    self._drop("pending_full", len(evicted.spans))
+                trace = self._pending[trace_id] = PendingTrace()
+            if len(trace.spans) < self.max_spans_per_trace:
+                trace.spans.append(span)
+            else:
+                self._drop("trace_too_large")
+            trace.error = trace.error or span.status.status_code == StatusCode.ERROR
+            if not is_root:
+                return
+            del self._pending[trace_id]
+
+        duration = (span.end_time - span.start_time) / 1e9 if span.end_time and span.start_time else 0.0
+        if trace.error:
+            self.traces_kept_error += 1
+        elif duration >= self.slow_seconds:
+            self.traces_kept_slow += 1
+        else:
+            self.traces_discarded += 1
+            return
+        self._enqueue(trace.spans)
+
+    # ==========================================
+    # Background export
+    # ==========================================
+
+    def _next_batch(self) -> List[ReadableSpan]:
+        """Wait for a span, then collect more until the batch is full or the schedule delay passed"""
+        try:
+            batch = [self._queue.get(timeout=self.schedule_delay_seconds)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + (0 if self._stopped.is_set() else self.schedule_delay_seconds)
+        while len(batch) < self.max_export_batch_size:
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                break
+        return batch
+
+    def _export_loop(self) -> None:
+        while not (self._stopped.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if not batch:
+                continue
+            start = time.perf_counter()
+            try:
+                result = self.exporter.export(batch)
+            except Exception as e:
+                print(f"Warning: span export failed: {e}")
+                result = SpanExportResult.FAILURE
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            self.last_export_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.batches += 1
+            if result == SpanExportResult.SUCCESS:
+                self.spans_exported += len(batch)
+            else:
+                self.failed_batches += 1
+                self._drop("export_failed", len(batch))
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """Wait until every queued span has been exported"""
+        # Unlike an empty queue, no unfinished tasks also covers spans the
+        # worker has taken off the queue but not exported yet
+        deadline = time.monotonic() + timeout_millis / 1000
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return not self._queue.unfinished_tasks
+
+    def shutdown(self, timeout_seconds: float = 10.0) -> None:
+        """Export what is queued, waiting at most timeout_seconds, then stop"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._worker.join(timeout_seconds)
+        if self._worker.is_alive():
+            print(f"Warning: {self._queue.qsize()} spans were not exported before shutdown")
+        self.exporter.shutdown()
+
+    async def close(self) -> None:
+        """Shut down without blocking the event loop; uvicorn exits on SIGTERM without running atexit"""
+        await asyncio.to_thread(self.shutdown)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return sampling decisions, export counters and dropped spans by reason"""
+        return {
+            "sample_ratio": self.sample_ratio,
+            "slow_seconds": self.slow_seconds,
+            "traces": {
+                "sampled": self.traces_sampled,
+                "kept_slow": self.traces_kept_slow,
+                "kept_error": self.traces_kept_error,
+                "discarded": self.traces_discarded,
+                "pending": len(self._pending),
+            },
+            "queue_depth": self._queue.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "spans_exported": self.spans_exported,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "last_export_ms": self.last_export_ms,
+            "dropped": dict(self.dropped),
+        }
+
+
+def create_tracer_provider(processor: SpanProcessor, project_name: str) -> TracerProvider:
+    """A tracer provider whose only span processor is the given one, tagged with the Arize project"""
+    resource = Resource.create({"openinference.project.name": project_name, "model_id": project_name})
+    tracer_provider = TracerProvider(resource=resource, shutdown_on_exit=False)
+    tracer_provider.add_span_processor(processor)
+    return tracer_provider
@@ -0,0 +1,284 @@
+"""
+Upstream Guard - Adaptive timeouts, circuit breaking and hedging per upstream
+
+Every upstream MCPTools uses the same flat timeout_seconds=60, so a single
+slow or hung upstream (the remote Phoenix Docs endpoint, say) holds the
+whole agent run for a minute, on every call. UpstreamGuard wraps each tool
+call of one upstream:
+
+- Latency of recent calls is tracked per upstream; once min_samples calls
+  have completed, a call times out after multiplier x the observed p99
+  (between min_timeout and max_timeout) instead of the flat ceiling
+- After failure_threshold consecutive failures (errors or timeouts) the
+  circuit opens: calls fail fast for open_seconds with a result telling the
+  agent the tool is unavailable, then a single probe call decides whether
+  the circuit closes again
+- Optional hedging for idempotent read tools: if a call is still running
+  after the observed p95, a second identical call is started and the first
+  result wins. Hedges are capped at max_hedge_ratio of all calls
+
+Timed-out calls count as a latency sample of the timeout itself, so the
+adaptive timeout widens again when an upstream slows down for good.
+
+Usage:
+    guard = UpstreamGuard("phoenix_docs", docs_mcp, hedge=True)
+    agent = Agent(tools=[docs_mcp], tool_hooks=[create_guard_hook([guard])])
+"""
+
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from agno.tools.function import ToolResult
+from agno.tools.mcp import MCPTools
+
+from common.mcp_pool import PoolExhaustedError
+
+# Tools that only read, so running one twice is safe (GitHub get_/list_/search_
+# tools, docs search)
+DEFAULT_HEDGE_TOOLS = r"^(search|get|list|read)"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the q-quantile of the window, or None before the first sample"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class UpstreamGuard:
+    """Adaptive timeout, circuit breaker and hedging for the tool calls of one upstream"""
+
+    def __init__(
+        self,
+        name: str,
+        toolkit: MCPTools,
+        min_timeout: float = 5.0,
+        max_timeout: float = 60.0,
+        multiplier: float = 3.0,
+        min_samples: int = 20,
+        window: int = 200,
+        failure_threshold: int = 5,
+        open_seconds: float = 30.0,
+        hedge: bool = False,
+        hedge_tools: str = DEFAULT_HEDGE_TOOLS,
+        hedge_min_delay: float = 0.05,
+        max_hedge_ratio: float = 0.1,
+    ):
+        self.name = name
+        self.toolkit = toolkit
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.hedge = hedge
+        self.hedge_tools = re.compile(hedge_tools, re.IGNORECASE)
+        self.hedge_min_delay = hedge_min_delay
+        self.max_hedge_ratio = max_hedge_ratio
+
+        self.latency = LatencyTracker(window)
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.short_circuited = 0
+        self.trips = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def handles(self, function_name: str) -> bool:
+        """Whether the function belongs to this guard's upstream"""
+        return function_name in self.toolkit.functions
+
+    # ==========================================
+    # Timeouts and hedging
+    # ==========================================
+
+    def current_timeout(self) -> float:
+        """Timeout for the next call: multiplier x p99 once enough calls were seen"""
+        p99 = self.latency.quantile(0.99)
+        if p99 is None or len(self.latency) < self.min_samples:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, p99 * self.multiplier))
+
+    def _hedge_delay(self, function_name: str) -> Optional[float]:
+        if not self.hedge or len(self.latency) < self.min_samples:
+            return None
+        if not self.hedge_tools.search(self._tool_name(function_name)):
+            return None
+        if self.hedges >= self.max_hedge_ratio * self.calls:
+            return None
+        return max(self.hedge_min_delay, self.latency.quantile(0.95))
+
+    def _tool_name(self, function_name: str) -> str:
+        # Agno registers MCP tools under tool_name_prefix + "_" + the MCP name
+        prefix = self.toolkit.tool_name_prefix
+        if prefix is not None and function_name.startswith(f"{prefix}_"):
+            return function_name[len(prefix) + 1:]
+        return function_name
+
+    # ==========================================
+    # Circuit breaker
+    # ==========================================
+
+    def _allow(self) -> bool:
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def _record_success(self, seconds: float) -> None:
+        self.latency.add(seconds)
+        self._consecutive_failures = 0
+        if self.state != CLOSED:
+            print(f"{self.name}: upstream recovered, circuit closed")
+        self.state = CLOSED
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        self._consecutive_failures += 1
+        if self.state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.trips += 1
+                print(f"Warning: {self.name}: {self._consecutive_failures} failed calls, "
+                      f"circuit open for {self.open_seconds}s")
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def _unavailable(self, function_name: str) -> ToolResult:
+        retry_in = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+        return ToolResult(
+            content=f"Error: tool '{function_name}' is temporarily unavailable because the {self.name} "
+            f"upstream is failing. Retry in about {retry_in:.0f}s or answer without it."
+        )
+
+    # ==========================================
+    # Calls
+    # ==========================================
+
+    async def call(self, function_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Any:
+        """Run a tool call under the adaptive timeout, with a hedge if it is slow"""
+        if not self._allow():
+            self.short_circuited += 1
+            return self._unavailable(function_name)
+
+        probe = self.state == HALF_OPEN
+        # A probe gets the full ceiling, so a recovered but slower upstream can pass it
+        timeout = self.max_timeout if probe else self.current_timeout()
+        hedge_delay = None if probe else self._hedge_delay(function_name)
+        self.calls += 1
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(self._run(function_call, arguments, hedge_delay), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.latency.add(timeout)
+            self._record_failure()
+            return ToolResult(
+                content=f"Error: tool '{function_name}' timed out after {timeout:.1f}s "
+                f"({self.name} upstream is slow)."
+            )
+        except PoolExhaustedError:
+            # Local capacity, not an upstream failure
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        finally:
+            if probe:
+                self._probe_in_flight = False
+
+        content = result.content if isinstance(result, ToolResult) else result
+        if isinstance(content, str) and content.startswith("Error"):
+            self._record_failure()
+        else:
+            self._record_success(time.monotonic() - start)
+        return result
+
+    async def _run(self, function_call: Callable, arguments: Dict[str, Any], hedge_delay: Optional[float]) -> Any:
+        if hedge_delay is None:
+            return await function_call(**arguments)
+
+        primary = asyncio.ensure_future(function_call(**arguments))
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        self.hedges += 1
+        hedged = asyncio.ensure_future(function_call(**arguments))
+        attempts = {primary, hedged}
+        try:
+            while attempts:
+                done, attempts = await asyncio.wait(attempts, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    # A failed attempt loses to one still running
+                    if attempt.exception() is None or not attempts:
+                        self.hedge_wins += attempt is hedged
+                        return attempt.result()
+        finally:
+            for attempt in (primary, hedged):
+                attempt.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return breaker state, timeout and call counters"""
+        p50, p99 = self.latency.quantile(0.5), self.latency.quantile(0.99)
+        return {
+            "state": self.state,
+            "timeout_seconds": round(self.current_timeout(), 3),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+            "samples": len(self.latency),
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "short_circuited": self.short_circuited,
+            "trips": self.trips,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+def create_guard_hook(guards: List[UpstreamGuard]) -> Callable:
+    """
+    Create an Agno tool hook that runs each MCP tool call under its upstream's guard.
+
+    Place it outside the pool hook, so a hedged call borrows a second pooled
+    session instead of queueing behind the first one.
+    """
+
+    async def guard_hook(function_name: str, function_call: Callable, arguments: Dict[str, Any]) -> Any:
+        for guard in guards:
+            if guard.handles(function_name):
+                return await guard.call(function_name, function_call, arguments)
+        return await function_call(**arguments)
+
+    return guard_hook
@@ -0,0 +1,277 @@
+"""
+Batch Runner - Run team queries against the Agent OS MCP concurrently
+
+The demo runner asks each team's question one after another over a single
+shared MCP session. The batch runner fans the same kind of work out:
+
+- Up to --concurrency team queries run at once
+- Each task gets its own MCP session (--sessions per-task), or borrows one
+  from a shared pool sized to the concurrency limit (--sessions pooled)
+- Each task has its own timeout; Ctrl+C cancels whatever is still running
+- Results are written as JSON, with the total wall-clock time compared to
+  the serial baseline (the sum of the individual task durations)
+
+Usage:
+    python3 scripts/batch_runner.py --concurrency 4 --timeout 300 --output tmp/batch.json
+    python3 scripts/batch_runner.py --tasks nightly_tasks.json --sessions pooled
+
+A tasks file is a JSON list of {"team", "query", "instructions"} objects.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+# Load environment variables from .env file
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    print("Warning: python-dotenv not installed. Using system environment variables.")
+
+from agno.agent import Agent
+from agno.tools.mcp import MCPTools
+
+# Make the shared helpers in common/ importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.admission import client_params
+from common.mcp_pool import ManagedConnection, MCPSessionPool, create_pool_hook
+from common.models import get_model
+from common.schema_cache import schema_cached
+
+# MCP server URL of the main Community Support Agent OS
+COMMUNITY_SUPPORT_MCP_URL = "http://localhost:7777/mcp"
+
+# The same team queries the demo runner asks, in the same order
+TEAM_TASKS = [
+    {
+        "team": "pm",
+        "name": "PM Insights Agent",
+        "instructions": ["You help PM team understand community needs via the Community Support Agent."],
+        "query": "What are the last 5 issues from the community? What features are they requesting?",
+    },
+    {
+        "team": "devrel",
+        "name": "DevRel Content Agent",
+        "instructions": ["You help DevRel identify documentation gaps via the Community Support Agent."],
+        "query": "Based on community questions, what tutorials should we create? Give me top 3 priorities.",
+    },
+    {
+        "team": "engineers",
+        "name": "Engineering Insights Agent",
+        "instructions": ["You help Engineers prioritize bugs via the Community Support Agent."],
+        "query": "What are the most critical bugs reported? Which should we fix first?",
+    },
+    {
+        "team": "sales",
+        "name": "Sales Intelligence Agent",
+        "instructions": ["You help Sales understand adoption trends via the Community Support Agent."],
+        "query": "Who are the most active users and organizations? Any enterprise adoption signals?",
+    },
+]
+
+
+def create_community_mcp(url: str) -> MCPTools:
+    return MCPTools(
+        transport="streamable-http", server_params=client_params(url, "batch-runner", timeout_seconds=90), timeout_seconds=90
+    )
+
+
+def create_team_agent(task: Dict[str, Any], community_mcp: MCPTools, tool_hooks: Optional[List] = None) -> Agent:
+    """Create the agent for one team task"""
+    return Agent(
+        name=task.get("name", f"{task['team']} agent"),
+        model=get_model("claude-sonnet-4-5"),
+        tools=[community_mcp],
+        tool_hooks=tool_hooks,
+        instructions=task.get("instructions"),
+        markdown=True,
+    )
+
+
+class SessionProvider:
+    """Hands each task an MCP session: a private one, or the shared pool"""
+
+    def __init__(self, url: str, mode: str, pool_size: int):
+        self.url = url
+        self.mode = mode
+        self.pool_size = pool_size
+        self._template: Optional[ManagedConnection] = None
+        self._pool: Optional[MCPSessionPool] = None
+
+    async def start(self) -> None:
+        if self.mode != "pooled":
+            return
+        # One connection provides the tool schemas, the pool runs the calls
+        self._template = ManagedConnection(create_community_mcp(self.url))
+        await self._template.open(timeout=90)
+        self._pool = MCPSessionPool(
+            self._template.tools,
+            name="community_support",
+            min_size=self.pool_size,
+            max_size=self.pool_size,
+        )
+        await self._pool.start()
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+        if self._template is not None:
+            await self._template.close()
+
+    @asynccontextmanager
+    async def agent_for(self, task: Dict[str, Any]) -> AsyncIterator[Agent]:
+        if self.mode == "pooled":
+            yield create_team_agent(task, self._template.tools, [create_pool_hook([self._pool])])
+            return
+
+        async with schema_cached(create_community_mcp(self.url)) as community_mcp:
+            yield create_team_agent(task, community_mcp)
+
+
+async def run_task(
+    task: Dict[str, Any],
+    sessions: SessionProvider,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+    batch_start: float,
+) -> Dict[str, Any]:
+    """Run one team query and return its result record"""
+    result: Dict[str, Any] = {"team": task["team"], "query": task["query"], "status": "cancelled"}
+    async with semaphore:
+        start = time.perf_counter()
+        result["started_at_seconds"] = round(start - batch_start, 3)
+        try:
+            async with asyncio.timeout(timeout):
+                async with sessions.agent_for(task) as agent:
+                    response = await agent.arun(task["query"])
+            result["status"] = "ok"
+            result["content"] = response.content
+            if response.metrics is not None:
+                result["input_tokens"] = response.metrics.input_tokens
+                result["output_tokens"] = response.metrics.output_tokens
+        except TimeoutError:
+            result["status"] = "timeout"
+            result["error"] = f"Timed out after {timeout}s"
+        except asyncio.CancelledError:
+            result["error"] = "Cancelled"
+            raise
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        finally:
+            result["seconds"] = round(time.perf_counter() - start, 3)
+            print(f"[{result['status']:>9}] {task['team']:<10} {result['seconds']:8.2f}s")
+    return result
+
+
+async def run_batch(
+    tasks: List[Dict[str, Any]],
+    url: str = COMMUNITY_SUPPORT_MCP_URL,
+    concurrency: int = 4,
+    timeout: float = 300.0,
+    session_mode: str = "per-task",
+) -> Dict[str, Any]:
+    """Run the tasks with at most `concurrency` at once and summarize the batch"""
+    semaphore = asyncio.Semaphore(concurrency)
+    sessions = SessionProvider(url, session_mode, pool_size=concurrency)
+    started_at = datetime.now(timezone.utc).isoformat()
+    batch_start = time.perf_counter()
+
+    records = [{"team": task["team"], "query": task["query"], "status": "cancelled"} for task in tasks]
+    running: List[asyncio.Task] = []
+    try:
+        await sessions.start()
+        running = [
+            asyncio.create_task(run_task(task, sessions, semaphore, timeout, batch_start)) for task in tasks
+        ]
+        for i, outcome in enumerate(await asyncio.gather(*running, return_exceptions=True)):
+            if isinstance(outcome, dict):
+                records[i] = outcome
+    except asyncio.CancelledError:
+        # Ctrl+C: stop the remaining tasks, keep whatever already finished
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        for i, task in enumerate(running):
+            if task.done() and not task.cancelled() and task.exception() is None:
+                records[i] = task.result()
+    finally:
+        await sessions.close()
+
+    wall_seconds = time.perf_counter() - batch_start
+    serial_seconds = sum(record.get("seconds", 0.0) for record in records)
+    return {
+        "started_at": started_at,
+        "url": url,
+        "concurrency": concurrency,
+        "sessions": session_mode,
+        "timeout_seconds": timeout,
+        "wall_seconds": round(wall_seconds, 3),
+        "serial_baseline_seconds": round(serial_seconds, 3),
+        "speedup": round(serial_seconds / wall_seconds, 2) if wall_seconds else None,
+        "succeeded": sum(record["status"] == "ok" for record in records),
+        "failed": sum(record["status"] != "ok" for record in records),
+        "tasks": records,
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print("=" * 60)
+    print(f"Batch: {len(summary['tasks'])} tasks, concurrency {summary['concurrency']}, {summary['sessions']} sessions")
+    print(f"Succeeded: {summary['succeeded']}, failed: {summary['failed']}")
+    print(f"Wall clock:      {summary['wall_seconds']:8.2f}s")
+    print(f"Serial baseline: {summary['serial_baseline_seconds']:8.2f}s (sum of task durations)")
+    if summary["speedup"] is not None:
+        print(f"Speedup:         {summary['speedup']:8.2f}x")
+    print("=" * 60)
+
+
+def load_tasks(path: Optional[str], teams: Optional[List[str]]) -> List[Dict[str, Any]]:
+    tasks = json.loads(Path(path).read_text()) if path else TEAM_TASKS
+    if teams:
+        tasks = [task for task in tasks if task["team"] in teams]
+    return tasks
+
+
+async def main(args: argparse.Namespace) -> None:
+    summary = await run_batch(
+        load_tasks(args.tasks, args.teams),
+        url=args.url,
+        concurrency=args.concurrency,
+        timeout=args.timeout,
+        session_mode=args.sessions,
+    )
+    print_summary(summary)
+
+    # Written even after Ctrl+C, so finished tasks are never lost
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(summary, indent=2))
+        print(f"Results written to {args.output}")
+    else:
+        print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run team queries against the Agent OS MCP concurrently")
+    parser.add_argument("--url", default=COMMUNITY_SUPPORT_MCP_URL)
+    parser.add_argument("--tasks", help="JSON file with a list of {team, query, instructions}")
+    parser.add_argument("--teams", nargs="*", help="Only run these teams")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds allowed per task")
+    parser.add_argument("--sessions", choices=["per-task", "pooled"], default="per-task")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        print("\nBatch cancelled by user")
@@ -0,0 +1,157 @@
+"""
+Admission Control Benchmark - One team's batch against another team's triage
+
+Starts the stub upstream and main_agent_server.py (fake model) twice, with
+admission control off and on. In each run a "pm-team" batch keeps
+--batch-concurrency run_agent calls in flight while a single
+"engineers-team" client asks one question after another. The upstream is
+the bottleneck: every run makes one docs call and the docs session pool
+holds --pool-size sessions.
+
+Without admission control the engineers' calls queue behind the whole
+batch. With it, runs are capped, the engineers get their fair share of the
+slots, and the batch calls that cannot be served soon are rejected at once
+instead of timing out. Reports per client: completed and rejected calls,
+and latency of completed calls and of rejections.
+
+Usage:
+    python3 scripts/bench_admission.py --batch-concurrency 24 --duration 20
+    python3 scripts/bench_admission.py --rate-per-minute 0   # queueing only
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from bench_mcp import AGENT_ID, launch_agent_server, percentile
+from stub_mcp_server import launch_stub_server
+
+QUESTION = "How does tracing work in Phoenix?"
+
+
+async def client_loop(
+    url: str, client_id: str, stop_at: float, records: List[Dict[str, Any]], counter: "itertools.count[int]"
+) -> None:
+    """One MCP client calling run_agent back to back until the deadline"""
+    async with streamablehttp_client(url, headers={"X-Client-Id": client_id}, timeout=120) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            while time.monotonic() < stop_at:
+                # A unique question, so no cache or single flight merges the calls
+                message = f"{QUESTION} (call {next(counter)})"
+                start = time.monotonic()
+                result = await session.call_tool("run_agent", {"agent_id": AGENT_ID, "message": message})
+                text = result.content[0].text if result.content else ""
+                records.append({
+                    "client": client_id,
+                    "ok": not result.isError,
+                    "rejected": result.isError and text.startswith("Rejected"),
+                    "latency": time.monotonic() - start,
+                })
+                if result.isError:
+                    # Back off like a client honoring the rejection
+                    await asyncio.sleep(0.5)
+
+
+def summarize(records: List[Dict[str, Any]], reasons: Dict[str, int]) -> Dict[str, Any]:
+    ok = [r["latency"] * 1000 for r in records if r["ok"]]
+    rejected = [r["latency"] * 1000 for r in records if r["rejected"]]
+    return {
+        "calls": len(records),
+        "ok": len(ok),
+        "rejected": len(rejected),
+        "errors": len(records) - len(ok) - len(rejected),
+        "p50_ms": percentile(ok, 50),
+        "p95_ms": percentile(ok, 95),
+        "rejected_avg_ms": statistics.mean(rejected) if rejected else None,
+        "reasons": reasons,
+    }
+
+
+async def run_mode(args: argparse.Namespace, admission: bool) -> Dict[str, Dict[str, Any]]:
+    stub = launch_stub_server(args.stub_port, delay=args.upstream_delay)
+    server = None
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            extra_env = {
+                "ADMISSION_ENABLED": str(admission).lower(),
+                "MAX_CONCURRENT_RUNS": str(args.max_concurrent_runs),
+                "CLIENT_RATE_PER_MINUTE": str(args.rate_per_minute),
+                "MCP_POOL_SIZE": str(args.pool_size),
+                "TOOL_CACHE_ENABLED": "false",
+                "ANSWER_CACHE_ENABLED": "false",
+                "SINGLE_FLIGHT_ENABLED": "false",
+            }
+            server = launch_agent_server(args.port, f"http://127.0.0.1:{args.stub_port}/mcp", work_dir, extra_env)
+            url = f"http://127.0.0.1:{args.port}/mcp"
+
+            records: List[Dict[str, Any]] = []
+            counter = itertools.count()
+            stop_at = time.monotonic() + args.duration
+            await asyncio.gather(
+                *(client_loop(url, "pm-team", stop_at, records, counter) for _ in range(args.batch_concurrency)),
+                client_loop(url, "engineers-team", stop_at, records, counter),
+            )
+            admission_clients = httpx.get(f"http://127.0.0.1:{args.port}/admission/stats").json().get("clients", {})
+    finally:
+        for process in (server, stub):
+            if process is not None:
+                process.terminate()
+                process.wait()
+    return {
+        client: summarize(
+            [r for r in records if r["client"] == client], admission_clients.get(client, {}).get("rejected", {})
+        )
+        for client in ("pm-team", "engineers-team")
+    }
+
+
+def format_ms(value: Optional[float]) -> str:
+    return f"{value:10.0f}" if value is not None else f"{'-':>10}"
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    results = {mode: await run_mode(args, mode == "admission") for mode in ("no admission", "admission")}
+
+    print("=" * 78)
+    print("Admission Control Benchmark")
+    print(
+        f"{args.batch_concurrency} pm-team calls in flight + 1 engineers-team client, {args.duration}s, "
+        f"{args.pool_size} upstream sessions, {args.upstream_delay}s per docs call"
+    )
+    print("=" * 78)
+    print(f"{'mode':<14}{'client':<16}{'ok':>5}{'rejected':>9}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'reject ms':>10}")
+    for mode, clients in results.items():
+        for client, stats in clients.items():
+            print(
+                f"{mode:<14}{client:<16}{stats['ok']:>5}{stats['rejected']:>9}{stats['errors']:>5}"
+                f"{format_ms(stats['p50_ms'])}{format_ms(stats['p95_ms'])}{format_ms(stats['rejected_avg_ms'])}"
+            )
+    for client, stats in results["admission"].items():
+        if stats["reasons"]:
+            reasons = ", ".join(f"{reason} {count}" for reason, count in stats["reasons"].items())
+            print(f"Rejected {client}: {reasons}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark admission control with a batch and a triage client")
+    parser.add_argument("--batch-concurrency", type=int, default=24)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--max-concurrent-runs", type=int, default=4)
+    parser.add_argument("--rate-per-minute", type=float, default=60, help="Per-client limit, 0 turns it off")
+    parser.add_argument("--pool-size", type=int, default=4, help="Upstream docs sessions (MCP_POOL_SIZE)")
+    parser.add_argument("--upstream-delay", type=float, default=1.0, help="Stub upstream latency per tool call")
+    parser.add_argument("--port", type=int, default=7790)
+    parser.add_argument("--stub-port", type=int, default=8770)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args))
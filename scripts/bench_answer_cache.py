@@ -0,0 +1,98 @@
+"""
+Answer Cache Calibration - Choose the similarity threshold on labelled question pairs
+
+Scores labelled pairs of team questions with the answer cache's hashed
+n-gram vectors. A pair is "same" when one answer serves both questions and
+"different" when it does not, usually because a number, time period or
+negation differs while the rest of the wording matches.
+
+For each threshold it reports, with and without the key-term check:
+- correct hits: same pairs served from the cache
+- wrong hits: different pairs served from the cache, i.e. wrong answers
+
+The recommended threshold is the lowest one without wrong hits; it is the
+default of SemanticAnswerCache (ANSWER_CACHE_THRESHOLD).
+
+Usage:
+    python3 scripts/bench_answer_cache.py
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.answer_cache import HashedNgramVectorizer, _words, key_terms, negated_pair
+
+# (question, question, one answer serves both)
+PAIRS: List[Tuple[str, str, bool]] = [
+    ("most critical bugs", "which bugs are most critical right now", True),
+    ("What are the most critical bugs?", "most critical bugs?", True),
+    ("How do I trace an agno agent?", "how can I trace my agno agent", True),
+    ("How do I self-host Phoenix with Postgres?", "self-hosting phoenix on postgres", True),
+    ("What are the top feature requests?", "top feature requests please", True),
+    ("Who are the most active contributors?", "most active contributors", True),
+    ("How do I run evals on my traces?", "how do I run evaluations on traces", True),
+    ("What are datasets used for?", "what are datasets used for in phoenix", True),
+    ("How do I manage prompts?", "how to manage prompts", True),
+    ("Show the latest community issues", "latest community issues", True),
+    ("How does tracing work in Phoenix?", "how does phoenix tracing work", True),
+    ("What are the open bugs about tracing?", "open tracing bugs", True),
+    ("last 10 community issues", "the last 10 issues from the community", True),
+    ("How do I install Phoenix with pip?", "install phoenix using pip", True),
+    ("top contributors this week", "who were the top contributors this week", True),
+    ("Summarize issues labelled enhancement", "summarize the enhancement issues", True),
+    ("last 10 community issues", "last 50 community issues", False),
+    ("most active contributors this week", "most active contributors this month", False),
+    ("How do I install Phoenix with pip?", "How do I uninstall Phoenix with pip?", False),
+    ("issues opened today", "issues opened yesterday", False),
+    ("Does Phoenix support LangChain?", "Does Phoenix not support LangChain?", False),
+    ("top 5 feature requests", "top 20 feature requests", False),
+    ("open bugs in release 8.0", "open bugs in release 9.0", False),
+    ("How do I enable tracing?", "How do I disable tracing?", False),
+    ("issues closed this year", "issues closed this quarter", False),
+    ("show issue 4512", "show issue 4513", False),
+    ("How do I trace an agno agent?", "How do I trace a langchain agent?", False),
+    ("most critical bugs", "most requested features", False),
+    ("How do I self-host Phoenix with Postgres?", "How do I self-host Phoenix with SQLite?", False),
+    ("How do I run evals on my traces?", "How do I export my traces?", False),
+]
+
+
+def main() -> None:
+    vectorizer = HashedNgramVectorizer()
+    scored = []
+    for a, b, same in PAIRS:
+        similarity = float(vectorizer.transform(a) @ vectorizer.transform(b))
+        matches = key_terms(a) == key_terms(b) and not negated_pair(_words(a), _words(b))
+        scored.append((similarity, matches, same))
+
+    same_pairs = sum(same for _, _, same in scored)
+    print("=" * 72)
+    print("Answer Cache Calibration")
+    print(f"{same_pairs} same pairs, {len(scored) - same_pairs} different pairs")
+    print("=" * 72)
+    print(f"{'threshold':<12}{'similarity only':>26}{'with key terms':>30}")
+    print(f"{'':<12}{'correct':>13}{'wrong':>13}{'correct':>15}{'wrong':>15}")
+    recommended = None
+    for step in range(50, 100, 5):
+        threshold = step / 100
+        plain = [same for similarity, _, same in scored if similarity >= threshold]
+        guarded = [same for similarity, matches, same in scored if similarity >= threshold and matches]
+        print(
+            f"{threshold:<12.2f}{sum(plain):>13}{len(plain) - sum(plain):>13}"
+            f"{sum(guarded):>15}{len(guarded) - sum(guarded):>15}"
+        )
+        if recommended is None and len(guarded) == sum(guarded):
+            recommended = threshold
+    print("-" * 72)
+    for similarity, matches, same in scored:
+        if not same and similarity >= (recommended or 1.0) * 0.9:
+            print(f"  different pair at {similarity:.3f}, key terms {'match' if matches else 'differ'}")
+    print(f"Lowest threshold without wrong hits (with key terms): {recommended}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
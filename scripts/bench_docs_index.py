@@ -0,0 +1,146 @@
+"""
+Docs Index Benchmark - Local docs search against the remote docs round trip
+
+Builds a local docs index from --pages synthetic pages (variations of the
+bundled common/docs_fixture.json), changes --changed of them and refreshes
+again, then compares search latency:
+
+- keyword (FTS5), vector (memory-mapped matrix) and hybrid local searches
+- the same searches through the stub docs MCP server with --delay seconds
+  of simulated network latency, and with --slow-rate of the calls taking
+  --slow-delay seconds, like an upstream having a bad minute
+
+Usage:
+    python3 scripts/bench_docs_index.py --pages 500 --changed 10 --delay 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.tools.mcp import MCPTools
+
+from bench_mcp import percentile
+from common.docs_index import DocsIndex, FixtureDocsSource
+from stub_mcp_server import find_function, launch_stub_server
+
+FIXTURE = Path(__file__).resolve().parent.parent / "common" / "docs_fixture.json"
+QUERIES = [
+    "how do I trace an agno agent",
+    "self-host phoenix with postgres",
+    "hallucination eval for rag",
+    "group traces by session id",
+    "prompt versions and tags",
+    "compare experiments on a dataset",
+    "custom model prices for cost tracking",
+    "log user feedback as annotations",
+]
+
+
+def generate_pages(count: int, rng: random.Random) -> List[Dict[str, str]]:
+    base = json.loads(FIXTURE.read_text())["pages"]
+    pages = []
+    for i in range(count):
+        page = base[i % len(base)]
+        sections = page["content"].split("\n## ")
+        # Shuffle the sections after the intro so every variant chunks differently
+        body = [sections[0]] + rng.sample(sections[1:], len(sections) - 1)
+        pages.append({
+            "url": page["url"].replace(".md", f"-{i}.md"),
+            "title": f"{page['title']} ({i})",
+            "content": "\n## ".join(body) + f"\n\nRelated: {' '.join(rng.sample(QUERIES, 2))}",
+        })
+    return pages
+
+
+def write_fixture(path: Path, pages: List[Dict[str, str]]) -> None:
+    path.write_text(json.dumps({"pages": pages}))
+
+
+def latency(samples: List[float]) -> Dict[str, Any]:
+    return {"p50_ms": percentile(samples, 50), "p95_ms": percentile(samples, 95), "max_ms": max(samples)}
+
+
+def time_local(index: DocsIndex, mode: str, repeats: int) -> Dict[str, Any]:
+    samples = []
+    for _ in range(repeats):
+        for query in QUERIES:
+            start = time.perf_counter()
+            index.search(query, limit=5, mode=mode)
+            samples.append((time.perf_counter() - start) * 1000)
+    return latency(samples)
+
+
+async def time_remote(port: int, repeats: int) -> Dict[str, Any]:
+    samples = []
+    async with MCPTools(transport="streamable-http", url=f"http://127.0.0.1:{port}/mcp", timeout_seconds=60) as docs_mcp:
+        search = find_function(docs_mcp, "search_docs")
+        for _ in range(repeats):
+            for query in QUERIES:
+                start = time.perf_counter()
+                await search.entrypoint(query=query)
+                samples.append((time.perf_counter() - start) * 1000)
+    return latency(samples)
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as work_dir:
+        fixture = Path(work_dir) / "docs.json"
+        pages = generate_pages(args.pages, rng)
+        write_fixture(fixture, pages)
+        index = DocsIndex(str(Path(work_dir) / "index"))
+        build = index.refresh(FixtureDocsSource(str(fixture)))
+
+        for page in rng.sample(pages, args.changed):
+            page["content"] += "\n\n## Changelog\n\nUpdated for the latest release."
+        write_fixture(fixture, pages)
+        incremental = index.refresh(FixtureDocsSource(str(fixture)))
+
+        local = {mode: time_local(index, mode, args.repeats) for mode in ("keyword", "vector", "hybrid")}
+        stats = index.stats()
+
+    remote = {}
+    for name, extra in (("remote", []), ("remote, slow", ["--slow-rate", str(args.slow_rate), "--slow-delay", str(args.slow_delay)])):
+        stub = launch_stub_server(args.stub_port, args.delay, extra)
+        try:
+            remote[name] = await time_remote(args.stub_port, args.repeats)
+        finally:
+            stub.terminate()
+            stub.wait()
+
+    print("=" * 78)
+    print("Docs Index Benchmark")
+    print(f"{args.pages} pages, {stats['chunks']} chunks, matrix {stats['matrix_mb']} MB; {len(QUERIES) * args.repeats} searches per row")
+    print("=" * 78)
+    for name, refresh in (("full build", build), ("incremental refresh", incremental)):
+        changed = refresh["added"] + refresh["updated"]
+        print(f"{name:<22}{changed:>6} pages indexed {refresh['unchanged']:>6} unchanged {refresh['seconds']:>10.3f}s")
+    print("-" * 78)
+    print(f"{'search':<22}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, result in {**{f"local {mode}": r for mode, r in local.items()}, **remote}.items():
+        print(f"{name:<22}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['max_ms']:>10.2f}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark local docs index search against the remote docs endpoint")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--changed", type=int, default=10, help="Pages changed between the two refreshes")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.3, help="Simulated network latency of the remote docs search")
+    parser.add_argument("--slow-rate", type=float, default=0.1, help="Fraction of remote calls that take --slow-delay")
+    parser.add_argument("--slow-delay", type=float, default=3.0)
+    parser.add_argument("--stub-port", type=int, default=8772)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args))
@@ -0,0 +1,165 @@
+"""
+GitHub Mirror Benchmark - Sync cost, analytics refresh and query latency of the local mirror
+
+Generates a synthetic repository in GitHub's API format (--items issues and
+PRs, written about a handful of topics), mirrors it through FixtureSource,
+then updates --updated of them and syncs again. Reports how many items and
+pages each sync fetched, and the p50/p95 latency of the questions the teams
+ask: latest open issues, issues with a label, top contributors, label
+counts, activity and text search. Each of these would otherwise be one or
+more paginated GitHub API calls.
+
+It also times the community analytics refresh after each sync (a full
+refit first, then incremental), reading the precomputed summaries, and
+compares their size with the raw issue listing the agent used to page
+through to work out the same answers.
+
+Usage:
+    python3 scripts/bench_github_mirror.py --items 20000 --updated 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_mcp import percentile
+from common.github_analytics import CommunityAnalytics
+from common.github_mirror import FixtureSource, GitHubMirror
+
+REPO = "Arize-ai/phoenix"
+LABELS = ["bug", "enhancement", "documentation", "question", "tracing", "evals", "datasets", "prompts", "performance"]
+TOPICS = [
+    ["tracing", "span", "otel", "instrumentor", "context"],
+    ["eval", "hallucination", "judge", "rag", "relevance"],
+    ["dataset", "experiment", "upload", "csv", "rows"],
+    ["prompt", "playground", "template", "variables", "versions"],
+    ["docker", "helm", "postgres", "deployment", "kubernetes"],
+    ["dashboard", "ui", "chart", "filter", "cost"],
+]
+WORDS = ["crash", "slow", "export", "async", "token", "error", "support", "when", "large", "missing"]
+
+
+def timestamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def generate_items(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    start = datetime(2024, 1, 1)
+    authors = [f"user-{i}" for i in range(max(10, count // 20))]
+    items = []
+    for number in range(1, count + 1):
+        created = start + timedelta(minutes=number * 30)
+        closed = rng.random() < 0.6
+        is_pr = rng.random() < 0.3
+        topic = rng.choice(TOPICS)
+        item = {
+            "number": number,
+            "title": " ".join(rng.sample(topic, 2) + rng.sample(WORDS, 2)),
+            "body": " ".join(rng.choices(topic, k=15) + rng.choices(WORDS, k=15)),
+            "state": "closed" if closed else "open",
+            "user": {"login": rng.choice(authors)},
+            "labels": [{"name": name} for name in rng.sample(LABELS, rng.randint(0, 3))],
+            "comments": rng.randint(0, 30),
+            "created_at": timestamp(created),
+            "updated_at": timestamp(created + timedelta(hours=rng.randint(0, 48))),
+            "closed_at": timestamp(created + timedelta(days=1)) if closed else None,
+            "html_url": f"https://github.com/{REPO}/issues/{number}",
+        }
+        if is_pr:
+            item["pull_request"] = {"merged_at": item["closed_at"]}
+        items.append(item)
+    return items
+
+
+def write_fixture(path: Path, items: List[Dict[str, Any]]) -> None:
+    contributors = [{"login": f"user-{i}", "contributions": 1000 // (i + 1)} for i in range(50)]
+    path.write_text(json.dumps({REPO: {"issues": items, "contributors": contributors}}))
+
+
+def time_query(query: Callable[[], Any], repeats: int) -> Dict[str, Any]:
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        query()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": percentile(latencies, 50), "p95_ms": percentile(latencies, 95)}
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as work_dir:
+        fixture = Path(work_dir) / "fixture.json"
+        items = generate_items(args.items, rng)
+        write_fixture(fixture, items)
+        mirror = GitHubMirror(str(Path(work_dir) / "mirror.db"), max_pages=10_000, initial_days=0)
+        initial = mirror.sync(REPO, FixtureSource(str(fixture)))
+        analytics = CommunityAnalytics(str(Path(work_dir) / "mirror.db"))
+        refreshes = [analytics.refresh(REPO)]
+
+        # Touch some items after the first sync, like a day of activity
+        touched_at = timestamp(datetime(2030, 1, 1))
+        for item in rng.sample(items, args.updated):
+            item["updated_at"] = touched_at
+            item["comments"] += 1
+        write_fixture(fixture, items)
+        incremental = mirror.sync(REPO, FixtureSource(str(fixture)))
+        refreshes.append(analytics.refresh(REPO))
+
+        queries = {
+            "latest open issues": lambda: mirror.list_items(REPO, "issue", "open", limit=10),
+            "open bugs by comments": lambda: mirror.list_items(REPO, "issue", "open", label="bug", sort="comments"),
+            "merged PRs, 90 days": lambda: mirror.list_items(REPO, "pr", "closed", since="2024-10-01T00:00:00Z"),
+            "top contributors": lambda: mirror.top_contributors(REPO, limit=10),
+            "label counts": lambda: mirror.label_counts(REPO),
+            "activity, 30 days": lambda: mirror.activity(REPO, "2024-12-01T00:00:00Z"),
+            "search 'docker crash'": lambda: mirror.search(REPO, "docker crash"),
+            "overview (precomputed)": lambda: analytics.summary(REPO, "overview"),
+            "top bugs (precomputed)": lambda: analytics.summary(REPO, "bugs"),
+        }
+        results = {name: time_query(query, args.repeats) for name, query in queries.items()}
+        # What the agent read before: every open issue, 100 per call, to rank them itself
+        raw_pages = [mirror.list_items(REPO, "issue", "open", limit=100)]
+        open_issues = mirror.activity(REPO)["open_issues"]
+        raw_bytes = len(json.dumps(raw_pages[0])) * -(-open_issues // 100)
+        summary_bytes = {
+            name: len(json.dumps(analytics.summary(REPO, name)))
+            for name in ("overview", "themes", "feature_requests", "bugs", "contributors")
+        }
+        themes = analytics.summary(REPO, "themes")["themes"]
+
+    print("=" * 78)
+    print("GitHub Mirror Benchmark")
+    print(f"{args.items} issues and PRs, {args.updated} updated between syncs, {args.repeats} runs per query")
+    print("=" * 78)
+    for name, sync in (("initial sync", initial), ("incremental sync", incremental)):
+        print(f"{name:<22}{sync['items']:>8} items {sync['pages']:>5} pages (GitHub requests) {sync['seconds']:>8.3f}s")
+    for refresh in refreshes:
+        print(f"analytics ({refresh['mode']}){'':<{11 - len(refresh['mode'])}}{refresh['changed']:>8} issues{refresh['seconds']:>38.3f}s")
+    print("-" * 78)
+    print(f"{'query':<28}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<28}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}")
+    print("-" * 78)
+    print(f"raw open issues: {open_issues} in {-(-open_issues // 100)} pages, ~{raw_bytes // 1024} KB")
+    print("summaries: " + ", ".join(f"{name} {size // 1024 or 1} KB" for name, size in summary_bytes.items()))
+    print("themes: " + "; ".join(" ".join(theme["terms"][:3]) for theme in themes))
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GitHub mirror sync and query latency")
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--updated", type=int, default=200, help="Items updated between the two syncs")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    run_benchmark(args)
@@ -0,0 +1,126 @@
+"""
+History Benchmark - Per-turn history load time and prompt size
+
+Plays one long session turn by turn. Every run has a tool call with a
+large tool result, like a docs search. Before each turn, it measures what
+putting history into the prompt costs:
+
+- runs: Agno's default. The session is read from a plain SqliteDb, and the
+  last --history-runs runs are copied into the prompt.
+- budget: TunedSqliteDb, which keeps the session in memory, and
+  HistoryAssembler, which picks runs under --max-tokens and only prepares
+  runs it has not seen.
+
+Reports the history load time (session read plus history assembly) and the
+estimated history tokens, averaged over all turns and for the last turn.
+
+Usage:
+    python3 scripts/bench_history.py --turns 30 --tool-result-chars 6000 --max-tokens 4000
+"""
+
+import argparse
+import copy
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.db.base import SessionType
+from agno.db.sqlite import SqliteDb
+from agno.models.message import Message
+from agno.run.agent import RunOutput
+from agno.run.base import RunStatus
+from agno.session import AgentSession
+
+from common.history_context import HistoryAssembler, estimate_message_tokens
+from common.session_store import TunedSqliteDb
+
+SESSION_ID = "bench-session"
+
+
+def make_run(turn: int, tool_result_chars: int) -> RunOutput:
+    call_id = f"call_{turn}"
+    return RunOutput(
+        run_id=f"run-{turn}",
+        agent_id="community-support-agent",
+        session_id=SESSION_ID,
+        status=RunStatus.completed,
+        content=f"Answer {turn}",
+        messages=[
+            Message(role="system", content="You are the Community Support Agent. " * 20),
+            Message(role="user", content=f"Question {turn}: how do I export traces from Phoenix?"),
+            Message(role="assistant", tool_calls=[{
+                "id": call_id,
+                "type": "function",
+                "function": {"name": "search_docs", "arguments": '{"query": "export traces"}'},
+            }]),
+            Message(role="tool", tool_call_id=call_id, content=("Phoenix docs excerpt. " * 500)[:tool_result_chars]),
+            Message(role="assistant", content=f"Answer {turn}: use the export button or the client API. " * 8),
+        ],
+    )
+
+
+def play_session(mode: str, db, turns: int, tool_result_chars: int, history_runs: int, max_tokens: int) -> Dict[str, Any]:
+    assembler = HistoryAssembler(max_tokens=max_tokens)
+    load_ms: List[float] = []
+    tokens: List[int] = []
+
+    for turn in range(turns):
+        start = time.perf_counter()
+        session = db.get_session(session_id=SESSION_ID, session_type=SessionType.AGENT)
+        if session is None:
+            session = AgentSession(session_id=SESSION_ID, agent_id="community-support-agent", runs=[],
+                                   created_at=int(time.time()))
+        if mode == "runs":
+            history = [copy.deepcopy(m) for m in session.get_messages_from_last_n_runs(last_n=history_runs)]
+        else:
+            history = assembler.history_for(session)
+        load_ms.append((time.perf_counter() - start) * 1000)
+        tokens.append(sum(estimate_message_tokens(m) for m in history))
+
+        session.runs = (session.runs or []) + [make_run(turn, tool_result_chars)]
+        db.upsert_session(session)
+
+    return {
+        "mode": mode,
+        "avg_load_ms": round(statistics.mean(load_ms), 3),
+        "last_load_ms": round(load_ms[-1], 3),
+        "avg_history_tokens": round(statistics.mean(tokens)),
+        "last_history_tokens": tokens[-1],
+    }
+
+
+def run_benchmark(turns: int, tool_result_chars: int, history_runs: int, max_tokens: int) -> None:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plain = SqliteDb(db_file=str(Path(tmp_dir) / "plain.db"))
+        results.append(play_session("runs", plain, turns, tool_result_chars, history_runs, max_tokens))
+
+        tuned = TunedSqliteDb(db_file=str(Path(tmp_dir) / "tuned.db"))
+        results.append(play_session("budget", tuned, turns, tool_result_chars, history_runs, max_tokens))
+        tuned.close()
+
+    print("=" * 72)
+    print(f"History Benchmark: {turns} turns, {tool_result_chars} char tool results")
+    print(f"runs = last {history_runs} runs (Agno), budget = {max_tokens} token budget")
+    print("=" * 72)
+    print(f"{'mode':<8}{'avg load ms':>13}{'last load ms':>14}{'avg tokens':>12}{'last tokens':>13}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['avg_load_ms']:>13}{r['last_load_ms']:>14}"
+              f"{r['avg_history_tokens']:>12}{r['last_history_tokens']:>13}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark history load time and prompt size")
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--tool-result-chars", type=int, default=6000)
+    parser.add_argument("--history-runs", type=int, default=3, help="num_history_runs for the Agno baseline")
+    parser.add_argument("--max-tokens", type=int, default=4000, help="History token budget")
+    args = parser.parse_args()
+
+    run_benchmark(args.turns, args.tool_result_chars, args.history_runs, args.max_tokens)
@@ -0,0 +1,416 @@
+"""
+MCP Load Benchmark - Throughput and latency of the Agent OS /mcp endpoint
+
+Starts the stub upstream MCP server and main_agent_server.py with the
+deterministic fake model (AGENT_MODEL=fake), then drives /mcp with
+concurrent MCP clients for a fixed duration. Reports:
+
+- throughput, p50/p95/p99 latency and error rate, overall and per tool
+- time-to-first-token, from the run metrics returned by run_agent
+- server RSS (start, peak, end)
+
+Results are written as JSON, tagged with the git commit, so runs can be
+compared across commits with --compare.
+
+Usage:
+    python3 scripts/bench_mcp.py --concurrency 8 --duration 30
+    python3 scripts/bench_mcp.py --mix run_agent=8,get_agentos_config=2 --server-env MCP_POOL_SIZE=0
+    python3 scripts/bench_mcp.py --compare tmp/bench/bench_mcp_<commit>.json
+    python3 scripts/bench_mcp.py --workers 4
+    python3 scripts/bench_mcp.py --url http://localhost:7777/mcp --server-pid 1234
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from stub_mcp_server import launch_stub_server
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+AGENT_ID = "community-support-agent"
+
+QUESTIONS = [
+    "How does tracing work in Phoenix?",
+    "How do I run evaluation on my traces?",
+    "What are datasets used for?",
+    "How do I manage prompts?",
+]
+
+
+# ==========================================
+# Servers under test
+# ==========================================
+
+def launch_agent_server(
+    port: int, stub_url: str, work_dir: str, extra_env: Dict[str, str], workers: int = 1
+) -> subprocess.Popen:
+    """Start main_agent_server.py with the fake model and wait until /health is ready"""
+    env = {
+        **os.environ,
+        "AGENT_MODEL": "fake",
+        "PHOENIX_DOCS_MCP_URL": stub_url,
+        # Measure the upstream path, not the local docs index
+        "PHOENIX_DOCS_LOCAL": "false",
+        # Every request must run the agent, or TTFT and throughput measure cache hits
+        "ANSWER_CACHE_ENABLED": "false",
+        "SINGLE_FLIGHT_ENABLED": "false",
+        # Load tests send more calls than one client may; bench_admission.py turns it back on
+        "ADMISSION_ENABLED": "false",
+        "GITHUB_PERSONAL_ACCESS_TOKEN": "",
+        "ARIZE_API_KEY": "",
+        "MCP_SCHEMA_CACHE": str(Path(work_dir) / "tool_schemas.json"),
+        "WEB_CONCURRENCY": str(workers),
+        **extra_env,
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main_agent_server:app",
+            "--app-dir", str(REPO_ROOT / "servers"),
+            "--port", str(port),
+            "--workers", str(workers),
+            "--log-level", "warning",
+        ],
+        cwd=work_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None:
+            break
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"Agent OS server did not become ready on port {port}")
+
+
+def read_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (psutil if installed, else /proc)"""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def child_pids(pid: int) -> List[int]:
+    """Direct children of a process, e.g. the workers of a uvicorn --workers server"""
+    children = []
+    for task in Path(f"/proc/{pid}/task").glob("*/children"):
+        try:
+            children += [int(child) for child in task.read_text().split()]
+        except OSError:
+            pass
+    return children
+
+
+def read_tree_rss_mb(pid: int) -> Optional[float]:
+    """RSS of a process plus its worker processes in MB"""
+    values = [read_rss_mb(p) for p in [pid, *child_pids(pid)]]
+    values = [v for v in values if v is not None]
+    return sum(values) if values else None
+
+
+async def sample_rss(pid: Optional[int], samples: List[float], interval: float = 0.5) -> None:
+    if pid is None:
+        return
+    while True:
+        rss = read_tree_rss_mb(pid)
+        if rss is not None:
+            samples.append(rss)
+        await asyncio.sleep(interval)
+
+
+# ==========================================
+# Load generation
+# ==========================================
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parse "run_agent=9,get_agentos_config=1" into tool weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+
+def request_arguments(tool: str, rng: random.Random, db_id: Optional[str]) -> Dict[str, Any]:
+    if tool == "run_agent":
+        return {"agent_id": AGENT_ID, "message": rng.choice(QUESTIONS)}
+    if tool == "get_sessions_for_agent":
+        return {"agent_id": AGENT_ID, "db_id": db_id}
+    return {}
+
+
+async def get_db_id(session: ClientSession) -> Optional[str]:
+    """The session tools need the id of the agent's database"""
+    result = await session.call_tool("get_agentos_config", {})
+    databases = (result.structuredContent or {}).get("databases") or []
+    return databases[0] if databases else None
+
+
+def time_to_first_token(result: Any) -> Optional[float]:
+    """Read the server-side TTFT from a run_agent result"""
+    payload = result.structuredContent
+    if payload is None and result.content:
+        try:
+            payload = json.loads(result.content[0].text)
+        except (AttributeError, ValueError):
+            return None
+    if isinstance(payload, dict) and "result" in payload and isinstance(payload["result"], dict):
+        payload = payload["result"]
+    metrics = (payload or {}).get("metrics") or {}
+    return metrics.get("time_to_first_token")
+
+
+async def worker(
+    url: str,
+    weights: Dict[str, int],
+    seed: int,
+    warmup_until: float,
+    stop_at: float,
+    records: List[Dict[str, Any]],
+) -> None:
+    """One MCP client issuing requests back to back until the deadline"""
+    rng = random.Random(seed)
+    tools, tool_weights = list(weights), list(weights.values())
+    async with streamablehttp_client(url) as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            db_id = await get_db_id(session)
+            while time.monotonic() < stop_at:
+                tool = rng.choices(tools, tool_weights)[0]
+                start = time.monotonic()
+                record: Dict[str, Any] = {"tool": tool}
+                try:
+                    result = await session.call_tool(tool, request_arguments(tool, rng, db_id))
+                    record["ok"] = not result.isError
+                    if result.isError:
+                        record["error"] = result.content[0].text if result.content else "error"
+                    if tool == "run_agent" and record["ok"]:
+                        record["ttft"] = time_to_first_token(result)
+                except Exception as e:
+                    record["ok"] = False
+                    record["error"] = str(e)
+                record["latency"] = time.monotonic() - start
+                if start >= warmup_until:
+                    records.append(record)
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(records: List[Dict[str, Any]], duration: float) -> Dict[str, Any]:
+    latencies = [r["latency"] * 1000 for r in records]
+    errors = sum(not r["ok"] for r in records)
+    ttfts = [r["ttft"] * 1000 for r in records if r.get("ttft") is not None]
+    return {
+        "requests": len(records),
+        "errors": errors,
+        "error_rate": round(errors / len(records), 4) if records else 0.0,
+        "throughput_rps": round(len(records) / duration, 2),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "ttft_p50_ms": percentile(ttfts, 50),
+        "ttft_p95_ms": percentile(ttfts, 95),
+    }
+
+
+async def run_load(
+    url: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    weights: Dict[str, int],
+    server_pid: Optional[int],
+    seed: int,
+) -> Dict[str, Any]:
+    records: List[Dict[str, Any]] = []
+    rss: List[float] = []
+    sampler = asyncio.create_task(sample_rss(server_pid, rss))
+
+    start = time.monotonic()
+    warmup_until, stop_at = start + warmup, start + warmup + duration
+    await asyncio.gather(
+        *(worker(url, weights, seed + i, warmup_until, stop_at, records) for i in range(concurrency))
+    )
+    sampler.cancel()
+
+    return {
+        "overall": summarize(records, duration),
+        "per_tool": {
+            tool: summarize([r for r in records if r["tool"] == tool], duration) for tool in weights
+        },
+        "server_rss_mb": {
+            "start": round(rss[0], 1) if rss else None,
+            "peak": round(max(rss), 1) if rss else None,
+            "end": round(rss[-1], 1) if rss else None,
+        },
+        "sample_errors": sorted({r["error"] for r in records if "error" in r})[:5],
+    }
+
+
+# ==========================================
+# Reporting
+# ==========================================
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def format_ms(value: Optional[float]) -> str:
+    return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    print("=" * 78)
+    print(f"MCP Load Benchmark @ {results['commit']}")
+    config = results["config"]
+    print(
+        f"Concurrency {config['concurrency']}, {config['duration']}s, mix {config['mix']}, "
+        f"{config.get('workers', 1)} worker(s)"
+    )
+    print("=" * 78)
+    print(f"{'tool':<24}{'req':>7}{'rps':>8}{'err%':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'ttft ms':>9}")
+    rows = [("overall", results["overall"]), *results["per_tool"].items()]
+    for name, stats in rows:
+        print(
+            f"{name:<24}{stats['requests']:>7}{stats['throughput_rps']:>8.1f}{stats['error_rate'] * 100:>7.1f}"
+            f"{format_ms(stats['p50_ms'])}{format_ms(stats['p95_ms'])}{format_ms(stats['p99_ms'])}"
+            f"{format_ms(stats['ttft_p50_ms'])}"
+        )
+    rss = results["server_rss_mb"]
+    print(f"Server RSS MB: start {rss['start']}, peak {rss['peak']}, end {rss['end']}")
+    for error in results["sample_errors"]:
+        print(f"Error: {error}")
+    print("=" * 78)
+
+
+def print_comparison(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print the change against a previous results file"""
+    print(f"Compared with {baseline['commit']} ({baseline['timestamp']}):")
+    for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "ttft_p50_ms", "error_rate"):
+        old, new = baseline["overall"].get(key), results["overall"].get(key)
+        if old and new is not None:
+            print(f"  {key:<16}{old:>10.2f} -> {new:>10.2f} ({(new - old) / old * 100:+.1f}%)")
+    old_rss, new_rss = baseline["server_rss_mb"].get("peak"), results["server_rss_mb"].get("peak")
+    if old_rss and new_rss:
+        print(f"  {'peak_rss_mb':<16}{old_rss:>10.1f} -> {new_rss:>10.1f} ({(new_rss - old_rss) / old_rss * 100:+.1f}%)")
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    weights = parse_mix(args.mix)
+    processes: List[subprocess.Popen] = []
+    url, server_pid = args.url, args.server_pid
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        try:
+            if url is None:
+                processes.append(launch_stub_server(args.stub_port, delay=args.upstream_delay))
+                stub_url = f"http://127.0.0.1:{args.stub_port}/mcp"
+                extra_env = {
+                    "FAKE_MODEL_LATENCY_SECONDS": str(args.model_latency),
+                    "FAKE_MODEL_TOKENS_PER_SECOND": str(args.model_tps),
+                    **dict(item.split("=", 1) for item in args.server_env),
+                }
+                server = launch_agent_server(args.port, stub_url, work_dir, extra_env, args.workers)
+                processes.append(server)
+                url, server_pid = f"http://127.0.0.1:{args.port}/mcp", server.pid
+
+            load = await run_load(url, args.concurrency, args.duration, args.warmup, weights, server_pid, args.seed)
+        finally:
+            for process in processes:
+                process.terminate()
+                process.wait()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "url": url,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "mix": weights,
+            "upstream_delay": args.upstream_delay,
+            "model_latency": args.model_latency,
+            "model_tokens_per_second": args.model_tps,
+            "server_env": args.server_env,
+            "workers": args.workers,
+        },
+        **load,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Agent OS /mcp endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of load before measuring")
+    parser.add_argument("--mix", default="run_agent=9,get_agentos_config=1")
+    parser.add_argument("--upstream-delay", type=float, default=0.05, help="Stub upstream latency per tool call")
+    parser.add_argument("--model-latency", type=float, default=0.0, help="Fake model seconds to first token")
+    parser.add_argument("--model-tps", type=float, default=0.0, help="Fake model output tokens per second")
+    parser.add_argument("--workers", type=int, default=1, help="Server worker processes (WEB_CONCURRENCY)")
+    parser.add_argument("--port", type=int, default=7788)
+    parser.add_argument("--stub-port", type=int, default=8768)
+    parser.add_argument(
+        "--server-env",
+        nargs="*",
+        default=[],
+        help="Extra KEY=VALUE settings for the server, e.g. MCP_POOL_SIZE=0",
+    )
+    parser.add_argument("--url", help="Benchmark an already running server instead of starting one")
+    parser.add_argument("--server-pid", type=int, help="PID of that server, for RSS sampling")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Results file (default tmp/bench/bench_mcp_<commit>.json)")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args))
+    print_report(results)
+    if args.compare:
+        print_comparison(results, json.loads(Path(args.compare).read_text()))
+
+    output = Path(args.output or REPO_ROOT / "tmp" / "bench" / f"bench_mcp_{results['commit']}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
@@ -0,0 +1,96 @@
+"""
+MCP Pool Benchmark - One shared session vs a pool of warm sessions
+
+Spawns the stub MCP server over stdio in serial mode, so each session
+behaves like a single-threaded upstream subprocess (as with the npx
+GitHub MCP server). The same concurrent workload is then run against one
+shared MCPTools session and against an MCPSessionPool.
+
+Usage:
+    python3 scripts/bench_mcp_pool.py --concurrency 8 --calls 64 --pool-size 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.tools.mcp import MCPTools
+
+from common.mcp_pool import MCPSessionPool
+from stub_mcp_server import find_function
+
+STUB_SERVER = Path(__file__).resolve().parent / "stub_mcp_server.py"
+
+
+async def run_load(call: Callable[[], Awaitable], concurrency: int, calls: int) -> Dict[str, float]:
+    """Run `calls` tool calls with `concurrency` workers and summarize latency"""
+    latencies: List[float] = []
+    remaining = iter(range(calls))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "wall_s": elapsed,
+        "throughput": calls / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+    }
+
+
+async def run_benchmark(concurrency: int, calls: int, pool_size: int, delay: float) -> None:
+    command = f"{sys.executable} {STUB_SERVER} --transport stdio --serial --delay {delay}"
+    arguments = {"owner": "Arize-ai", "repo": "phoenix"}
+
+    async with MCPTools(command=command, timeout_seconds=60) as shared:
+        list_issues = find_function(shared, "list_issues")
+        shared_result = await run_load(lambda: list_issues.entrypoint(**arguments), concurrency, calls)
+
+        pool = MCPSessionPool(shared, name="stub", min_size=pool_size, max_size=pool_size)
+        await pool.start()
+        try:
+            pool_result = await run_load(lambda: pool.call(list_issues.name, arguments), concurrency, calls)
+            pool_stats = pool.stats()
+        finally:
+            await pool.close()
+
+    print("=" * 60)
+    print("MCP Session Pool Benchmark")
+    print("=" * 60)
+    print(f"Upstream: serial stdio stub, {delay * 1000:.0f} ms per call")
+    print(f"Workload: {calls} calls, {concurrency} concurrent")
+    print()
+    print(f"{'mode':<16}{'wall (s)':>10}{'calls/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}")
+    for label, result in [("shared session", shared_result), (f"pool of {pool_size}", pool_result)]:
+        print(
+            f"{label:<16}{result['wall_s']:>10.2f}{result['throughput']:>10.1f}"
+            f"{result['p50_ms']:>10.0f}{result['p95_ms']:>10.0f}"
+        )
+    print()
+    print(f"Pool stats: {pool_stats}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs shared MCP sessions")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=64)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.concurrency, args.calls, args.pool_size, args.delay))
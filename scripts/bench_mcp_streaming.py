@@ -0,0 +1,78 @@
+"""
+MCP Streaming Benchmark - Time to first output of run_agent over /mcp
+
+Calls the run_agent tool of a running Agent OS the way a team client does,
+once without progress (the whole run arrives at the end) and once with
+enable_tool_progress (the answer streams in as progress notifications).
+Reports the time to the first output and to the full result per call.
+
+Start the server first, without the answer cache so every call runs the
+agent, e.g. offline with a slow fake model:
+    AGENT_MODEL=fake FAKE_MODEL_TOKENS_PER_SECOND=40 ANSWER_CACHE_ENABLED=false python3 servers/main_agent_server.py
+
+Usage:
+    python3 scripts/bench_mcp_streaming.py --url http://localhost:7777/mcp --runs 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.tools.mcp import MCPTools
+
+from common.mcp_streaming import enable_tool_progress
+from stub_mcp_server import find_function
+
+
+async def time_call(url: str, message: str, stream: bool) -> Dict[str, float]:
+    first_output: Optional[float] = None
+
+    def on_progress(delta: str) -> None:
+        nonlocal first_output
+        if first_output is None:
+            first_output = time.perf_counter() - start
+
+    async with MCPTools(transport="streamable-http", url=url, timeout_seconds=120) as community_mcp:
+        if stream:
+            enable_tool_progress(community_mcp, on_progress)
+        run_agent = find_function(community_mcp, "run_agent")
+        start = time.perf_counter()
+        await run_agent.entrypoint(agent_id="community-support-agent", message=message)
+        total = time.perf_counter() - start
+    return {"first_output": first_output if first_output is not None else total, "total": total}
+
+
+async def run_benchmark(url: str, runs: int) -> None:
+    results: Dict[str, List[Dict[str, float]]] = {"no progress": [], "streamed": []}
+    for i in range(runs):
+        message = f"How do I trace a LangChain app with Phoenix? (run {i})"
+        results["no progress"].append(await time_call(url, message, stream=False))
+        results["streamed"].append(await time_call(url, message, stream=True))
+
+    print("=" * 60)
+    print("MCP Streaming Benchmark")
+    print("=" * 60)
+    print(f"{runs} run_agent calls per mode against {url}")
+    print()
+    print(f"{'mode':<14}{'first output (s)':>18}{'full result (s)':>18}")
+    for mode, calls in results.items():
+        print(
+            f"{mode:<14}{statistics.mean(c['first_output'] for c in calls):>18.2f}"
+            f"{statistics.mean(c['total'] for c in calls):>18.2f}"
+        )
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark time to first output of run_agent over /mcp")
+    parser.add_argument("--url", default="http://localhost:7777/mcp")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.url, args.runs))
@@ -0,0 +1,99 @@
+"""
+Schema Cache Benchmark - Connect latency with and without cached tool schemas
+
+Starts the stub MCP server with a simulated list_tools latency and times
+short-lived client connects, the way a cron-launched team client connects,
+asks one question and exits:
+
+- uncached: plain `async with MCPTools(...)`, list_tools on every connect
+- cached: `async with schema_cached(MCPTools(...))` with a fresh cache file,
+  so only the first connect fetches schemas from the server
+
+Usage:
+    python3 scripts/bench_schema_cache.py --connects 20 --list-tools-delay 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.tools.mcp import MCPTools
+
+from common.schema_cache import SchemaCache, schema_cached
+from stub_mcp_server import find_function, launch_stub_server
+
+
+def create_tools(url: str) -> MCPTools:
+    return MCPTools(transport="streamable-http", url=url, timeout_seconds=30)
+
+
+async def time_connects(url: str, connects: int, cache_file: str = None) -> List[float]:
+    """Open and close a fresh client session per connect, like separate client processes"""
+    latencies = []
+    for _ in range(connects):
+        start = time.perf_counter()
+        if cache_file is None:
+            async with create_tools(url):
+                latencies.append(time.perf_counter() - start)
+        else:
+            # A new SchemaCache per connect re-reads the file, as a new process would
+            async with schema_cached(create_tools(url), SchemaCache(path=cache_file)):
+                latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def list_tools_count(url: str) -> int:
+    async with create_tools(url) as tools:
+        result = await find_function(tools, "stub_stats").entrypoint()
+    return json.loads(result.content).get("list_tools", 0)
+
+
+async def run_benchmark(port: int, connects: int, list_tools_delay: float) -> None:
+    url = f"http://127.0.0.1:{port}/mcp"
+    server = launch_stub_server(port, extra_args=["--list-tools-delay", str(list_tools_delay)])
+    try:
+        before = await list_tools_count(url)
+        uncached = await time_connects(url, connects)
+        middle = await list_tools_count(url)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cached = await time_connects(url, connects, cache_file=str(Path(tmp_dir) / "tool_schemas.json"))
+        after = await list_tools_count(url)
+    finally:
+        server.terminate()
+        server.wait()
+
+    # Each list_tools_count call does one list_tools of its own
+    uncached_lists = middle - before - 1
+    cached_lists = after - middle - 1
+
+    print("=" * 60)
+    print("Tool Schema Cache Benchmark")
+    print("=" * 60)
+    print(f"Connects per mode: {connects}, simulated list_tools latency: {list_tools_delay * 1000:.0f} ms")
+    print()
+    print(f"{'mode':<10}{'p50 ms':>10}{'max ms':>10}{'list_tools':>12}")
+    for mode, latencies, lists in (("uncached", uncached, uncached_lists), ("cached", cached, cached_lists)):
+        print(
+            f"{mode:<10}{statistics.median(latencies) * 1000:>10.1f}"
+            f"{max(latencies) * 1000:>10.1f}{lists:>12}"
+        )
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the on-disk tool schema cache")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--connects", type=int, default=20)
+    parser.add_argument("--list-tools-delay", type=float, default=0.2)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.port, args.connects, args.list_tools_delay))
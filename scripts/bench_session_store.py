@@ -0,0 +1,149 @@
+"""
+Session Store Benchmark - Concurrent session throughput, plain vs tuned SQLite
+
+Simulates agents with add_history_to_context=True: every turn reads the
+session (all earlier runs), appends a run and saves the whole session back.
+Each worker thread drives its own sessions, so workers contend for the
+database the way concurrent runs and server workers do.
+
+- plain: Agno's SqliteDb, as the servers used before
+- tuned: TunedSqliteDb (WAL, pooled connections, write-behind batching)
+
+Reports turns per second, per-turn database time (time the request path is
+blocked on SQLite), failed turns and the tuned store's batching counters.
+
+Usage:
+    python3 scripts/bench_session_store.py --workers 8 --sessions 32 --turns 10
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.db.base import SessionType
+from agno.models.message import Message
+from agno.run.agent import RunOutput
+from agno.session import AgentSession
+
+from common.session_store import create_session_db
+
+
+def make_run(session_id: str, turn: int, answer_chars: int) -> RunOutput:
+    question = f"Turn {turn}: what are the most critical bugs reported this week?"
+    answer = ("The most critical open issues are tracing gaps and export failures. " * 64)[:answer_chars]
+    return RunOutput(
+        run_id=f"{session_id}-{turn}",
+        agent_id="community-support-agent",
+        session_id=session_id,
+        content=answer,
+        messages=[Message(role="user", content=question), Message(role="assistant", content=answer)],
+        created_at=int(time.time()),
+    )
+
+
+def run_session(db, session_id: str, turns: int, answer_chars: int, think_seconds: float) -> Dict[str, Any]:
+    """Run the read-append-save cycle of one session and time the database calls"""
+    db_seconds: List[float] = []
+    failures = 0
+    for turn in range(turns):
+        try:
+            start = time.perf_counter()
+            session = db.get_session(session_id=session_id, session_type=SessionType.AGENT)
+            if session is None:
+                session = AgentSession(session_id=session_id, agent_id="community-support-agent", runs=[],
+                                       created_at=int(time.time()))
+            history = session.runs or []
+            read_seconds = time.perf_counter() - start
+
+            # The model call, during which the request holds no database lock
+            time.sleep(think_seconds)
+
+            session.runs = history + [make_run(session_id, turn, answer_chars)]
+            start = time.perf_counter()
+            db.upsert_session(session)
+            db_seconds.append(read_seconds + time.perf_counter() - start)
+        except Exception as e:
+            failures += 1
+            print(f"Warning: turn {turn} of {session_id} failed: {e}")
+    return {"db_seconds": db_seconds, "failures": failures}
+
+
+def run_mode(mode: str, workers: int, sessions: int, turns: int, answer_chars: int, think_seconds: float) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = create_session_db(str(Path(tmp_dir) / "sessions.db"), mode=mode, pool_size=workers)
+        # Create the table up front so both modes measure steady-state turns
+        db._get_table(table_type="sessions", create_table_if_not_found=True)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                lambda i: run_session(db, f"session-{i}", turns, answer_chars, think_seconds),
+                range(sessions),
+            ))
+        if mode == "tuned":
+            db.close()
+        wall_seconds = time.perf_counter() - start
+
+        # Every run of every session must have reached the file
+        stored = db.get_sessions(session_type=SessionType.AGENT)
+        stored_runs = sum(len(session.runs or []) for session in stored)
+
+    db_seconds = sorted(s for result in results for s in result["db_seconds"])
+    completed = len(db_seconds)
+    summary = {
+        "mode": mode,
+        "wall_seconds": round(wall_seconds, 3),
+        "turns": completed,
+        "failed_turns": sum(result["failures"] for result in results),
+        "turns_per_second": round(completed / wall_seconds, 1),
+        "db_ms_p50": round(statistics.median(db_seconds) * 1000, 2) if db_seconds else None,
+        "db_ms_p95": round(db_seconds[int(0.95 * (completed - 1))] * 1000, 2) if db_seconds else None,
+        "stored_runs": stored_runs,
+    }
+    if mode == "tuned":
+        summary["store"] = db.stats()
+    return summary
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    print("=" * 72)
+    print("Session Store Benchmark")
+    print("=" * 72)
+    print(f"{'mode':<8}{'turns/s':>10}{'db p50 ms':>12}{'db p95 ms':>12}{'failed':>8}{'stored runs':>13}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['turns_per_second']:>10}{r['db_ms_p50']:>12}{r['db_ms_p95']:>12}"
+              f"{r['failed_turns']:>8}{r['stored_runs']:>13}")
+    for r in results:
+        if "store" in r:
+            print(f"Tuned store: {r['store']}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent session writes: plain vs tuned SQLite")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent worker threads")
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--turns", type=int, default=10, help="Runs per session")
+    parser.add_argument("--answer-chars", type=int, default=2000, help="Size of each stored answer")
+    parser.add_argument("--think-seconds", type=float, default=0.0, help="Simulated model time per turn")
+    parser.add_argument("--modes", nargs="*", default=["plain", "tuned"], choices=["plain", "tuned"])
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = [
+        run_mode(mode, args.workers, args.sessions, args.turns, args.answer_chars, args.think_seconds)
+        for mode in args.modes
+    ]
+    print_results(results)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
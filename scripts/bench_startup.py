@@ -0,0 +1,108 @@
+"""
+Startup Benchmark - First request cost with and without eager upstream startup
+
+Spawns two stdio stub MCP servers (docs-like and GitHub-like) that wait
+before serving, like `npx -y` resolving a package. Measures:
+
+- cold: connecting upstreams one after another on the first request, as an
+  agent does when nothing was connected at boot, plus the first tool call
+- warm: UpstreamStartup connecting everything in parallel at boot, then the
+  first tool call and the steady-state call latency
+
+Usage:
+    python3 scripts/bench_startup.py --startup-delay 1.0
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.tools.mcp import MCPTools
+
+from common.mcp_pool import ManagedConnection
+from common.startup import UpstreamStartup
+from stub_mcp_server import find_function
+
+STUB_SERVER = Path(__file__).resolve().parent / "stub_mcp_server.py"
+
+
+def create_upstreams(startup_delay: float) -> Dict[str, MCPTools]:
+    """Two stub upstreams over stdio, each with a simulated boot delay"""
+    command = f"{sys.executable} {STUB_SERVER} --transport stdio --startup-delay {startup_delay}"
+    return {
+        "phoenix_docs": MCPTools(command=command, timeout_seconds=60),
+        "github": MCPTools(command=command, timeout_seconds=60),
+    }
+
+
+async def first_call(upstreams: Dict[str, MCPTools]) -> None:
+    search = find_function(upstreams["phoenix_docs"], "search_docs")
+    await search.entrypoint(query="tracing")
+
+
+async def run_cold(startup_delay: float) -> float:
+    """Connect upstreams lazily and sequentially, then make the first call"""
+    upstreams = create_upstreams(startup_delay)
+    connections = []
+    start = time.perf_counter()
+    for tools in upstreams.values():
+        connection = ManagedConnection(tools)
+        await connection.open()
+        connections.append(connection)
+    await first_call(upstreams)
+    elapsed = time.perf_counter() - start
+    for connection in connections:
+        await connection.close()
+    return elapsed
+
+
+async def run_warm(startup_delay: float, calls: int) -> Dict[str, float]:
+    """Start upstreams in parallel at boot, then make the first and later calls"""
+    upstreams = create_upstreams(startup_delay)
+    startup = UpstreamStartup(upstreams)
+    await startup.start()
+    try:
+        start = time.perf_counter()
+        await first_call(upstreams)
+        first = time.perf_counter() - start
+
+        steady = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            await first_call(upstreams)
+            steady.append(time.perf_counter() - start)
+    finally:
+        await startup.stop()
+
+    return {"boot": startup.startup_seconds, "first": first, "steady": statistics.median(steady)}
+
+
+async def run_benchmark(startup_delay: float, calls: int) -> None:
+    cold_first = await run_cold(startup_delay)
+    warm = await run_warm(startup_delay, calls)
+
+    print("=" * 60)
+    print("Upstream Startup Benchmark")
+    print("=" * 60)
+    print(f"Upstreams: 2 stdio stubs, {startup_delay:.1f} s simulated boot each")
+    print()
+    print(f"Cold first call (lazy, sequential connect): {cold_first * 1000:8.1f} ms")
+    print(f"Boot time (parallel startup phase):         {warm['boot'] * 1000:8.1f} ms")
+    print(f"Warm first call (after startup):            {warm['first'] * 1000:8.1f} ms")
+    print(f"Steady-state call (median of {calls}):          {warm['steady'] * 1000:8.1f} ms")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark eager upstream startup")
+    parser.add_argument("--startup-delay", type=float, default=1.0)
+    parser.add_argument("--calls", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.startup_delay, args.calls))
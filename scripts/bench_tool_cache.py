@@ -0,0 +1,79 @@
+"""
+Tool Cache Benchmark - Verify cached tool calls skip the upstream
+
+Starts the local stub MCP server with simulated latency, then calls the same
+docs tool repeatedly through the cache hook used by main_agent_server.py.
+Reports latency for cold and cached calls, the number of calls that reached
+the stub, and the cache hit/miss counters.
+
+Usage:
+    python3 scripts/bench_tool_cache.py --delay 0.5 --calls 20
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.tools.mcp import MCPTools
+
+from common.tool_cache import ToolCallCache, create_cache_hook
+from stub_mcp_server import find_function, launch_stub_server
+
+
+async def run_benchmark(port: int, delay: float, calls: int) -> None:
+    """Call one docs tool repeatedly through the cache hook and report the results"""
+    url = f"http://127.0.0.1:{port}/mcp"
+    stub = launch_stub_server(port, delay)
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ToolCallCache(db_file=str(Path(tmp_dir) / "tool_cache.db"), ttl_seconds=60)
+
+            async with MCPTools(transport="streamable-http", url=url, timeout_seconds=30) as docs_mcp:
+                hook = create_cache_hook(cache, [docs_mcp])
+                search = find_function(docs_mcp, "search_docs")
+                stub_stats = find_function(docs_mcp, "stub_stats")
+                before = (await stub_stats.entrypoint()).content
+
+                latencies = []
+                for i in range(calls):
+                    # Vary whitespace to show that arguments are normalized
+                    query = "How does tracing work?" if i % 2 == 0 else "  How does   tracing work? "
+                    start = time.perf_counter()
+                    await hook(function_name=search.name, function_call=search.entrypoint, arguments={"query": query})
+                    latencies.append(time.perf_counter() - start)
+
+                after = (await stub_stats.entrypoint()).content
+
+            # A second cache on the same file starts warm, as after a restart
+            restarted = ToolCallCache(db_file=str(Path(tmp_dir) / "tool_cache.db"), ttl_seconds=60)
+            warm_hit = restarted.get(search.name, {"query": "How does tracing work?"}) is not None
+
+        cached = latencies[1:]
+        print("=" * 60)
+        print("Tool Cache Benchmark")
+        print("=" * 60)
+        print(f"Simulated upstream latency: {delay * 1000:.0f} ms")
+        print(f"Cold call:                  {latencies[0] * 1000:.1f} ms")
+        print(f"Cached calls (avg of {len(cached)}):   {sum(cached) / len(cached) * 1000:.3f} ms")
+        print(f"Stub stats before/after:    {before} -> {after}")
+        print(f"Cache stats:                {cache.stats()}")
+        print(f"Warm after restart:         {warm_hit}")
+        print("=" * 60)
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the MCP tool call cache")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.5)
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.port, args.delay, args.calls))
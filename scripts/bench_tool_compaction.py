@@ -0,0 +1,151 @@
+"""
+Tool Compaction Benchmark - Size of tool results before and after compaction
+
+Generates tool results in the shape the GitHub MCP server returns them
+(issue pages with full API objects and long bodies, comment threads with
+repeated bot comments, a single issue) plus Phoenix docs search results,
+runs them through ToolResultCompactor and reports per result type:
+
+- raw and compacted bytes and estimated tokens
+- the time compaction takes per result
+- the tokens a result costs over a run and --history-runs later turns
+  that carry it in their history
+
+Usage:
+    python3 scripts/bench_tool_compaction.py --issues 30 --body-chars 4000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_mcp import percentile
+from common.tokens import estimate_tokens
+from common.tool_compaction import CompactionPolicy, ToolResultCompactor
+
+REPO = "Arize-ai/phoenix"
+API = f"https://api.github.com/repos/{REPO}"
+WORDS = ["tracing", "span", "otel", "eval", "dataset", "prompt", "docker", "crash", "slow", "export", "async", "error"]
+
+
+def github_user(login: str) -> Dict[str, Any]:
+    return {
+        "login": login, "id": hash(login) % 10**8, "node_id": "MDQ6VXNlcjE=", "avatar_url": f"https://avatars.githubusercontent.com/{login}",
+        "gravatar_id": "", "url": f"https://api.github.com/users/{login}", "html_url": f"https://github.com/{login}",
+        **{f"{name}_url": f"https://api.github.com/users/{login}/{name}" for name in (
+            "followers", "following", "gists", "starred", "subscriptions", "organizations", "repos", "events", "received_events",
+        )},
+        "type": "User", "user_view_type": "public", "site_admin": False,
+    }
+
+
+def paragraphs(rng: random.Random, chars: int) -> str:
+    text = []
+    while sum(len(p) for p in text) < chars:
+        text.append(" ".join(rng.choices(WORDS, k=rng.randint(20, 60))))
+    # Issue templates repeat their boilerplate
+    text.insert(1, "### Environment\n\nPhoenix version: latest, Python 3.11")
+    text.append("### Environment\n\nPhoenix version: latest, Python 3.11")
+    return "\n\n".join(text)
+
+
+def github_issue(number: int, rng: random.Random, body_chars: int) -> Dict[str, Any]:
+    url = f"{API}/issues/{number}"
+    return {
+        "url": url, "repository_url": API, "labels_url": f"{url}/labels{{/name}}", "comments_url": f"{url}/comments",
+        "events_url": f"{url}/events", "html_url": f"https://github.com/{REPO}/issues/{number}", "id": 10**9 + number,
+        "node_id": "I_kwDOA", "number": number, "title": " ".join(rng.sample(WORDS, 5)),
+        "user": github_user(f"user-{rng.randint(1, 200)}"),
+        "labels": [
+            {"id": i, "node_id": "LA_kw", "url": f"{API}/labels/{name}", "name": name, "color": "d73a4a", "default": False,
+             "description": f"{name} issues"}
+            for i, name in enumerate(rng.sample(["bug", "enhancement", "tracing", "evals", "triage"], 2))
+        ],
+        "state": "open", "locked": False, "assignee": None, "assignees": [], "milestone": None,
+        "comments": rng.randint(0, 30), "created_at": "2025-06-01T10:00:00Z", "updated_at": "2025-06-02T10:00:00Z",
+        "closed_at": None, "author_association": "NONE", "type": None, "active_lock_reason": None,
+        "sub_issues_summary": {"total": 0, "completed": 0, "percent_completed": 0},
+        "body": paragraphs(rng, body_chars), "closed_by": None,
+        "reactions": {"url": f"{url}/reactions", "total_count": 3, "+1": 3, "-1": 0, "laugh": 0, "hooray": 0,
+                      "confused": 0, "heart": 0, "rocket": 0, "eyes": 0},
+        "timeline_url": f"{url}/timeline", "performed_via_github_app": None, "state_reason": None,
+    }
+
+
+def github_comments(rng: random.Random, count: int, body_chars: int) -> List[Dict[str, Any]]:
+    comments = []
+    for i in range(count):
+        bot = i % 4 == 0
+        comments.append({
+            "url": f"{API}/issues/comments/{i}", "html_url": f"https://github.com/{REPO}/issues/1#issuecomment-{i}",
+            "issue_url": f"{API}/issues/1", "id": i, "node_id": "IC_kw",
+            "user": github_user("dosubot[bot]" if bot else f"user-{rng.randint(1, 200)}"),
+            "created_at": "2025-06-01T10:00:00Z", "updated_at": "2025-06-01T10:00:00Z", "author_association": "NONE",
+            "body": "Hi! I'm a bot. This issue has been labeled as stale." if bot else paragraphs(rng, body_chars // 4),
+            "reactions": {"url": f"{API}/issues/comments/{i}/reactions", "total_count": 0}, "performed_via_github_app": None,
+        })
+    return comments
+
+
+def docs_results(rng: random.Random) -> str:
+    results = [
+        {"title": f"Tracing guide {i}", "url": f"https://arize.com/docs/phoenix/tracing-{i}.md",
+         "text": paragraphs(rng, 1500), "score": round(rng.random(), 3)}
+        for i in range(5)
+    ]
+    return json.dumps({"query": "how do I trace", "results": results})
+
+
+def run_benchmark(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    cases = {
+        "list_issues": ("github", json.dumps([github_issue(n, rng, args.body_chars) for n in range(1, args.issues + 1)])),
+        "issue_comments": ("github", json.dumps(github_comments(rng, args.issues, args.body_chars))),
+        "get_issue": ("github", json.dumps(github_issue(1, rng, args.body_chars))),
+        "search_docs": ("phoenix_docs", docs_results(rng)),
+    }
+
+    print("=" * 86)
+    print("Tool Compaction Benchmark")
+    print(f"{args.issues} issues per page, {args.body_chars} character bodies, {args.history_runs} later turns carry each result")
+    print("=" * 86)
+    print(f"{'result':<16}{'raw KB':>9}{'out KB':>9}{'raw tok':>10}{'out tok':>10}{'saved':>8}{'p50 ms':>9}{'turn tok':>15}")
+    with tempfile.TemporaryDirectory() as work_dir:
+        compactor = ToolResultCompactor(db_file=str(Path(work_dir) / "results.db"), default_policy=CompactionPolicy())
+        for name, (upstream, content) in cases.items():
+            samples = []
+            for _ in range(args.repeats):
+                start = time.perf_counter()
+                compacted = compactor.compact(upstream, name, content)
+                samples.append((time.perf_counter() - start) * 1000)
+            raw_tokens, out_tokens = estimate_tokens(content), estimate_tokens(compacted)
+            turns = 1 + args.history_runs
+            print(
+                f"{name:<16}{len(content) / 1024:>9.1f}{len(compacted) / 1024:>9.1f}{raw_tokens:>10}{out_tokens:>10}"
+                f"{1 - len(compacted) / len(content):>8.0%}{percentile(samples, 50):>9.2f}"
+                f"{raw_tokens * turns:>8} -> {out_tokens * turns:<6}"
+            )
+        stats = compactor.stats()
+    print("-" * 86)
+    for upstream, counters in stats["upstreams"].items():
+        print(f"{upstream:<16}{counters['results']:>6} results, {counters['stored']} payloads stored, bytes saved {counters['bytes_saved_ratio']:.0%}")
+    print("=" * 86)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark tool result compaction on GitHub and docs results")
+    parser.add_argument("--issues", type=int, default=30)
+    parser.add_argument("--body-chars", type=int, default=4000)
+    parser.add_argument("--history-runs", type=int, default=3, help="Later turns that carry a result in their history")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    run_benchmark(args)
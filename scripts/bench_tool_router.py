@@ -0,0 +1,250 @@
+"""
+Tool Router Benchmark - Tool schemas, prompt tokens and model latency with and without routing
+
+Builds the Community Support Agent's catalog as the model sees it with the
+live GitHub MCP server (GITHUB_MODE=live, about 50 tools in the shape of
+github/github-mcp-server) plus the local and remote Phoenix docs tools,
+then runs labelled team questions through an Agent on the fake model:
+
+- without routing: every tool schema goes with every model call
+- routed by upstream (the default): the upstreams a question matches are
+  offered whole, so the tool list is one of a few fixed ones
+- routed top k: large upstreams only offer their --top-k best tools
+
+The fake model charges prompt tokens, tool definitions included, at
+--prefill-rate tokens per second before the first token, like a real model
+does. Reported: tools offered, prompt tokens of the first model call, run
+latency, and how often the tool a question needs was offered (routing
+misses fall back to the full catalog, which counts as offered).
+
+Anthropic's prompt cache (PromptCachingClaude) only hits when the tools
+prefix repeats, so the benchmark also reports how many distinct tool lists
+the questions got, the share of requests whose tool list was seen before
+(a cache hit), and the tool schema tokens billed at cache write price
+(1.25x) on a miss and cache read price (0.1x) on a hit.
+
+Usage:
+    python3 scripts/bench_tool_router.py --prefill-rate 5000 --latency 0.3
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.agent import Agent
+from agno.tools import Toolkit
+from agno.tools.function import Function
+
+from common.fake_model import FakeModel
+from common.tool_router import ToolRouter, enable_tool_routing, schema_tokens
+
+REPO_PARAMS = {"owner": "Repository owner", "repo": "Repository name"}
+# name -> (description, parameters, whether it also takes owner and repo)
+GITHUB_TOOLS: Dict[str, Tuple[str, Dict[str, str], bool]] = {
+    "get_me": ("Get details of the authenticated GitHub user", {}, False),
+    "search_users": ("Search for GitHub users by username, name or location", {"query": "Search query", "sort": "Sort field"}, False),
+    "search_repositories": ("Search for GitHub repositories", {"query": "Search query", "page": "Page number"}, False),
+    "search_code": ("Search for code across GitHub repositories", {"query": "Code search query", "sort": "Sort field"}, False),
+    "search_issues": ("Search for issues in GitHub repositories using issues search syntax", {"query": "Search query", "sort": "Sort field", "order": "Sort order"}, False),
+    "search_pull_requests": ("Search for pull requests in GitHub repositories", {"query": "Search query", "sort": "Sort field"}, False),
+    "list_issues": ("List issues in a GitHub repository, filtered by state, labels and date", {"state": "open, closed or all", "labels": "Label names", "since": "Updated after", "sort": "created, updated or comments"}, True),
+    "get_issue": ("Get details of a specific issue in a GitHub repository", {"issue_number": "Issue number"}, True),
+    "get_issue_comments": ("Get comments for a specific issue in a GitHub repository", {"issue_number": "Issue number"}, True),
+    "create_issue": ("Create a new issue in a GitHub repository", {"title": "Issue title", "body": "Issue body", "labels": "Labels"}, True),
+    "update_issue": ("Update an existing issue: title, body, state, labels, assignees", {"issue_number": "Issue number", "state": "New state"}, True),
+    "add_issue_comment": ("Add a comment to a specific issue in a GitHub repository", {"issue_number": "Issue number", "body": "Comment text"}, True),
+    "list_sub_issues": ("List sub-issues of a specific issue", {"issue_number": "Issue number"}, True),
+    "assign_copilot_to_issue": ("Assign Copilot to a specific issue", {"issue_number": "Issue number"}, True),
+    "list_pull_requests": ("List pull requests in a GitHub repository", {"state": "open, closed or all", "base": "Base branch", "sort": "Sort field"}, True),
+    "get_pull_request": ("Get details of a specific pull request", {"pull_number": "Pull request number"}, True),
+    "get_pull_request_files": ("Get the files changed in a specific pull request", {"pull_number": "Pull request number"}, True),
+    "get_pull_request_diff": ("Get the diff of a pull request", {"pull_number": "Pull request number"}, True),
+    "get_pull_request_status": ("Get the combined status of all status checks for a pull request", {"pull_number": "Pull request number"}, True),
+    "get_pull_request_comments": ("Get review comments of a pull request", {"pull_number": "Pull request number"}, True),
+    "get_pull_request_reviews": ("Get the reviews of a pull request", {"pull_number": "Pull request number"}, True),
+    "create_pull_request": ("Create a new pull request in a GitHub repository", {"title": "Title", "head": "Head branch", "base": "Base branch"}, True),
+    "update_pull_request": ("Update an existing pull request", {"pull_number": "Pull request number", "title": "Title"}, True),
+    "merge_pull_request": ("Merge a pull request", {"pull_number": "Pull request number", "merge_method": "merge, squash or rebase"}, True),
+    "request_copilot_review": ("Request a Copilot code review for a pull request", {"pull_number": "Pull request number"}, True),
+    "create_pending_pull_request_review": ("Create a pending review for a pull request", {"pull_number": "Pull request number"}, True),
+    "list_commits": ("Get the list of commits of a branch in a GitHub repository", {"sha": "Branch or commit", "author": "Author filter"}, True),
+    "get_commit": ("Get details for a commit from a GitHub repository", {"sha": "Commit SHA"}, True),
+    "list_branches": ("List branches in a GitHub repository", {"page": "Page number"}, True),
+    "create_branch": ("Create a new branch in a GitHub repository", {"branch": "Branch name", "from_branch": "Source branch"}, True),
+    "list_tags": ("List git tags in a GitHub repository", {"page": "Page number"}, True),
+    "get_tag": ("Get details about a specific git tag", {"tag": "Tag name"}, True),
+    "list_releases": ("List releases in a GitHub repository", {"page": "Page number"}, True),
+    "get_latest_release": ("Get the latest release in a GitHub repository", {}, True),
+    "get_release_by_tag": ("Get a specific release by its tag name", {"tag": "Tag name"}, True),
+    "get_file_contents": ("Get the contents of a file or directory from a GitHub repository", {"path": "File path", "ref": "Git ref"}, True),
+    "create_or_update_file": ("Create or update a single file in a GitHub repository", {"path": "File path", "content": "Content", "message": "Commit message"}, True),
+    "delete_file": ("Delete a file from a GitHub repository", {"path": "File path", "message": "Commit message"}, True),
+    "push_files": ("Push multiple files to a GitHub repository in a single commit", {"branch": "Branch", "files": "Files"}, True),
+    "fork_repository": ("Fork a GitHub repository to your account or organization", {"organization": "Organization"}, True),
+    "create_repository": ("Create a new GitHub repository in your account", {"name": "Repository name", "private": "Private"}, False),
+    "list_workflows": ("List GitHub Actions workflows in a repository", {"page": "Page number"}, True),
+    "list_workflow_runs": ("List workflow runs for a specific GitHub Actions workflow", {"workflow_id": "Workflow id", "status": "Run status"}, True),
+    "get_workflow_run": ("Get details of a specific GitHub Actions workflow run", {"run_id": "Run id"}, True),
+    "get_job_logs": ("Download logs for GitHub Actions workflow jobs", {"run_id": "Run id", "failed_only": "Only failed jobs"}, True),
+    "rerun_failed_jobs": ("Re-run only the failed jobs in a workflow run", {"run_id": "Run id"}, True),
+    "list_code_scanning_alerts": ("List code scanning alerts in a GitHub repository", {"state": "Alert state", "severity": "Severity"}, True),
+    "get_code_scanning_alert": ("Get details of a specific code scanning alert", {"alert_number": "Alert number"}, True),
+    "list_secret_scanning_alerts": ("List secret scanning alerts in a GitHub repository", {"state": "Alert state"}, True),
+    "list_dependabot_alerts": ("List dependabot alerts in a GitHub repository", {"state": "Alert state", "severity": "Severity"}, True),
+    "list_discussions": ("List discussions for a repository", {"category": "Discussion category"}, True),
+    "get_discussion": ("Get a specific discussion by number", {"discussion_number": "Discussion number"}, True),
+    "get_discussion_comments": ("Get comments from a discussion", {"discussion_number": "Discussion number"}, True),
+    "list_discussion_categories": ("List discussion categories of a repository", {}, True),
+    "list_notifications": ("List notifications for the authenticated GitHub user", {"filter": "Notification filter"}, False),
+    "get_notification_details": ("Get detailed information for a specific GitHub notification", {"notification_id": "Notification id"}, False),
+    "list_gists": ("List gists for a user", {"username": "GitHub username"}, False),
+    "create_gist": ("Create a new gist", {"description": "Description", "files": "Files"}, False),
+    "list_starred_repositories": ("List starred repositories of a user", {"username": "GitHub username"}, False),
+}
+DOCS_TOOLS = {
+    "phoenix_docs_local": {
+        "search_phoenix_docs": ("Search the Phoenix documentation (tracing, evals, datasets, experiments, prompts, self-hosting, integrations). Returns the best matching sections with their page URL", {"query": "Search query", "limit": "Results", "mode": "hybrid, keyword or vector"}),
+        "get_phoenix_doc_page": ("Get a whole Phoenix documentation page by the URL returned from search_phoenix_docs", {"url": "Page URL"}),
+        "docs_index_status": ("Indexed pages and chunks, last refresh and search timings", {}),
+    },
+    "phoenix_docs": {
+        "SearchArizeAx": ("Search across the Arize Phoenix knowledge base to find relevant information, code examples, API references, and guides", {"query": "Search query"}),
+    },
+}
+# Anthropic prompt cache prices relative to uncached input tokens
+CACHE_WRITE_PRICE = 1.25
+CACHE_READ_PRICE = 0.1
+# question -> a tool that answers it
+QUESTIONS = [
+    ("How do I trace an agno agent with phoenix?", "search_phoenix_docs"),
+    ("How can I self-host Phoenix with Postgres?", "search_phoenix_docs"),
+    ("Which evals does phoenix have for hallucination detection in RAG?", "search_phoenix_docs"),
+    ("Show the latest open issues in Arize-ai/phoenix", "list_issues"),
+    ("Find issues about missing spans for async tools", "search_issues"),
+    ("What are the comments on issue 4512?", "get_issue_comments"),
+    ("List open pull requests touching the evals package", "list_pull_requests"),
+    ("What changed in the latest release?", "get_latest_release"),
+    ("Which workflow runs failed on main today?", "list_workflow_runs"),
+    ("Search the code for the OTLP exporter configuration", "search_code"),
+    ("Any new discussions in the Q&A category?", "list_discussions"),
+    ("Who made the most commits last month?", "list_commits"),
+]
+
+
+def make_function(name: str, description: str, parameters: Dict[str, str]) -> Function:
+    return Function(
+        name=name,
+        description=description,
+        parameters={
+            "type": "object",
+            "properties": {param: {"type": "string", "description": text} for param, text in parameters.items()},
+            "required": list(parameters)[:1],
+        },
+        entrypoint=lambda **kwargs: f"{name}: no results for {kwargs}",
+        skip_entrypoint_processing=True,
+    )
+
+
+def build_catalog() -> Dict[str, Toolkit]:
+    upstreams = {}
+    for name, tools in DOCS_TOOLS.items():
+        toolkit = Toolkit(name=name)
+        toolkit.functions = {tool: make_function(tool, text, params) for tool, (text, params) in tools.items()}
+        upstreams[name] = toolkit
+    github = Toolkit(name="github")
+    github.functions = {
+        tool: make_function(tool, text, {**(REPO_PARAMS if repo else {}), **params})
+        for tool, (text, params, repo) in GITHUB_TOOLS.items()
+    }
+    upstreams["github"] = github
+    return upstreams
+
+
+async def run_questions(args: argparse.Namespace, router: Optional[ToolRouter]) -> Dict[str, Any]:
+    upstreams = build_catalog()
+    agent = Agent(
+        model=FakeModel(latency_seconds=args.latency, prefill_tokens_per_second=args.prefill_rate),
+        tools=list(upstreams.values()),
+        instructions="You are a helpful Community Support Agent for the Phoenix AI observability platform.",
+        telemetry=False,
+    )
+    if router is not None:
+        enable_tool_routing(agent, router, upstreams)
+
+    functions = {name: f for toolkit in upstreams.values() for name, f in toolkit.functions.items()}
+    latencies, prompt_tokens, offered, hits = [], [], [], 0
+    tool_lists, cache_hits, billed_schema_tokens = set(), 0, 0.0
+    for _ in range(args.repeats):
+        for question, needed in QUESTIONS:
+            start = time.perf_counter()
+            run = await agent.arun(question)
+            latencies.append(time.perf_counter() - start)
+            routing = (run.metadata or {}).get("tool_routing")
+            offered_names = routing.get("tools") if routing else None
+            offered.append(routing["offered"] if routing else len(functions))
+            hits += offered_names is None or needed in offered_names
+            first_call = next(m for m in run.messages if m.role == "assistant")
+            prompt_tokens.append(first_call.metrics.input_tokens)
+
+            tool_list = tuple(sorted(offered_names if offered_names is not None else functions))
+            cached = tool_list in tool_lists
+            tool_lists.add(tool_list)
+            cache_hits += cached
+            tokens = schema_tokens([functions[name] for name in tool_list if name in functions])
+            billed_schema_tokens += tokens * (CACHE_READ_PRICE if cached else CACHE_WRITE_PRICE)
+    return {
+        "tools": statistics.mean(offered),
+        "prompt_tokens": statistics.mean(prompt_tokens),
+        "latency": statistics.mean(latencies),
+        "hit_rate": hits / len(latencies),
+        "tool_lists": len(tool_lists),
+        "cache_hit_rate": cache_hits / len(latencies),
+        "billed_schema_tokens": billed_schema_tokens / len(latencies),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    routers = {"routed (upstreams)": ToolRouter(), f"routed (top {args.top_k})": ToolRouter(top_k=args.top_k)}
+    results = {"full catalog": await run_questions(args, None)}
+    for name, router in routers.items():
+        results[name] = await run_questions(args, router)
+
+    print("=" * 100)
+    print("Tool Router Benchmark")
+    print(f"{len(QUESTIONS)} questions x {args.repeats}; fake model {args.latency}s + prompt at {args.prefill_rate:g} tokens/s")
+    print("=" * 100)
+    print(
+        f"{'catalog':<20}{'tools':>7}{'prompt tok':>12}{'run s':>8}{'needed offered':>16}"
+        f"{'tool lists':>12}{'cache hits':>12}{'billed schema tok':>19}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<20}{result['tools']:>7.1f}{result['prompt_tokens']:>12.0f}{result['latency']:>8.3f}"
+            f"{result['hit_rate']:>16.0%}{result['tool_lists']:>12}{result['cache_hit_rate']:>12.0%}"
+            f"{result['billed_schema_tokens']:>19.0f}"
+        )
+    print("-" * 100)
+    for name, router in routers.items():
+        stats = router.stats()
+        print(
+            f"{name}: {stats['avg_route_ms']:.2f} ms per request, {stats['fallbacks']} fallbacks, "
+            f"schema tokens saved {stats['schema_tokens_saved_ratio']:.0%}"
+        )
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-request tool routing against the full tool catalog")
+    parser.add_argument("--top-k", type=int, default=8, help="Tools per large upstream in the top k run")
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake model seconds before the first token")
+    parser.add_argument("--prefill-rate", type=float, default=5000, help="Fake model prompt tokens per second")
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args))
@@ -0,0 +1,118 @@
+"""
+Tracing Export Benchmark - Request latency with tracing off, healthy, slow and down
+
+Runs the same /mcp load as bench_mcp.py against main_agent_server.py (fake
+model, stub upstream) four times:
+
+- off: no tracing
+- file: every span written to a local JSON-lines file
+- slow: a collector that takes --collector-delay seconds per batch, with a
+  small export queue
+- down: an OTLP endpoint nobody listens on
+
+With the bounded background exporter the last three should match "off" in
+latency and memory; a slow or missing collector only shows up as dropped
+spans in /tracing/stats.
+
+Usage:
+    python3 scripts/bench_tracing.py --concurrency 8 --duration 15
+"""
+
+import argparse
+import asyncio
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+
+from bench_mcp import format_ms, launch_agent_server, parse_mix, run_load
+from stub_mcp_server import launch_stub_server
+
+
+def mode_env(mode: str, work_dir: str, args: argparse.Namespace) -> Dict[str, str]:
+    spans_file = str(Path(work_dir) / "spans.jsonl")
+    if mode == "file":
+        return {"TRACING_FILE": spans_file}
+    if mode == "slow":
+        return {
+            "TRACING_FILE": spans_file,
+            "TRACING_FILE_DELAY_SECONDS": str(args.collector_delay),
+            "TRACING_MAX_QUEUE_SIZE": "256",
+        }
+    if mode == "down":
+        return {"TRACING_OTLP_ENDPOINT": "localhost:4399", "TRACING_EXPORT_TIMEOUT_SECONDS": "5"}
+    return {}
+
+
+async def run_mode(args: argparse.Namespace, mode: str) -> Dict[str, Any]:
+    stub = launch_stub_server(args.stub_port, delay=args.upstream_delay)
+    server = None
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            extra_env = {
+                "ANSWER_CACHE_ENABLED": "false",
+                "SINGLE_FLIGHT_ENABLED": "false",
+                "ADMISSION_ENABLED": "false",
+                **mode_env(mode, work_dir, args),
+            }
+            server = launch_agent_server(args.port, f"http://127.0.0.1:{args.stub_port}/mcp", work_dir, extra_env)
+            load = await run_load(
+                f"http://127.0.0.1:{args.port}/mcp",
+                args.concurrency,
+                args.duration,
+                args.warmup,
+                parse_mix(args.mix),
+                server.pid,
+                args.seed,
+            )
+            tracing = httpx.get(f"http://127.0.0.1:{args.port}/tracing/stats").json()
+    finally:
+        for process in (server, stub):
+            if process is not None:
+                process.terminate()
+                process.wait()
+    return {"mode": mode, "tracing": tracing, **load}
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    return {mode: await run_mode(args, mode) for mode in ("off", "file", "slow", "down")}
+
+
+def print_report(results: Dict[str, Dict[str, Any]], args: argparse.Namespace) -> None:
+    print("=" * 78)
+    print("Tracing Export Benchmark")
+    print(f"Concurrency {args.concurrency}, {args.duration}s per run, slow collector {args.collector_delay}s per batch")
+    print("=" * 78)
+    print(f"{'mode':<8}{'req':>7}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'rss MB':>9}{'exported':>10}{'dropped':>9}")
+    for mode, result in results.items():
+        stats = result["overall"]
+        tracing = result["tracing"]
+        exported = tracing.get("spans_exported", "-")
+        dropped = sum(tracing.get("dropped", {}).values()) if "dropped" in tracing else "-"
+        peak_rss = result["server_rss_mb"]["peak"]
+        print(
+            f"{mode:<8}{stats['requests']:>7}{stats['throughput_rps']:>8.1f}{format_ms(stats['p50_ms'])}"
+            f"{format_ms(stats['p95_ms'])}{peak_rss if peak_rss is not None else '-':>9}{exported:>10}{dropped:>9}"
+        )
+    for mode, result in results.items():
+        if result["tracing"].get("dropped"):
+            reasons = ", ".join(f"{reason} {count}" for reason, count in result["tracing"]["dropped"].items())
+            print(f"Dropped ({mode}): {reasons}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark request latency with tracing export off, healthy, slow and down")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of measured load per run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of load before measuring")
+    parser.add_argument("--mix", default="run_agent=1")
+    parser.add_argument("--collector-delay", type=float, default=2.0, help="Seconds the slow collector takes per batch")
+    parser.add_argument("--upstream-delay", type=float, default=0.05, help="Stub upstream latency per tool call")
+    parser.add_argument("--port", type=int, default=7791)
+    parser.add_argument("--stub-port", type=int, default=8771)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print_report(asyncio.run(run_benchmark(args)), args)
@@ -0,0 +1,135 @@
+"""
+Upstream Guard Benchmark - Tail latency and outages with and without the guard
+
+Starts the local stub MCP server twice and calls its docs search tool
+through the guard hook used by main_agent_server.py:
+
+- tail: a healthy upstream where --slow-rate of calls take --slow-delay.
+  Compares no guard, the adaptive timeout alone and the timeout plus hedging
+- outage: an upstream where every call fails after --delay. Compares no
+  guard with the circuit breaker, which fails fast once it has tripped
+
+Reports per-call latency (p50, p99, max), failed calls and the guard stats.
+
+Usage:
+    python3 scripts/bench_upstream_guard.py --calls 200 --concurrency 4 --slow-rate 0.03 --slow-delay 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agno.tools.function import ToolResult
+from agno.tools.mcp import MCPTools
+
+from common.upstream_guard import UpstreamGuard, create_guard_hook
+from stub_mcp_server import find_function, launch_stub_server
+
+
+async def run_load(call: Callable[[], Awaitable], concurrency: int, calls: int) -> Dict[str, Any]:
+    """Run `calls` tool calls with `concurrency` workers and summarize latency and failures"""
+    latencies: List[float] = []
+    failures = 0
+    remaining = iter(range(calls))
+
+    async def worker():
+        nonlocal failures
+        for _ in remaining:
+            start = time.perf_counter()
+            result = await call()
+            latencies.append(time.perf_counter() - start)
+            content = result.content if isinstance(result, ToolResult) else result
+            failures += isinstance(content, str) and content.startswith("Error")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    latencies.sort()
+    return {
+        "wall_s": time.perf_counter() - start,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "failed": failures,
+    }
+
+
+async def run_mode(url: str, guard_kwargs: Optional[Dict[str, Any]], concurrency: int, calls: int):
+    async with MCPTools(transport="streamable-http", url=url, timeout_seconds=60) as docs_mcp:
+        search = find_function(docs_mcp, "search_docs")
+        arguments = {"query": "tracing"}
+        if guard_kwargs is None:
+            return await run_load(lambda: search.entrypoint(**arguments), concurrency, calls), None
+
+        guard = UpstreamGuard("stub", docs_mcp, **guard_kwargs)
+        hook = create_guard_hook([guard])
+        result = await run_load(
+            lambda: hook(search.name, lambda **kwargs: search.entrypoint(**kwargs), arguments), concurrency, calls
+        )
+        return result, guard.stats()
+
+
+def print_table(title: str, rows: List[tuple]) -> None:
+    print(title)
+    print(f"{'mode':<18}{'wall (s)':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}{'failed':>8}")
+    for label, result, _ in rows:
+        print(
+            f"{label:<18}{result['wall_s']:>10.2f}{result['p50_ms']:>10.0f}{result['p99_ms']:>10.0f}"
+            f"{result['max_ms']:>10.0f}{result['failed']:>8}"
+        )
+    for label, _, stats in rows:
+        if stats is not None:
+            print(f"  {label}: {stats}")
+    print()
+
+
+async def run_benchmark(port: int, calls: int, concurrency: int, delay: float, slow_rate: float, slow_delay: float) -> None:
+    guard = {"min_timeout": 0.5, "min_samples": 20}
+
+    stub = launch_stub_server(port, delay, ["--slow-rate", str(slow_rate), "--slow-delay", str(slow_delay)])
+    try:
+        url = f"http://127.0.0.1:{port}/mcp"
+        tail = [
+            ("no guard", *await run_mode(url, None, concurrency, calls)),
+            ("adaptive timeout", *await run_mode(url, guard, concurrency, calls)),
+            ("timeout + hedge", *await run_mode(url, {**guard, "hedge": True}, concurrency, calls)),
+        ]
+    finally:
+        stub.kill()
+
+    stub = launch_stub_server(port + 1, delay, ["--fail-rate", "1"])
+    try:
+        url = f"http://127.0.0.1:{port + 1}/mcp"
+        outage = [
+            ("no guard", *await run_mode(url, None, concurrency, calls)),
+            ("circuit breaker", *await run_mode(url, guard, concurrency, calls)),
+        ]
+    finally:
+        stub.kill()
+
+    print("=" * 72)
+    print("Upstream Guard Benchmark")
+    print("=" * 72)
+    print(f"Workload: {calls} calls, {concurrency} concurrent, {delay * 1000:.0f} ms per call")
+    print()
+    print_table(f"Tail: {slow_rate:.0%} of calls take {slow_delay}s", tail)
+    print_table("Outage: every call fails", outage)
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark adaptive timeouts, hedging and circuit breaking")
+    parser.add_argument("--port", type=int, default=8775)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.05, help="Seconds per normal tool call")
+    parser.add_argument("--slow-rate", type=float, default=0.03, help="Fraction of slow tool calls")
+    parser.add_argument("--slow-delay", type=float, default=3.0, help="Seconds per slow tool call")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.port, args.calls, args.concurrency, args.delay, args.slow_rate, args.slow_delay))
@@ -0,0 +1,117 @@
+"""
+Worker Scaling Benchmark - /mcp throughput with 1, 2, 4... worker processes
+
+Runs the same /mcp load as bench_mcp.py against main_agent_server.py
+started with each worker count in turn (uvicorn --workers N, with
+WEB_CONCURRENCY=N so the server switches to its multi-worker settings).
+Every run gets a fresh working directory, so all workers of one run share
+one session database and one set of caches, and no run starts warm from
+another. Reports throughput and latency per worker count, the speedup over
+a single worker, and how many distinct workers answered /health.
+
+Throughput only scales while there are free CPU cores: on a machine with
+fewer cores than workers the extra workers just share them.
+
+Usage:
+    python3 scripts/bench_workers.py --workers 1,2,4 --concurrency 16 --duration 20
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+from typing import Any, Dict, List, Set
+
+import httpx
+
+from bench_mcp import format_ms, launch_agent_server, parse_mix, run_load
+from stub_mcp_server import launch_stub_server
+
+
+async def worker_pids(port: int, probes: int = 40) -> Set[int]:
+    """Distinct worker processes that answer /health on a port"""
+    pids = set()
+    async with httpx.AsyncClient(timeout=5) as client:
+        for _ in range(probes):
+            # A new connection each time, so the kernel can pick another worker
+            response = await client.get(f"http://127.0.0.1:{port}/health", headers={"Connection": "close"})
+            pids.add(response.json().get("worker_pid"))
+    return pids
+
+
+async def run_worker_count(args: argparse.Namespace, workers: int) -> Dict[str, Any]:
+    stub = launch_stub_server(args.stub_port, delay=args.upstream_delay)
+    server = None
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            extra_env = {
+                "FAKE_MODEL_LATENCY_SECONDS": str(args.model_latency),
+                "FAKE_MODEL_TOKENS_PER_SECOND": str(args.model_tps),
+                # Every request must run the agent for throughput to mean anything
+                "ANSWER_CACHE_ENABLED": "false",
+                "SINGLE_FLIGHT_ENABLED": "false",
+                "ADMISSION_ENABLED": "false",
+            }
+            server = launch_agent_server(
+                args.port, f"http://127.0.0.1:{args.stub_port}/mcp", work_dir, extra_env, workers
+            )
+            pids = await worker_pids(args.port)
+            load = await run_load(
+                f"http://127.0.0.1:{args.port}/mcp",
+                args.concurrency,
+                args.duration,
+                args.warmup,
+                parse_mix(args.mix),
+                server.pid,
+                args.seed,
+            )
+    finally:
+        for process in (server, stub):
+            if process is not None:
+                process.terminate()
+                process.wait()
+    return {"workers": workers, "workers_seen": len(pids), **load}
+
+
+async def run_benchmark(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    return [await run_worker_count(args, int(n)) for n in args.workers.split(",")]
+
+
+def print_report(results: List[Dict[str, Any]], args: argparse.Namespace) -> None:
+    print("=" * 78)
+    print("Worker Scaling Benchmark")
+    print(f"Concurrency {args.concurrency}, {args.duration}s per run, mix {args.mix}, {os.cpu_count()} CPU(s)")
+    print("=" * 78)
+    print(f"{'workers':>8}{'seen':>6}{'req':>7}{'rps':>8}{'speedup':>9}{'err%':>7}{'p50 ms':>9}{'p95 ms':>9}{'rss MB':>9}")
+    base_rps = results[0]["overall"]["throughput_rps"] or None
+    for result in results:
+        stats = result["overall"]
+        speedup = f"{stats['throughput_rps'] / base_rps:>8.2f}x" if base_rps else f"{'-':>9}"
+        peak_rss = result["server_rss_mb"]["peak"]
+        print(
+            f"{result['workers']:>8}{result['workers_seen']:>6}{stats['requests']:>7}{stats['throughput_rps']:>8.1f}"
+            f"{speedup}{stats['error_rate'] * 100:>7.1f}{format_ms(stats['p50_ms'])}{format_ms(stats['p95_ms'])}"
+            f"{peak_rss if peak_rss is not None else '-':>9}"
+        )
+    for result in results:
+        for error in result["sample_errors"]:
+            print(f"Error ({result['workers']} workers): {error}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark /mcp throughput across worker counts")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of measured load per run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Seconds of load before measuring")
+    parser.add_argument("--mix", default="run_agent=1")
+    parser.add_argument("--upstream-delay", type=float, default=0.05, help="Stub upstream latency per tool call")
+    parser.add_argument("--model-latency", type=float, default=0.0, help="Fake model seconds to first token")
+    parser.add_argument("--model-tps", type=float, default=0.0, help="Fake model output tokens per second")
+    parser.add_argument("--port", type=int, default=7789)
+    parser.add_argument("--stub-port", type=int, default=8769)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print_report(asyncio.run(run_benchmark(args)), args)
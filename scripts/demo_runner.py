@@ -7,9 +7,13 @@ This script demonstrates the full architecture:
 3. Multiple team clients connecting to the Agent OS MCP
 
 Run this after starting main_agent_server.py
+Pass --concurrent to run the team queries in parallel via batch_runner.py
 """
 
+import argparse
 import asyncio
+import sys
+from pathlib import Path
 
 # Load environment variables from .env file
 try:
@@ -19,9 +23,16 @@ except ImportError:
     print("Warning:  python-dotenv not installed. Install with: pip install python-dotenv")
 
 from agno.agent import Agent
-from agno.models.anthropic import Claude
 from agno.tools.mcp import MCPTools
 
+# Make the shared helpers in common/ importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.admission import client_params
+from common.models import get_model
+from common.schema_cache import schema_cached
+from batch_runner import TEAM_TASKS, print_summary, run_batch
+
 # MCP server URL of the main Community Support Agent OS
 COMMUNITY_SUPPORT_MCP_URL = "http://localhost:7777/mcp"
 
@@ -48,11 +59,11 @@ async def run_all_teams_demo():
     print("=" * 80 + "\n")
     
     # Connect to the Agent OS MCP
-    async with MCPTools(
+    async with schema_cached(MCPTools(
         transport="streamable-http",
-        url=COMMUNITY_SUPPORT_MCP_URL,
+        server_params=client_params(COMMUNITY_SUPPORT_MCP_URL, "demo-runner", timeout_seconds=90),
         timeout_seconds=90,
-    ) as community_mcp:
+    )) as community_mcp:
         
         # ==========================================
         # 1. PM Team Demo
@@ -63,7 +74,7 @@ async def run_all_teams_demo():
         
         pm_agent = Agent(
             name="PM Insights Agent",
-            model=Claude(id="claude-sonnet-4-5"),
+            model=get_model("claude-sonnet-4-5"),
             tools=[community_mcp],
             instructions=["You help PM team understand community needs via the Community Support Agent."],
             markdown=True,
@@ -86,7 +97,7 @@ async def run_all_teams_demo():
         
         devrel_agent = Agent(
             name="DevRel Content Agent",
-            model=Claude(id="claude-sonnet-4-5"),
+            model=get_model("claude-sonnet-4-5"),
             tools=[community_mcp],
             instructions=["You help DevRel identify documentation gaps via the Community Support Agent."],
             markdown=True,
@@ -109,7 +120,7 @@ async def run_all_teams_demo():
         
         engineers_agent = Agent(
             name="Engineering Insights Agent",
-            model=Claude(id="claude-sonnet-4-5"),
+            model=get_model("claude-sonnet-4-5"),
             tools=[community_mcp],
             instructions=["You help Engineers prioritize bugs via the Community Support Agent."],
             markdown=True,
@@ -132,7 +143,7 @@ async def run_all_teams_demo():
         
         sales_agent = Agent(
             name="Sales Intelligence Agent",
-            model=Claude(id="claude-sonnet-4-5"),
+            model=get_model("claude-sonnet-4-5"),
             tools=[community_mcp],
             instructions=["You help Sales understand adoption trends via the Community Support Agent."],
             markdown=True,
@@ -155,6 +166,17 @@ async def run_all_teams_demo():
     print("\n")
 
 
+async def run_all_teams_concurrently(concurrency: int):
+    """Ask every team's question at once, each over its own MCP session"""
+    summary = await run_batch(TEAM_TASKS, url=COMMUNITY_SUPPORT_MCP_URL, concurrency=concurrency)
+    for task in summary["tasks"]:
+        print("\n" + "🔹" * 40)
+        print(f"{task['team'].upper()} TEAM")
+        print("🔹" * 40)
+        print(task.get("content") or task.get("error"))
+    print_summary(summary)
+
+
 if __name__ == "__main__":
     """
     Run the complete demo.
@@ -164,11 +186,19 @@ if __name__ == "__main__":
     2. Set environment variables in .env file (ANTHROPIC_API_KEY required)
     3. Run this script
     """
+    parser = argparse.ArgumentParser(description="Run the MCP meetup demo")
+    parser.add_argument("--concurrent", action="store_true", help="Run all team queries in parallel")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
     print("\nWarning:  Make sure main_agent_server.py is running at http://localhost:7777")
     print("Warning:  Press Ctrl+C to stop\n")
     
     try:
-        asyncio.run(run_all_teams_demo())
+        if args.concurrent:
+            asyncio.run(run_all_teams_concurrently(args.concurrency))
+        else:
+            asyncio.run(run_all_teams_demo())
     except KeyboardInterrupt:
         print("\n\nDemo stopped by user")
     except Exception as e:
@@ -0,0 +1,172 @@
+"""
+Stub MCP Server - Local stand-in for the upstream MCP servers
+
+Serves a small, deterministic set of docs and GitHub-style tools so the
+Agent OS can be exercised without network access or API keys. Every tool
+call (and every list_tools request) is counted, which lets cache and
+benchmark scripts verify how many requests actually reached the upstream.
+Slow calls and failing calls can be injected at a given rate, to exercise
+timeouts, hedging and circuit breaking.
+
+Usage:
+    python3 scripts/stub_mcp_server.py --port 8765 --delay 0.5
+    python3 scripts/stub_mcp_server.py --transport stdio
+    python3 scripts/stub_mcp_server.py --slow-rate 0.05 --slow-delay 5 --fail-rate 0.1
+
+Then point the main server at it:
+    PHOENIX_DOCS_MCP_URL=http://localhost:8765/mcp python3 servers/main_agent_server.py
+"""
+
+import argparse
+import asyncio
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import List, Optional
+
+from agno.tools.mcp import MCPTools
+from mcp.server.fastmcp import FastMCP
+from mcp.types import Tool
+
+DOCS = {
+    "tracing": "Phoenix tracing captures spans from LLM applications via OpenTelemetry and OpenInference instrumentors.",
+    "evaluation": "Phoenix evals run LLM-as-a-judge and code evaluators over traces and datasets.",
+    "datasets": "Datasets store examples that experiments run against to compare prompts and models.",
+    "prompts": "Prompt management versions prompt templates and lets you replay them in the playground.",
+}
+
+ISSUES = [
+    {"number": 101, "title": "Tracing spans missing for async tools", "labels": ["bug"], "user": "alice"},
+    {"number": 102, "title": "Feature request: export evals to CSV", "labels": ["enhancement"], "user": "bob"},
+    {"number": 103, "title": "Docs: how to self-host with Postgres", "labels": ["documentation"], "user": "carol"},
+    {"number": 104, "title": "Crash when dataset has empty rows", "labels": ["bug"], "user": "alice"},
+]
+
+call_counts: Counter = Counter()
+
+
+class StubServer(FastMCP):
+    """FastMCP server that counts and optionally slows down list_tools"""
+
+    list_tools_delay = 0.0
+
+    async def list_tools(self) -> List[Tool]:
+        call_counts["list_tools"] += 1
+        await asyncio.sleep(self.list_tools_delay)
+        return await super().list_tools()
+
+
+def create_stub_server(
+    delay: float = 0.0,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    serial: bool = False,
+    list_tools_delay: float = 0.0,
+    slow_rate: float = 0.0,
+    slow_delay: float = 5.0,
+    fail_rate: float = 0.0,
+) -> FastMCP:
+    """Create the stub MCP server with docs and GitHub-style tools"""
+    server = StubServer("stub-upstream", host=host, port=port, log_level="WARNING")
+    server.list_tools_delay = list_tools_delay
+
+    # A serial stub handles one call at a time, like a single-threaded upstream
+    lock = asyncio.Lock() if serial else None
+
+    async def simulate_upstream(tool_name: str) -> None:
+        call_counts[tool_name] += 1
+        call_delay = slow_delay if random.random() < slow_rate else delay
+        if lock is not None:
+            async with lock:
+                await asyncio.sleep(call_delay)
+        elif call_delay:
+            await asyncio.sleep(call_delay)
+        if random.random() < fail_rate:
+            call_counts["failed"] += 1
+            raise RuntimeError(f"Injected failure in {tool_name}")
+
+    @server.tool()
+    async def search_docs(query: str) -> str:
+        """Search the Phoenix documentation"""
+        await simulate_upstream("search_docs")
+        matches = [text for topic, text in DOCS.items() if topic in query.lower()]
+        return "\n".join(matches) if matches else f"No documentation found for: {query}"
+
+    @server.tool()
+    async def list_issues(owner: str, repo: str, state: str = "open", per_page: int = 10) -> str:
+        """List issues in a GitHub repository"""
+        await simulate_upstream("list_issues")
+        return "\n".join(f"#{i['number']} {i['title']} ({', '.join(i['labels'])})" for i in ISSUES[:per_page])
+
+    @server.tool()
+    async def stub_stats() -> dict:
+        """Return the number of calls served per tool and list_tools requests"""
+        return dict(call_counts)
+
+    return server
+
+
+def find_function(toolkit: MCPTools, tool_name: str):
+    """Find a registered function by its MCP tool name, ignoring any name prefix"""
+    return next(f for name, f in toolkit.functions.items() if name.endswith(tool_name))
+
+
+def launch_stub_server(port: int, delay: float = 0.0, extra_args: Optional[List[str]] = None) -> subprocess.Popen:
+    """Start the stub server in a subprocess and wait until it accepts connections"""
+    process = subprocess.Popen(
+        [sys.executable, __file__, "--port", str(port), "--delay", str(delay), *(extra_args or [])],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 15
+    while True:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"Stub MCP server did not start on port {port}")
+            time.sleep(0.1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stub MCP server")
+    parser.add_argument("--transport", choices=["streamable-http", "stdio"], default="streamable-http")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds of simulated latency per tool call")
+    parser.add_argument("--serial", action="store_true", help="Serve one tool call at a time")
+    parser.add_argument(
+        "--startup-delay",
+        type=float,
+        default=0.0,
+        help="Seconds to wait before serving, like npx resolving a package",
+    )
+    parser.add_argument(
+        "--list-tools-delay",
+        type=float,
+        default=0.0,
+        help="Seconds of simulated latency per list_tools request",
+    )
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of tool calls that take --slow-delay")
+    parser.add_argument("--slow-delay", type=float, default=5.0, help="Seconds a slow tool call takes")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of tool calls that fail")
+    args = parser.parse_args()
+
+    time.sleep(args.startup_delay)
+
+    server = create_stub_server(
+        delay=args.delay,
+        host=args.host,
+        port=args.port,
+        serial=args.serial,
+        list_tools_delay=args.list_tools_delay,
+        slow_rate=args.slow_rate,
+        slow_delay=args.slow_delay,
+        fail_rate=args.fail_rate,
+    )
+    server.run(transport=args.transport)
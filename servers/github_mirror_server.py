@@ -0,0 +1,267 @@
+"""
+GitHub Mirror MCP Server - Issues, PRs and contributors served from a local mirror
+
+Answers the teams' GitHub questions (recent issues, open PRs, most active
+contributors, top labels) from the SQLite mirror in common/github_mirror.py
+instead of paging through the GitHub API on every question. A background
+task keeps the mirror fresh with incremental syncs; when several copies of
+this server share one database file (one per pooled MCP session), only one
+of them syncs at a time.
+
+After each sync that brought new data, common/github_analytics.py updates
+precomputed community analytics: issue themes, top feature requests, open
+bugs by severity and contributor rollups. The analytics tools return those
+small summaries, so the agent does not page through raw issues to work
+them out.
+
+Every tool answers from local indexes and reports how fresh the mirror is.
+With --fixture the mirror is filled from a JSON file in GitHub's API
+format, so everything runs without network access or a token.
+
+Usage:
+    GITHUB_PERSONAL_ACCESS_TOKEN=... python3 servers/github_mirror_server.py --repos Arize-ai/phoenix
+    python3 servers/github_mirror_server.py --fixture common/github_fixture.json --transport streamable-http
+    python3 servers/github_mirror_server.py --sync-only    # one sync, then exit
+
+main_agent_server.py starts it over stdio by default (GITHUB_MODE=mirror).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from os import getenv
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from mcp.server.fastmcp import FastMCP
+
+# Make the shared helpers in common/ importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.github_analytics import CommunityAnalytics
+from common.github_mirror import FixtureSource, GitHubMirror, GitHubSource, iso_days_ago
+
+
+def log(message: str) -> None:
+    # stdout is the MCP channel over stdio
+    print(message, file=sys.stderr)
+
+
+def refresh_analytics(analytics: CommunityAnalytics, repo: str) -> None:
+    try:
+        result = analytics.refresh(repo)
+    except Exception as e:
+        log(f"Warning: GitHub analytics refresh of {repo} failed: {e}")
+        return
+    log(f"Analytics for {repo}: {result['changed']} issues ({result['mode']}), {result['seconds']}s")
+
+
+async def sync_loop(
+    mirror: GitHubMirror, analytics: CommunityAnalytics, repos: List[str], source: Any, interval_seconds: float
+) -> None:
+    """Sync every repository whenever it is due, for as long as the server runs"""
+    while True:
+        for repo in repos:
+            try:
+                result = await asyncio.to_thread(mirror.sync_if_due, repo, source, interval_seconds)
+            except Exception as e:
+                log(f"Warning: GitHub mirror sync of {repo} failed: {e}")
+                continue
+            if result is not None:
+                log(
+                    f"Synced {repo}: {result['items']} issues/PRs in {result['pages']} pages, "
+                    f"{result['seconds']}s{' (' + result['error'] + ')' if result['error'] else ''}"
+                )
+                # Only the process that synced refreshes; the others read the stored summaries
+                if result["items"] or analytics.summary(repo, "overview") is None:
+                    await asyncio.to_thread(refresh_analytics, analytics, repo)
+        # Cheap when nothing is due; another process may have synced meanwhile
+        await asyncio.sleep(min(interval_seconds, 30))
+
+
+def create_mirror_server(
+    mirror: GitHubMirror,
+    analytics: CommunityAnalytics,
+    repos: List[str],
+    source: Optional[Any] = None,
+    sync_interval_seconds: float = 300.0,
+    host: str = "127.0.0.1",
+    port: int = 8766,
+) -> FastMCP:
+    """Create the MCP server with query tools over the mirror, syncing it in the background"""
+    default_repo = repos[0]
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP):
+        task = asyncio.create_task(sync_loop(mirror, analytics, repos, source, sync_interval_seconds)) if source else None
+        try:
+            yield
+        finally:
+            if task is not None:
+                task.cancel()
+
+    server = FastMCP("github-mirror", host=host, port=port, log_level="WARNING", lifespan=lifespan)
+    # Report a version that changes with this script, so cached tool schemas
+    # (common/schema_cache.py) are refetched after its tools change
+    server._mcp_server.version = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+    def answer(repo: str, **data: Any) -> Dict[str, Any]:
+        status = mirror.sync_status(repo)
+        last_sync = status.get("last_sync_at")
+        return {
+            "repo": repo,
+            **data,
+            "mirror_synced_at": (
+                datetime.fromtimestamp(last_sync, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ") if last_sync else None
+            ),
+        }
+
+    def since(days: Optional[float]) -> Optional[str]:
+        return iso_days_ago(days) if days else None
+
+    @server.tool()
+    def list_issues(
+        state: str = "open",
+        label: Optional[str] = None,
+        author: Optional[str] = None,
+        since_days: Optional[float] = None,
+        sort: str = "created",
+        order: str = "desc",
+        limit: int = 10,
+        repo: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """List issues (not PRs). state: open, closed or all. sort: created, updated or comments. since_days: only issues opened in the last N days"""
+        repo = repo or default_repo
+        items = mirror.list_items(repo, "issue", state, label, author, since(since_days), sort, order, limit)
+        return answer(repo, issues=items)
+
+    @server.tool()
+    def list_pull_requests(
+        state: str = "open",
+        label: Optional[str] = None,
+        author: Optional[str] = None,
+        since_days: Optional[float] = None,
+        sort: str = "created",
+        order: str = "desc",
+        limit: int = 10,
+        repo: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """List pull requests. state: open, closed or all (merged PRs have merged_at). sort: created, updated or comments"""
+        repo = repo or default_repo
+        items = mirror.list_items(repo, "pr", state, label, author, since(since_days), sort, order, limit)
+        return answer(repo, pull_requests=items)
+
+    @server.tool()
+    def get_issue(number: int, repo: Optional[str] = None) -> Dict[str, Any]:
+        """Get one issue or pull request by number, with its body"""
+        repo = repo or default_repo
+        item = mirror.get_item(repo, number)
+        return answer(repo, item=item) if item else answer(repo, error=f"#{number} is not in the mirror")
+
+    @server.tool()
+    def search_issues(
+        query: str, kind: str = "all", state: str = "all", limit: int = 10, repo: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Search issues and PRs whose title or body contains every word of the query. kind: issue, pr or all"""
+        repo = repo or default_repo
+        return answer(repo, query=query, results=mirror.search(repo, query, kind, state, limit))
+
+    @server.tool()
+    def top_contributors(since_days: Optional[float] = None, limit: int = 10, repo: Optional[str] = None) -> Dict[str, Any]:
+        """Most active contributors by issues and PRs opened (optionally in the last N days), with commit counts"""
+        repo = repo or default_repo
+        return answer(repo, since_days=since_days, contributors=mirror.top_contributors(repo, since(since_days), limit))
+
+    @server.tool()
+    def label_counts(
+        kind: str = "issue", state: str = "all", since_days: Optional[float] = None, limit: int = 20, repo: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Count issues or PRs per label, most used first, e.g. to find the top feature requests or bug areas"""
+        repo = repo or default_repo
+        return answer(repo, since_days=since_days, labels=mirror.label_counts(repo, kind, state, since(since_days), limit))
+
+    @server.tool()
+    def repo_activity(since_days: float = 30, repo: Optional[str] = None) -> Dict[str, Any]:
+        """Issues and PRs opened, closed and merged in the last N days, and how many are open now"""
+        repo = repo or default_repo
+        return answer(repo, since_days=since_days, **mirror.activity(repo, since(since_days)))
+
+    def summary(repo: str, name: str, key: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        data = analytics.summary(repo, name)
+        if data is None:
+            return answer(repo, error="analytics are not computed yet, the first sync is still running")
+        if key is not None and limit is not None:
+            data[key] = data[key][:max(1, min(limit, 50))]
+        return answer(repo, **data)
+
+    @server.tool()
+    def community_overview(repo: Optional[str] = None) -> Dict[str, Any]:
+        """Precomputed summary of community health: open issues, recent activity, open bugs by severity, top themes, top feature requests, top bugs and labels. Start here for broad questions"""
+        return summary(repo or default_repo, "overview")
+
+    @server.tool()
+    def issue_themes(limit: int = 10, repo: Optional[str] = None) -> Dict[str, Any]:
+        """Issues clustered into themes by their text, with open issue, bug and feature request counts and examples per theme"""
+        return summary(repo or default_repo, "themes", "themes", limit)
+
+    @server.tool()
+    def top_feature_requests(limit: int = 10, repo: Optional[str] = None) -> Dict[str, Any]:
+        """Open feature requests ranked by demand: comments plus related open issues in the same theme"""
+        return summary(repo or default_repo, "feature_requests", "requests", limit)
+
+    @server.tool()
+    def top_bugs(limit: int = 10, repo: Optional[str] = None) -> Dict[str, Any]:
+        """Open bugs ranked by a 0-100 severity score (labels, crash/regression/security wording, discussion), with counts per severity level"""
+        return summary(repo or default_repo, "bugs", "bugs", limit)
+
+    @server.tool()
+    def contributor_activity(limit: int = 10, repo: Optional[str] = None) -> Dict[str, Any]:
+        """Most active people and totals per group (maintainers, contributors, community), including new and recently active people"""
+        return summary(repo or default_repo, "contributors", "contributors", limit)
+
+    @server.tool()
+    def mirror_status() -> Dict[str, Any]:
+        """Mirrored repositories, row counts, last sync, query timings and analytics refreshes"""
+        return {**mirror.stats(), "analytics": analytics.stats()}
+
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve GitHub issues, PRs and contributors from a local mirror")
+    parser.add_argument("--repos", default=getenv("GITHUB_MIRROR_REPOS", "Arize-ai/phoenix"), help="Comma-separated owner/name")
+    parser.add_argument("--db", default=getenv("GITHUB_MIRROR_DB", "tmp/github_mirror.db"))
+    parser.add_argument("--fixture", default=getenv("GITHUB_MIRROR_FIXTURE"), help="Sync from this JSON file instead of GitHub")
+    parser.add_argument("--sync-interval", type=float, default=float(getenv("GITHUB_MIRROR_SYNC_SECONDS", "300")))
+    parser.add_argument("--initial-days", type=float, default=float(getenv("GITHUB_MIRROR_INITIAL_DAYS", "365")))
+    parser.add_argument("--max-themes", type=int, default=int(getenv("GITHUB_MIRROR_MAX_THEMES", "12")))
+    parser.add_argument("--sync-only", action="store_true", help="Sync once, refresh the analytics and exit")
+    parser.add_argument("--transport", choices=["stdio", "streamable-http"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    repos = [repo.strip() for repo in args.repos.split(",") if repo.strip()]
+    # Fixture data has fixed dates, so none of it is too old to mirror
+    mirror = GitHubMirror(args.db, initial_days=0 if args.fixture else args.initial_days)
+    analytics = CommunityAnalytics(args.db, max_themes=args.max_themes)
+    if args.fixture:
+        source = FixtureSource(args.fixture)
+    else:
+        token = getenv("GITHUB_PERSONAL_ACCESS_TOKEN")
+        if not token or token == "your_github_token_here":
+            log("Warning: GITHUB_PERSONAL_ACCESS_TOKEN not set, syncing with the unauthenticated rate limit")
+            token = None
+        source = GitHubSource(token)
+
+    if args.sync_only:
+        for repo in repos:
+            log(str(mirror.sync(repo, source)))
+            refresh_analytics(analytics, repo)
+        sys.exit(0)
+
+    server = create_mirror_server(mirror, analytics, repos, source, args.sync_interval, args.host, args.port)
+    server.run(transport=args.transport)
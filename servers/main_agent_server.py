@@ -6,12 +6,15 @@ Following Agno cookbook patterns from:
 - https://docs.agno.com/concepts/tools/mcp/multiple-servers
 
 Architecture:
-- Consumes: GitHub MCP, Phoenix Docs MCP, DuckDuckGo Search MCP
+- Consumes: GitHub MCP, Phoenix Docs MCP (local index first), DuckDuckGo Search MCP
 - Exposes: AgentOS MCP server at /mcp endpoint
 """
 
-from os import getenv
-from typing import List
+import shlex
+import sys
+from os import execv, getenv, getpid
+from pathlib import Path
+from typing import Dict, List, Optional
 
 # Load environment variables from .env file
 try:
@@ -21,74 +24,349 @@ try:
 except ImportError:
     print("Warning: python-dotenv not installed. Using system environment variables.\n")
 
+import fastmcp
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-from agno.models.anthropic import Claude
 from agno.os import AgentOS
 from agno.tools.mcp import MCPTools
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+# Make the shared helpers in common/ importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.admission import AdmissionControl, enable_admission_control, parse_weights
+from common.answer_cache import SemanticAnswerCache, enable_answer_cache
+from common.history_context import HistoryAssembler, enable_history_budget
+from common.mcp_pool import MCPSessionPool, create_pool_hook
+from common.mcp_streaming import enable_streaming_run_agent
+from common.metrics import RunMetrics, create_metrics_hook, enable_run_metrics
+from common.models import get_model
+from common.parallel_tools import ParallelToolCalls, enable_parallel_tools
+from common.prompt_cache import prompt_cache_stats
+from common.schema_cache import SchemaCache
+from common.session_store import TunedSqliteDb, create_session_db
+from common.single_flight import SingleFlight, enable_single_flight
+from common.startup import UpstreamStartup
+from common.summary_worker import BackgroundSummaryManager
+from common.tool_cache import ToolCallCache, create_cache_hook
+from common.tool_compaction import CompactionPolicy, ToolResultCompactor, create_compaction_hook, create_full_result_tool
+from common.tool_router import ToolRouter, enable_tool_routing
+from common.upstream_guard import UpstreamGuard, create_guard_hook
 
 # ==========================================
 # Arize AX Tracing Setup
 # Following: https://arize.com/docs/ax/integrations/python-agent-frameworks/agno/agno-tracing
 # ==========================================
+# Spans are exported in batches by a background thread from a bounded queue,
+# so a slow or unreachable collector drops spans instead of slowing runs.
+# TRACING_SAMPLE_RATIO of the runs are traced, plus every slow or failed run.
+# TRACING_OTLP_ENDPOINT (e.g. a local Phoenix) or TRACING_FILE stand in for Arize
 arize_api_key = getenv("ARIZE_API_KEY")
 arize_space_id = getenv("ARIZE_SPACE_ID")
+tracing_otlp_endpoint = getenv("TRACING_OTLP_ENDPOINT")
+tracing_file = getenv("TRACING_FILE")
+span_processor = None
 
-if arize_api_key and arize_space_id:
+if (arize_api_key and arize_space_id) or tracing_otlp_endpoint or tracing_file:
     try:
-        from arize.otel import register
         from openinference.instrumentation.agno import AgnoInstrumentor
-        
-        # Configure the Arize AX tracer and exporter
-        tracer_provider = register(
-            space_id=arize_space_id,
-            api_key=arize_api_key,
-            project_name="mcp-meetup-demo",
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+
+        from common.tracing import JsonLinesSpanExporter, SampledBatchProcessor, create_tracer_provider
+
+        export_timeout = int(getenv("TRACING_EXPORT_TIMEOUT_SECONDS", "10"))
+        if tracing_file:
+            span_exporter = JsonLinesSpanExporter(
+                tracing_file, delay_seconds=float(getenv("TRACING_FILE_DELAY_SECONDS", "0"))
+            )
+            destination = tracing_file
+        elif tracing_otlp_endpoint:
+            span_exporter = OTLPSpanExporter(endpoint=tracing_otlp_endpoint, insecure=True, timeout=export_timeout)
+            destination = tracing_otlp_endpoint
+        else:
+            # What arize.otel.register() sets up, minus its export-everything processor
+            span_exporter = OTLPSpanExporter(
+                endpoint=getenv("ARIZE_OTLP_ENDPOINT", "https://otlp.arize.com/v1"),
+                headers={"space_id": arize_space_id, "api_key": arize_api_key},
+                timeout=export_timeout,
+            )
+            destination = "Arize AX"
+
+        span_processor = SampledBatchProcessor(
+            span_exporter,
+            sample_ratio=float(getenv("TRACING_SAMPLE_RATIO", "1.0")),
+            slow_seconds=float(getenv("TRACING_SLOW_SECONDS", "10")),
+            max_queue_size=int(getenv("TRACING_MAX_QUEUE_SIZE", "2048")),
+            max_export_batch_size=int(getenv("TRACING_BATCH_SIZE", "256")),
         )
-        
+        tracer_provider = create_tracer_provider(span_processor, project_name="mcp-meetup-demo")
+
         # Instrument Agno
         AgnoInstrumentor().instrument(tracer_provider=tracer_provider)
-        print("✅ Arize AX tracing enabled")
+        print(f"✅ Tracing enabled ({destination}, sampling {span_processor.sample_ratio:g} plus slow and failed runs)")
     except Exception as e:
-        print(f"⚠️ Arize tracing setup failed: {e}")
+        print(f"⚠️ Tracing setup failed: {e}")
+        span_processor = None
 else:
     print("⚠️ Arize tracing disabled (ARIZE_API_KEY or ARIZE_SPACE_ID not set)")
 
+# ==========================================
+# Worker Processes
+# ==========================================
+# WEB_CONCURRENCY is also the worker count uvicorn and gunicorn default to,
+# so every worker they start sees it. Each worker imports this module and
+# connects its own upstream sessions in the startup lifespan; state shared
+# between workers lives in SQLite
+workers = max(1, int(getenv("WEB_CONCURRENCY", "1")))
+if workers > 1:
+    # An /mcp session only exists in the worker that created it, and the next
+    # request of the client may reach another one, so /mcp runs stateless
+    fastmcp.settings.stateless_http = True
+
 # ==========================================
 # Database Setup
 # ==========================================
-db = SqliteDb(db_file="tmp/mcp_meetup_demo.db")
+# SESSION_DB_MODE=tuned (default) uses WAL, pooled connections and batched
+# session writes off the request path; "plain" is Agno's stock SqliteDb.
+# With several workers any of them may serve the next turn of a session, so
+# writes go straight to the file and sessions are not cached in memory
+db = create_session_db(
+    "tmp/mcp_meetup_demo.db",
+    mode=getenv("SESSION_DB_MODE", "tuned").lower(),
+    pool_size=int(getenv("SESSION_DB_POOL_SIZE", "8")),
+    flush_interval_seconds=float(getenv("SESSION_DB_FLUSH_SECONDS", "0.1")),
+    session_cache_size=int(getenv("SESSION_DB_CACHE_SIZE", "256")) if workers == 1 else 0,
+    write_behind=workers == 1,
+)
+
+# ==========================================
+# Session Summaries
+# ==========================================
+# SESSION_SUMMARY_MODE=background (default) summarizes sessions in a
+# debounced worker after the response; "inline" is Agno's summary call at
+# the end of every run, which the user waits for
+session_summary_mode = getenv("SESSION_SUMMARY_MODE", "background").lower()
+summary_manager = BackgroundSummaryManager(
+    db=db,
+    debounce_seconds=float(getenv("SESSION_SUMMARY_DEBOUNCE_SECONDS", "2")),
+    max_delay_seconds=float(getenv("SESSION_SUMMARY_MAX_DELAY_SECONDS", "30")),
+    max_concurrency=int(getenv("SESSION_SUMMARY_CONCURRENCY", "2")),
+) if session_summary_mode == "background" else None
+
+# ==========================================
+# History Context
+# ==========================================
+# Earlier runs are picked newest first under a token budget (full, then as
+# question + answer only) and prepared once per session; HISTORY_MAX_TOKENS=0
+# falls back to Agno's num_history_runs
+history_max_tokens = int(getenv("HISTORY_MAX_TOKENS", "4000"))
+history = HistoryAssembler(max_tokens=history_max_tokens) if history_max_tokens > 0 else None
+
+# ==========================================
+# Parallel Tool Calls
+# ==========================================
+# Tool calls the model asks for in the same turn run concurrently, at most
+# PARALLEL_TOOL_CALLS per run; each call's timing goes into the run metadata
+parallel_tools = ParallelToolCalls(max_concurrency=max(1, int(getenv("PARALLEL_TOOL_CALLS", "4"))))
+
+# ==========================================
+# Tool Call Cache
+# ==========================================
+# Docs change rarely, so Phoenix Docs MCP results are cached on disk and
+# repeated questions skip the network round trip entirely
+tool_cache_enabled = getenv("TOOL_CACHE_ENABLED", "true").lower() == "true"
+tool_cache = ToolCallCache(
+    db_file=getenv("TOOL_CACHE_DB", "tmp/tool_cache.db"),
+    ttl_seconds=float(getenv("TOOL_CACHE_TTL_SECONDS", "3600")),
+    max_entries=int(getenv("TOOL_CACHE_MAX_ENTRIES", "1000")),
+)
+
+# ==========================================
+# Tool Result Compaction
+# ==========================================
+# Upstream results are projected, truncated and deduplicated before they
+# reach the model (and every later turn's history); the full payload stays
+# retrievable by handle through the get_full_tool_result tool
+tool_compaction_enabled = getenv("TOOL_RESULT_COMPACTION_ENABLED", "true").lower() == "true"
+tool_compactor = ToolResultCompactor(
+    db_file=getenv("TOOL_RESULT_DB", "tmp/tool_results.db"),
+    ttl_seconds=float(getenv("TOOL_RESULT_TTL_SECONDS", "86400")),
+    default_policy=CompactionPolicy(
+        max_chars=int(getenv("TOOL_RESULT_MAX_CHARS", "12000")),
+        max_string_chars=int(getenv("TOOL_RESULT_MAX_FIELD_CHARS", "600")),
+        max_items=int(getenv("TOOL_RESULT_MAX_ITEMS", "30")),
+    ),
+) if tool_compaction_enabled else None
+
+# ==========================================
+# Tool Routing
+# ==========================================
+# Each request offers the model only the upstreams its question matches (the
+# GitHub MCP server alone has dozens of tools), falling back to the full
+# catalog when nothing matches well enough. Off by default while Claude sends
+# a cached prompt prefix: each new tool list is a cache write, and the
+# cached full catalog bills fewer schema tokens than routed upstreams
+prompt_prefix_cached = (
+    getenv("AGENT_MODEL", "claude").lower() != "fake"
+    and getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+)
+tool_routing_enabled = getenv("TOOL_ROUTING_ENABLED", "false" if prompt_prefix_cached else "true").lower() == "true"
+tool_router = ToolRouter(
+    top_k=int(getenv("TOOL_ROUTING_TOP_K", "0")),
+    min_score=float(getenv("TOOL_ROUTING_MIN_SCORE", "0.15")),
+) if tool_routing_enabled else None
+
+# ==========================================
+# Semantic Answer Cache
+# ==========================================
+# Teams ask near-identical questions; a similar enough recent question is
+# answered from the cache without a model run or any upstream MCP calls
+answer_cache_enabled = getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+answer_cache = SemanticAnswerCache(
+    threshold=float(getenv("ANSWER_CACHE_THRESHOLD", "0.8")),
+    ttl_seconds=float(getenv("ANSWER_CACHE_TTL_SECONDS", "900")),
+    max_entries=int(getenv("ANSWER_CACHE_MAX_ENTRIES", "500")),
+    db_file=getenv("ANSWER_CACHE_DB", "tmp/answer_cache.db"),
+)
+
+# ==========================================
+# Single Flight
+# ==========================================
+# Crons ask the same question at the same moment; identical questions asked
+# while one run for them is in flight share that run and its result
+single_flight_enabled = getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+single_flight = SingleFlight()
+
+# ==========================================
+# Admission Control
+# ==========================================
+# Every team and cron shares /mcp: run_agent calls are rate limited per
+# client (X-Client-Id header), capped at MAX_CONCURRENT_RUNS and queued
+# fairly by client weight; overload is rejected fast instead of timing out.
+# Limits apply per worker process
+admission_enabled = getenv("ADMISSION_ENABLED", "true").lower() == "true"
+admission = AdmissionControl(
+    max_concurrent=max(1, int(getenv("MAX_CONCURRENT_RUNS", "8"))),
+    max_queue=int(getenv("ADMISSION_MAX_QUEUE", "64")),
+    max_queue_per_client=int(getenv("ADMISSION_MAX_QUEUE_PER_CLIENT", "16")),
+    queue_timeout=float(getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10")),
+    rate_per_minute=float(getenv("CLIENT_RATE_PER_MINUTE", "60")),
+    burst=int(getenv("CLIENT_BURST", "20")),
+    weights=parse_weights(getenv("CLIENT_WEIGHTS", "")),
+    max_clients=int(getenv("ADMISSION_MAX_CLIENTS", "256")),
+)
+
+# ==========================================
+# Run Metrics
+# ==========================================
+# Per-stage timings of every run (session reads and writes, prompt assembly,
+# model calls, MCP tool calls per upstream, summaries) as Prometheus
+# histograms at /metrics/prometheus; METRICS_SPANS_FILE also writes them as
+# JSON spans. METRICS_ENABLED=false installs no timing wrappers at all
+metrics_enabled = getenv("METRICS_ENABLED", "true").lower() == "true"
+run_metrics = RunMetrics(span_file=getenv("METRICS_SPANS_FILE") or None) if metrics_enabled else None
+
+# ==========================================
+# Tool Schema Cache
+# ==========================================
+# Tool lists and schemas are reused across restarts while the upstream
+# reports the same server version, and refreshed in the background
+schema_cache_enabled = getenv("MCP_SCHEMA_CACHE_ENABLED", "true").lower() == "true"
+schema_cache = SchemaCache(
+    path=getenv("MCP_SCHEMA_CACHE"),
+    refresh_after_seconds=float(getenv("MCP_SCHEMA_CACHE_REFRESH_SECONDS", "3600")),
+) if schema_cache_enabled else None
 
 # ==========================================
 # MCP Servers Configuration
 # ==========================================
+# Ceiling for any single tool call; the upstream guards time calls out
+# much earlier once they have seen how fast an upstream usually answers
+mcp_timeout_seconds = int(getenv("MCP_TIMEOUT_SECONDS", "60"))
 
-def setup_mcp_tools() -> List[MCPTools]:
-    """Setup MCP tools based on available API keys"""
-    tools = []
+def setup_mcp_tools() -> Dict[str, MCPTools]:
+    """Setup MCP tools based on available API keys, keyed by upstream name"""
+    tools = {}
     
-    # 1. Phoenix Docs MCP (always available - no API key needed)
+    # 1. Phoenix Docs (always available - no API key needed)
+    # A local FTS5 + vector index of the docs answers searches in milliseconds
+    # and keeps working when the docs site is slow; the remote Mintlify
+    # endpoint below stays available as a fallback
+    if getenv("PHOENIX_DOCS_LOCAL", "true").lower() == "true":
+        try:
+            local_docs_url = getenv("PHOENIX_DOCS_LOCAL_URL")
+            docs_fixture = getenv("PHOENIX_DOCS_FIXTURE")
+            if local_docs_url:
+                # A docs index server running on its own, shared by every worker
+                local_docs_mcp = MCPTools(transport="streamable-http", url=local_docs_url, timeout_seconds=mcp_timeout_seconds)
+            else:
+                docs_args = [
+                    sys.executable, str(Path(__file__).resolve().parent / "phoenix_docs_server.py"),
+                    "--index-dir", getenv("PHOENIX_DOCS_INDEX_DIR", "tmp/phoenix_docs"),
+                    "--source", getenv("PHOENIX_DOCS_SOURCE", "https://arize.com/docs/phoenix/llms.txt"),
+                    "--refresh-interval", getenv("PHOENIX_DOCS_REFRESH_SECONDS", "86400"),
+                ]
+                if docs_fixture:
+                    docs_args += ["--fixture", docs_fixture]
+                local_docs_mcp = MCPTools(command=shlex.join(docs_args), timeout_seconds=mcp_timeout_seconds)
+            tools["phoenix_docs_local"] = local_docs_mcp
+            source = local_docs_url or ("fixture data" if docs_fixture else "refreshed from the docs site")
+            print(f"Local Phoenix Docs index enabled ({source})")
+        except Exception as e:
+            print(f"Warning: Local Phoenix Docs index failed: {e}")
+
     try:
         phoenix_docs_mcp = MCPTools(
             transport="streamable-http",
-            url="https://arizeai-433a7140.mintlify.app/mcp",
-            timeout_seconds=60,
+            url=getenv("PHOENIX_DOCS_MCP_URL", "https://arizeai-433a7140.mintlify.app/mcp"),
+            timeout_seconds=mcp_timeout_seconds,
         )
-        tools.append(phoenix_docs_mcp)
+        tools["phoenix_docs"] = phoenix_docs_mcp
         print("Phoenix Docs MCP enabled")
     except Exception as e:
         print(f"Warning: Phoenix Docs MCP failed: {e}")
     
-    # 2. GitHub MCP (optional - needs GITHUB_PERSONAL_ACCESS_TOKEN)
+    # 2. GitHub (optional - needs GITHUB_PERSONAL_ACCESS_TOKEN, or fixture data for the mirror)
+    # GITHUB_MODE=mirror (default) answers from a local, incrementally synced
+    # SQLite mirror; GITHUB_MODE=live queries the GitHub API on every call
     github_token = getenv("GITHUB_PERSONAL_ACCESS_TOKEN")
-    if github_token and github_token != "your_github_token_here":
+    if github_token == "your_github_token_here":
+        github_token = None
+    github_mode = getenv("GITHUB_MODE", "mirror").lower()
+    mirror_url = getenv("GITHUB_MIRROR_URL")
+    mirror_fixture = getenv("GITHUB_MIRROR_FIXTURE")
+    if github_mode == "mirror" and (github_token or mirror_url or mirror_fixture):
+        try:
+            if mirror_url:
+                # A mirror server running on its own, shared by every worker
+                github_mcp = MCPTools(transport="streamable-http", url=mirror_url, timeout_seconds=mcp_timeout_seconds)
+            else:
+                mirror_args = [
+                    sys.executable, str(Path(__file__).resolve().parent / "github_mirror_server.py"),
+                    "--repos", getenv("GITHUB_MIRROR_REPOS", "Arize-ai/phoenix"),
+                    "--db", getenv("GITHUB_MIRROR_DB", "tmp/github_mirror.db"),
+                    "--max-themes", getenv("GITHUB_MIRROR_MAX_THEMES", "12"),
+                ]
+                if mirror_fixture:
+                    mirror_args += ["--fixture", mirror_fixture]
+                github_mcp = MCPTools(
+                    command=shlex.join(mirror_args),
+                    env={"GITHUB_PERSONAL_ACCESS_TOKEN": github_token} if github_token else None,
+                    timeout_seconds=mcp_timeout_seconds,
+                )
+            tools["github"] = github_mcp
+            source = mirror_url or ("fixture data" if mirror_fixture else "synced from GitHub")
+            print(f"GitHub mirror MCP enabled ({source})")
+        except Exception as e:
+            print(f"Warning: GitHub mirror MCP failed: {e}")
+    elif github_token:
         try:
             github_mcp = MCPTools(
                 command="npx -y @modelcontextprotocol/server-github",
                 env={"GITHUB_PERSONAL_ACCESS_TOKEN": github_token},
-                timeout_seconds=60,
+                timeout_seconds=mcp_timeout_seconds,
             )
-            tools.append(github_mcp)
+            tools["github"] = github_mcp
             print("GitHub MCP enabled")
         except Exception as e:
             print(f"Warning: GitHub MCP failed: {e}")
@@ -102,7 +380,7 @@ def setup_mcp_tools() -> List[MCPTools]:
     #         command="npx -y @modelcontextprotocol/server-fetch",
     #         timeout_seconds=60,
     #     )
-    #     tools.append(fetch_mcp)
+    #     tools["fetch"] = fetch_mcp
     #     print("Fetch MCP enabled")
     # except Exception as e:
     #     print(f"Warning: Fetch MCP failed: {e}")
@@ -110,11 +388,68 @@ def setup_mcp_tools() -> List[MCPTools]:
     print()
     return tools
 
+# ==========================================
+# Upstream Session Pools
+# ==========================================
+
+def setup_session_pools(upstreams: Dict[str, MCPTools]) -> Dict[str, MCPSessionPool]:
+    """Create a pool of warm client sessions per upstream so concurrent runs don't share one"""
+    pool_size = int(getenv("MCP_POOL_SIZE", "4"))
+    if pool_size <= 0:
+        print("MCP session pools disabled (MCP_POOL_SIZE=0)")
+        return {}
+
+    pools = {
+        name: MCPSessionPool(
+            template=upstream,
+            name=name,
+            min_size=int(getenv("MCP_POOL_MIN_SIZE", "1")),
+            max_size=pool_size,
+            session_concurrency=int(getenv("MCP_POOL_SESSION_CONCURRENCY", "1")),
+            max_waiters=int(getenv("MCP_POOL_MAX_WAITERS", "64")),
+            acquire_timeout=float(getenv("MCP_POOL_ACQUIRE_TIMEOUT", "30")),
+            idle_timeout=float(getenv("MCP_POOL_IDLE_TIMEOUT", "300")),
+            schema_cache=schema_cache,
+        )
+        for name, upstream in upstreams.items()
+    }
+    print(f"MCP session pools enabled (up to {pool_size} sessions per upstream)")
+    return pools
+
+# ==========================================
+# Upstream Guards
+# ==========================================
+
+def setup_upstream_guards(upstreams: Dict[str, MCPTools]) -> Dict[str, UpstreamGuard]:
+    """Give each upstream an adaptive timeout and a circuit breaker, so one slow upstream can't stall a run"""
+    if getenv("MCP_GUARD_ENABLED", "true").lower() != "true":
+        print("Upstream guards disabled (MCP_GUARD_ENABLED=false)")
+        return {}
+
+    hedge = getenv("MCP_HEDGE_ENABLED", "false").lower() == "true"
+    guards = {
+        name: UpstreamGuard(
+            name=name,
+            toolkit=upstream,
+            min_timeout=float(getenv("MCP_MIN_TIMEOUT_SECONDS", "5")),
+            max_timeout=mcp_timeout_seconds,
+            multiplier=float(getenv("MCP_TIMEOUT_MULTIPLIER", "3")),
+            failure_threshold=int(getenv("MCP_BREAKER_FAILURES", "5")),
+            open_seconds=float(getenv("MCP_BREAKER_OPEN_SECONDS", "30")),
+            hedge=hedge,
+        )
+        for name, upstream in upstreams.items()
+    }
+    print(f"Upstream guards enabled (adaptive timeouts, circuit breakers, hedging {'on' if hedge else 'off'})")
+    return guards
+
 # ==========================================
 # Community Support Agent
 # ==========================================
 
-def create_community_agent(tools: List[MCPTools]) -> Agent:
+def create_community_agent(
+    upstreams: Dict[str, MCPTools], tool_hooks: Optional[List] = None, extra_tools: Optional[List] = None
+) -> Agent:
     """Create the main community support agent"""
     
     # Build instructions based on available tools
@@ -125,13 +460,30 @@ def create_community_agent(tools: List[MCPTools]) -> Agent:
     
     # Add tool-specific instructions
     tool_names = []
-    if any("arizeai" in str(t) or "mintlify" in str(t) for t in tools):
-        instructions.append("- Phoenix documentation for technical questions about tracing, evaluation, and observability")
+    if "phoenix_docs_local" in upstreams:
+        instructions.append(
+            "- A local index of the Phoenix documentation (search_phoenix_docs, get_phoenix_doc_page): "
+            "fast and always available, use it first for questions about tracing, evaluation, and observability"
+        )
+        tool_names.append("Phoenix Docs (local)")
+    if "phoenix_docs" in upstreams:
+        if "phoenix_docs_local" in upstreams:
+            instructions.append("- The remote Phoenix Docs MCP, only when the local index has no good match")
+        else:
+            instructions.append("- Phoenix documentation for technical questions about tracing, evaluation, and observability")
         tool_names.append("Phoenix Docs")
-    if any("github" in str(t) for t in tools):
+    # Gate on the upstream names: str() of an MCPTools holds neither its URL
+    # nor its command, so it cannot tell which servers the agent has
+    if "github" in upstreams:
         instructions.append("- GitHub repositories for issues, PRs, and community activity")
+        if getenv("GITHUB_MODE", "mirror").lower() == "mirror":
+            instructions.append(
+                "  For trends and rankings (themes, top feature requests, critical bugs, active contributors) "
+                "start from the precomputed analytics tools (community_overview, issue_themes, "
+                "top_feature_requests, top_bugs, contributor_activity) instead of paging through raw issues"
+            )
         tool_names.append("GitHub")
-    if any("fetch" in str(t) for t in tools):
+    if "fetch" in upstreams:
         instructions.append("- Fetch tool to retrieve content from any URL")
         tool_names.append("Fetch")
     
@@ -139,22 +491,32 @@ def create_community_agent(tools: List[MCPTools]) -> Agent:
         "",
         "Your role is to help answer community questions comprehensively.",
         "Use the appropriate MCP server for each query:",
-        "- For Phoenix features/docs → Phoenix Docs MCP",
+        "- For Phoenix features/docs → the local docs index, then Phoenix Docs MCP if needed"
+        if "phoenix_docs_local" in upstreams else "- For Phoenix features/docs → Phoenix Docs MCP",
         "- For repository issues → GitHub MCP", 
         "- For fetching web content → Fetch MCP",
+        "When a question needs more than one source, request all of those tool calls together in the same turn.",
     ])
+    if extra_tools and any(getattr(tool, "__name__", "") == "get_full_tool_result" for tool in extra_tools):
+        instructions.append(
+            "Large tool results are compacted (long bodies truncated, noise fields dropped). Only when the "
+            "answer needs the omitted part, read it with get_full_tool_result and the handle given in the result."
+        )
     
     return Agent(
         id="community-support-agent",
         name="Community Support Agent",
-        model=Claude(id="claude-sonnet-4-20250514"),
+        model=get_model("claude-sonnet-4-20250514"),  # AGENT_MODEL=fake for offline runs
         db=db,
-        tools=tools,
+        tools=list(upstreams.values()) + (extra_tools or []),
+        tool_hooks=tool_hooks,
         instructions=instructions,
         add_history_to_context=True,
-        num_history_runs=3,
+        num_history_runs=3,  # Only used with HISTORY_MAX_TOKENS=0
+        store_history_messages=False,  # History is rebuilt from the earlier runs themselves
         add_datetime_to_context=True,
         enable_session_summaries=True,
+        session_summary_manager=summary_manager,
         markdown=True,
     )
 
@@ -163,8 +525,170 @@ def create_community_agent(tools: List[MCPTools]) -> Agent:
 # ==========================================
 
 # Setup tools and agent
-tools = setup_mcp_tools()
-community_support_agent = create_community_agent(tools)
+upstreams = setup_mcp_tools()
+tools = list(upstreams.values())
+session_pools = setup_session_pools(upstreams)
+upstream_guards = setup_upstream_guards(upstreams)
+
+# Hooks run outermost first: cache hits never take a pooled session or count
+# towards an upstream's latency, and a hedged call borrows its own session.
+# The metrics hook times the whole call, as the agent sees it. Compaction
+# sits outside the cache, so cached entries keep the full payload
+tool_hooks = []
+if run_metrics is not None:
+    tool_hooks.append(create_metrics_hook(run_metrics, upstreams))
+if tool_compactor is not None:
+    tool_hooks.append(create_compaction_hook(tool_compactor, upstreams, run_metrics))
+if tool_cache_enabled and "phoenix_docs" in upstreams:
+    tool_hooks.append(create_cache_hook(tool_cache, [upstreams["phoenix_docs"]]))
+if upstream_guards:
+    tool_hooks.append(create_guard_hook(list(upstream_guards.values())))
+if session_pools:
+    tool_hooks.append(create_pool_hook(list(session_pools.values())))
+
+community_support_agent = create_community_agent(
+    upstreams, tool_hooks, [create_full_result_tool(tool_compactor)] if tool_compactor is not None else None
+)
+enable_parallel_tools(community_support_agent, parallel_tools)
+if tool_router is not None:
+    enable_tool_routing(community_support_agent, tool_router, upstreams)
+if history is not None:
+    enable_history_budget(community_support_agent, history)
+if run_metrics is not None:
+    enable_run_metrics(community_support_agent, run_metrics, summary_manager)
+if answer_cache_enabled:
+    enable_answer_cache(community_support_agent, answer_cache)
+if single_flight_enabled:
+    enable_single_flight(community_support_agent, single_flight)
+
+# Connect every upstream in parallel at boot instead of on the first request
+startup = UpstreamStartup(
+    upstreams,
+    pools=session_pools,
+    timeout=float(getenv("UPSTREAM_STARTUP_TIMEOUT", "120")),
+    schema_cache=schema_cache,
+    shutdown_hooks=[
+        hook for hook in (
+            summary_manager.drain if summary_manager is not None else None,
+            run_metrics.close if run_metrics is not None else None,
+            span_processor.close if span_processor is not None else None,
+        ) if hook is not None
+    ],
+)
+
+# Extra routes live on a base app so they are matched before the /mcp mount
+base_app = FastAPI()
+
+
+@base_app.get("/health")
+async def health():
+    """Ready only once every upstream is connected and its tool schemas are loaded"""
+    return JSONResponse({**startup.health(), "worker_pid": getpid()}, status_code=200 if startup.ready else 503)
+
+
+@base_app.get("/tool-cache/stats")
+async def tool_cache_stats():
+    """Hit/miss counters for the Phoenix Docs tool call cache"""
+    return tool_cache.stats()
+
+
+@base_app.get("/tool-results/stats")
+async def tool_results_stats():
+    """Byte and token reductions of compacted tool results per upstream"""
+    return tool_compactor.stats() if tool_compactor is not None else {"enabled": False}
+
+
+@base_app.get("/tool-routing/stats")
+async def tool_routing_stats():
+    """Tools and schema tokens offered per request, and fallbacks to the full catalog"""
+    return tool_router.stats() if tool_router is not None else {"enabled": False}
+
+
+@base_app.get("/answer-cache/stats")
+async def answer_cache_stats():
+    """Hit/miss counters for the semantic answer cache"""
+    return answer_cache.stats()
+
+
+@base_app.get("/single-flight/stats")
+async def single_flight_stats():
+    """Shared runs and how many identical requests joined them"""
+    return single_flight.stats() if single_flight_enabled else {"enabled": False}
+
+
+@base_app.get("/admission/stats")
+async def admission_stats():
+    """Run slots, queue depth and per-client admissions and rejections on /mcp"""
+    return admission.stats() if admission_enabled else {"enabled": False}
+
+
+@base_app.get("/mcp-pool/stats")
+async def mcp_pool_stats():
+    """Session counts and call counters for each upstream pool"""
+    return {name: pool.stats() for name, pool in session_pools.items()}
+
+
+@base_app.get("/upstream-guard/stats")
+async def upstream_guard_stats():
+    """Circuit state, adaptive timeout and latency for each upstream"""
+    return {name: guard.stats() for name, guard in upstream_guards.items()}
+
+
+@base_app.get("/tool-calls/stats")
+async def tool_call_stats():
+    """Concurrent tool call counters and the tool time saved by overlapping calls"""
+    return parallel_tools.stats()
+
+
+@base_app.get("/mcp-streaming/stats")
+async def mcp_streaming_stats():
+    """Streamed run_agent calls and time to their first chunk"""
+    return mcp_streaming.stats() if mcp_streaming is not None else {"enabled": False}
+
+
+@base_app.get("/schema-cache/stats")
+async def schema_cache_stats():
+    """Hit/miss counters for the on-disk tool schema cache"""
+    return schema_cache.stats() if schema_cache is not None else {"enabled": False}
+
+
+@base_app.get("/session-store/stats")
+async def session_store_stats():
+    """Write batching counters for the session database"""
+    return db.stats() if isinstance(db, TunedSqliteDb) else {"mode": "plain"}
+
+
+@base_app.get("/session-summaries/stats")
+async def session_summary_stats():
+    """Queue depth and counters for the background session summary worker"""
+    return summary_manager.stats() if summary_manager is not None else {"mode": "inline"}
+
+
+@base_app.get("/history/stats")
+async def history_stats():
+    """History size and assembly time per request"""
+    return history.stats() if history is not None else {"max_tokens": 0}
+
+
+@base_app.get("/metrics/prometheus")
+async def prometheus_metrics():
+    """Stage, run and MCP tool call timings in the Prometheus text format"""
+    if run_metrics is None:
+        return {"enabled": False}
+    return PlainTextResponse(run_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@base_app.get("/tracing/stats")
+async def tracing_stats():
+    """Sampling decisions, span export counters and dropped spans"""
+    return span_processor.stats() if span_processor is not None else {"enabled": False}
+
+
+@base_app.get("/prompt-cache/stats")
+async def prompt_cache_stats_route():
+    """Prompt tokens read from and written to Anthropic's prompt cache"""
+    return prompt_cache_stats.stats()
+
 
 # Create Agent OS with MCP server enabled
 # Following cookbook pattern: enable_mcp_server=True
@@ -172,10 +696,24 @@ agent_os = AgentOS(
     description="Phoenix Community Support Agent OS - Exposed as MCP for teams",
     agents=[community_support_agent],
     enable_mcp_server=True,  # Exposes /mcp endpoint for other teams
+    base_app=base_app,
+    on_route_conflict="preserve_base_app",  # Keep our readiness-aware /health
+    lifespan=startup.lifespan,
 )
 
+# The startup lifespan owns upstream connections, so AgentOS must not
+# connect and close them again in its own sequential MCP lifespan
+agent_os.mcp_tools.clear()
+
 app = agent_os.get_app()
 
+# run_agent over /mcp streams the inner run as progress notifications to
+# clients that ask for progress, instead of only returning once it's done
+mcp_streaming_enabled = getenv("MCP_STREAMING_ENABLED", "true").lower() == "true"
+mcp_streaming = enable_streaming_run_agent(agent_os) if mcp_streaming_enabled else None
+if admission_enabled:
+    enable_admission_control(agent_os, admission)
+
 # ==========================================
 # Server Entry Point
 # ==========================================
@@ -202,8 +740,32 @@ if __name__ == "__main__":
     print(f"Registered agents: {[agent.id for agent in agent_os.agents]}")
     print("MCP Server: http://localhost:7777/mcp")
     print("API Docs: http://localhost:7777/docs")
+    print(f"Workers: {workers} (WEB_CONCURRENCY)")
+    print(f"Tool cache: {'enabled' if tool_cache_enabled else 'disabled'} (stats at /tool-cache/stats)")
+    print(f"Tool result compaction: {'enabled' if tool_compactor is not None else 'disabled'} (stats at /tool-results/stats)")
+    print(f"Tool routing: {'enabled' if tool_router is not None else 'disabled'} (stats at /tool-routing/stats)")
+    print(f"Answer cache: {'enabled' if answer_cache_enabled else 'disabled'} (stats at /answer-cache/stats)")
+    print(f"Single flight: {'enabled' if single_flight_enabled else 'disabled'} (stats at /single-flight/stats)")
+    print(f"Session summaries: {session_summary_mode} (stats at /session-summaries/stats)")
+    print(f"History budget: {history_max_tokens or 'off'} tokens (stats at /history/stats)")
+    print(f"Admission control: {'enabled' if admission_enabled else 'disabled'}, up to {admission.max_concurrent} runs (stats at /admission/stats)")
+    print(f"Tracing: {'enabled' if span_processor is not None else 'disabled'} (stats at /tracing/stats)")
+    print(f"Run metrics: {'enabled' if metrics_enabled else 'disabled'} (Prometheus format at /metrics/prometheus)")
+    print(f"MCP streaming: {'enabled' if mcp_streaming_enabled else 'disabled'} (stats at /mcp-streaming/stats)")
+    print(f"Parallel tool calls: up to {parallel_tools.max_concurrency} per run (stats at /tool-calls/stats)")
+    print(f"Upstream guards: {'enabled' if upstream_guards else 'disabled'} (stats at /upstream-guard/stats)")
+    print(f"Session store: {'tuned' if isinstance(db, TunedSqliteDb) else 'plain'} (stats at /session-store/stats)")
     print("=" * 60)
     print()
     
+    if workers > 1:
+        # Workers spawned from this script would run it twice each (once as
+        # __mp_main__), so hand over to the uvicorn CLI to start them
+        execv(sys.executable, [
+            sys.executable, "-m", "uvicorn", "main_agent_server:app",
+            "--app-dir", str(Path(__file__).resolve().parent),
+            "--host", "localhost", "--port", "7777", "--workers", str(workers),
+        ])
+
     # Following cookbook pattern: agent_os.serve()
     agent_os.serve(app="main_agent_server:app")
@@ -0,0 +1,140 @@
+"""
+Phoenix Docs MCP Server - Documentation search from a local index
+
+Answers documentation searches from the local snapshot in
+common/docs_index.py (SQLite FTS5 plus a memory-mapped vector matrix)
+instead of a network round trip to the remote Mintlify endpoint per
+search. A background task refreshes the snapshot incrementally from the
+docs site's llms.txt; when several copies of this server share one index
+directory (one per pooled MCP session), only one of them refreshes at a
+time. When the docs site is slow or down, searches keep answering from
+the last snapshot.
+
+With --fixture the index is filled from a JSON file of pages, so
+everything runs without network access.
+
+Usage:
+    python3 servers/phoenix_docs_server.py --source https://arize.com/docs/phoenix/llms.txt
+    python3 servers/phoenix_docs_server.py --fixture common/docs_fixture.json --transport streamable-http
+    python3 servers/phoenix_docs_server.py --refresh-only    # one refresh, then exit
+
+main_agent_server.py and simple_server.py start it over stdio by default
+(PHOENIX_DOCS_LOCAL=true) and keep the remote endpoint as a fallback.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from os import getenv
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import FastMCP
+
+# Make the shared helpers in common/ importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.docs_index import DocsIndex, FixtureDocsSource, LlmsTxtSource
+
+
+def log(message: str) -> None:
+    # stdout is the MCP channel over stdio
+    print(message, file=sys.stderr)
+
+
+def log_refresh(result: Dict[str, Any]) -> None:
+    log(
+        f"Docs index refreshed: {result['added']} added, {result['updated']} updated, "
+        f"{result['removed']} removed, {result['unchanged']} unchanged, {result['seconds']}s"
+        f"{' (' + result['error'] + ')' if result['error'] else ''}"
+    )
+
+
+async def refresh_loop(index: DocsIndex, source: Any, interval_seconds: float) -> None:
+    """Refresh the index whenever it is due, for as long as the server runs"""
+    while True:
+        try:
+            result = await asyncio.to_thread(index.refresh_if_due, source, interval_seconds)
+        except Exception as e:
+            log(f"Warning: docs index refresh failed: {e}")
+        else:
+            if result is not None:
+                log_refresh(result)
+        # Cheap when nothing is due; another process may have refreshed meanwhile
+        await asyncio.sleep(min(interval_seconds, 60))
+
+
+def create_docs_server(
+    index: DocsIndex,
+    source: Optional[Any] = None,
+    refresh_interval_seconds: float = 86400.0,
+    host: str = "127.0.0.1",
+    port: int = 8767,
+) -> FastMCP:
+    """Create the MCP server with search tools over the local docs index, refreshing it in the background"""
+
+    @asynccontextmanager
+    async def lifespan(server: FastMCP):
+        task = asyncio.create_task(refresh_loop(index, source, refresh_interval_seconds)) if source else None
+        try:
+            yield
+        finally:
+            if task is not None:
+                task.cancel()
+
+    server = FastMCP("phoenix-docs-local", host=host, port=port, log_level="WARNING", lifespan=lifespan)
+    # Report a version that changes with this script, so cached tool schemas
+    # (common/schema_cache.py) are refetched after its tools change
+    server._mcp_server.version = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:12]
+
+    def snapshot_time() -> Optional[str]:
+        refreshed_at = index.stats()["refreshed_at"]
+        return datetime.fromtimestamp(refreshed_at, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ") if refreshed_at else None
+
+    @server.tool()
+    def search_phoenix_docs(query: str, limit: int = 5, mode: str = "hybrid") -> Dict[str, Any]:
+        """Search the Phoenix documentation (tracing, evals, datasets, experiments, prompts, self-hosting, integrations). Returns the best matching sections with their page URL. mode: hybrid (default), keyword or vector"""
+        results = index.search(query, limit, mode)
+        answer: Dict[str, Any] = {"query": query, "results": results, "docs_snapshot_at": snapshot_time()}
+        if not results:
+            answer["note"] = "No matching sections in the local docs index"
+        return answer
+
+    @server.tool()
+    def get_phoenix_doc_page(url: str) -> Dict[str, Any]:
+        """Get a whole Phoenix documentation page by the URL returned from search_phoenix_docs"""
+        page = index.get_page(url)
+        return page if page else {"error": f"{url} is not in the local docs index"}
+
+    @server.tool()
+    def docs_index_status() -> Dict[str, Any]:
+        """Indexed pages and chunks, last refresh and search timings"""
+        return index.stats()
+
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Phoenix documentation search from a local index")
+    parser.add_argument("--source", default=getenv("PHOENIX_DOCS_SOURCE", "https://arize.com/docs/phoenix/llms.txt"))
+    parser.add_argument("--index-dir", default=getenv("PHOENIX_DOCS_INDEX_DIR", "tmp/phoenix_docs"))
+    parser.add_argument("--fixture", default=getenv("PHOENIX_DOCS_FIXTURE"), help="Index pages from this JSON file instead")
+    parser.add_argument("--refresh-interval", type=float, default=float(getenv("PHOENIX_DOCS_REFRESH_SECONDS", "86400")))
+    parser.add_argument("--refresh-only", action="store_true", help="Refresh once and exit")
+    parser.add_argument("--transport", choices=["stdio", "streamable-http"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    index = DocsIndex(args.index_dir)
+    source = FixtureDocsSource(args.fixture) if args.fixture else LlmsTxtSource(args.source)
+
+    if args.refresh_only:
+        log_refresh(index.refresh(source))
+        sys.exit(0)
+
+    server = create_docs_server(index, source, args.refresh_interval, args.host, args.port)
+    server.run(transport=args.transport)
@@ -5,10 +5,13 @@ This is a simplified version that only uses the Phoenix Docs MCP server
 which doesn't require any API keys. Perfect for quick testing!
 
 Architecture:
-- Consumes: Phoenix Docs MCP only (no API key needed)
+- Consumes: Phoenix Docs only (a local docs index, and the remote Phoenix Docs MCP as fallback; no API key needed)
 - Exposes: AgentOS MCP server at /mcp endpoint
 """
 
+import shlex
+import sys
+from os import getenv
 from pathlib import Path
 
 # Load environment variables from .env file
@@ -20,17 +23,22 @@ except ImportError:
     pass  # python-dotenv not required for simple server
 
 from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-from agno.models.anthropic import Claude
 from agno.os import AgentOS
 from agno.tools.mcp import MCPTools
 
+# Make the shared helpers in common/ importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.history_context import HistoryAssembler, enable_history_budget
+from common.models import get_model
+from common.session_store import create_session_db
+
 # Setup the database
 db_path = Path(__file__).parent / "tmp" / "mcp_meetup_demo_simple.db"
-db = SqliteDb(db_file=str(db_path))
+db = create_session_db(str(db_path), mode=getenv("SESSION_DB_MODE", "tuned").lower())
 
 # ==========================================
-# Single MCP Server (no API keys required)
+# Phoenix Docs MCP Servers (no API keys required)
 # ==========================================
 
 # Phoenix Docs MCP Server - for documentation
@@ -39,6 +47,19 @@ phoenix_docs_mcp = MCPTools(
     url="https://arizeai-433a7140.mintlify.app/mcp",
     timeout_seconds=60,
 )
+docs_tools = [phoenix_docs_mcp]
+
+# Local index of the same docs, searched first (see servers/phoenix_docs_server.py)
+local_docs = getenv("PHOENIX_DOCS_LOCAL", "true").lower() == "true"
+if local_docs:
+    docs_args = [
+        sys.executable, str(Path(__file__).resolve().parent / "phoenix_docs_server.py"),
+        "--index-dir", getenv("PHOENIX_DOCS_INDEX_DIR", "tmp/phoenix_docs"),
+        "--source", getenv("PHOENIX_DOCS_SOURCE", "https://arize.com/docs/phoenix/llms.txt"),
+    ]
+    if getenv("PHOENIX_DOCS_FIXTURE"):
+        docs_args += ["--fixture", getenv("PHOENIX_DOCS_FIXTURE")]
+    docs_tools.insert(0, MCPTools(command=shlex.join(docs_args), timeout_seconds=60))
 
 # ==========================================
 # Documentation Support Agent
@@ -47,21 +68,30 @@ phoenix_docs_mcp = MCPTools(
 doc_support_agent = Agent(
     id="doc_support_agent",
     name="Phoenix Documentation Support Agent",
-    model=Claude(id="claude-sonnet-4-5"),
+    model=get_model("claude-sonnet-4-5"),
     db=db,
-    tools=[phoenix_docs_mcp],  # Only Phoenix Docs MCP
+    tools=docs_tools,  # Only Phoenix Docs
     instructions=[
         "You are a helpful Documentation Support Agent for the Phoenix AI observability platform.",
         "You have access to Phoenix documentation to answer technical questions about tracing, evaluation, and observability.",
+        *(
+            ["Search the local docs index (search_phoenix_docs) first; use the remote Phoenix Docs MCP only when it has no good match."]
+            if local_docs else []
+        ),
         "Help users understand how to use Phoenix features and capabilities.",
     ],
     add_history_to_context=True,
-    num_history_runs=1,  # Reduced to save tokens
+    num_history_runs=1,  # Only used with HISTORY_MAX_TOKENS=0
     add_datetime_to_context=True,
     enable_session_summaries=False,  # Disabled to save tokens
     markdown=True,
 )
 
+# Pick history under a token budget instead of keeping only the last run
+history_max_tokens = int(getenv("HISTORY_MAX_TOKENS", "2000"))
+if history_max_tokens > 0:
+    enable_history_budget(doc_support_agent, HistoryAssembler(max_tokens=history_max_tokens))
+
 # ==========================================
 # AgentOS with MCP Server Enabled
 # ==========================================
@@ -88,7 +118,7 @@ if __name__ == "__main__":
     print("Starting Phoenix Documentation Support Agent OS (Simplified)")
     print("=" * 60)
     print("No external API keys required!")
-    print("Using Phoenix Docs MCP only")
+    print("Using Phoenix Docs only" + (" (local index first)" if local_docs else ""))
     print("=" * 60)
     print("MCP Server available at: http://localhost:7777/mcp")
     print("API Docs available at: http://localhost:7777/docs")
@@ -37,7 +37,7 @@ source .venv/bin/activate
 # Install dependencies
 echo ""
 echo "Installing dependencies..."
-pip install -q -U agno anthropic fastapi uvicorn sqlalchemy python-dotenv
+pip install -q -U agno anthropic fastapi uvicorn sqlalchemy python-dotenv numpy
 echo "✅ Dependencies installed"
 
 # Check for required environment variables